@@ -0,0 +1,53 @@
+"""
+Shared bootstrap for the scripts in this directory.
+
+Benchmarks run against SQLite (`SQLITE_PATH`, in memory by default) so they
+need no MySQL server; absolute numbers are only comparable between runs on the
+same machine and backend.
+"""
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(migrate=True):
+    """
+    Configures Django with the project settings and, by default, creates the schema.
+    """
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    os.environ.setdefault("SQLITE_PATH", ":memory:")
+
+    import django
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+
+    django.setup()
+    setup_test_environment()  # allows the test client's "testserver" host
+    if migrate:
+        call_command("migrate", verbosity=0)
+
+
+def measure(func, repeat):
+    """
+    Calls `func` `repeat` times and returns the individual timings in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def describe(timings):
+    """
+    Formats mean and p99 of a list of timings in milliseconds.
+    """
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"mean {statistics.mean(ordered) * 1000:.3f} ms, p99 {p99 * 1000:.3f} ms"
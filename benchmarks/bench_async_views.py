@@ -0,0 +1,239 @@
+"""
+Requests per second and latency of the async read endpoints served under ASGI
+(the gunicorn + uvicorn deployment of the Dockerfile), against the sync
+handlers they replaced served under WSGI with a fixed number of threads.
+
+Usage:
+    python benchmarks/bench_async_views.py [--books 200] [--requests 2000] [--threads 1]
+                                           [--concurrency 32] [--db-latency 10] [--path /api/books/]
+
+Both modes run in this process on Django's own handlers: `WSGIHandler` called
+from `--threads` threads, as `--threads` sync gunicorn workers would serve
+requests, and `ASGIHandler` driven by asyncio with up to `--concurrency`
+requests in flight, as one uvicorn worker would. The WSGI side serves
+`baseline_urlconf()`: the sync `list`/`retrieve` handlers the viewsets had
+before they became async, on the same services and caches, so the comparison
+is the sync deployment against the async one rather than the async views
+wrapped in `async_to_sync`.
+
+`--threads 1` is gunicorn's default (one sync worker, one thread), which is
+what the Dockerfile ran before it switched to uvicorn workers.
+
+`--db-latency` adds that many milliseconds to every SQL statement (an
+`execute_wrapper` that sleeps), standing in for the network round-trip to
+MySQL; SQLite answers in microseconds, which would hide what the async views
+change: a request waiting on the database does not hold a worker. Use
+`--path /api/books/1/pages/` for the page list; cached responses still
+authenticate the client with one query.
+
+Latencies are timed from the moment a request gets a thread (WSGI) or a slot
+(ASGI): once the process is CPU-bound, more requests in flight raise the
+throughput only while the database wait dominates, and each of them takes
+longer.
+
+Under ASGI each request opens its own database connection, so persistent
+connections are disabled here (`DB_CONN_MAX_AGE=0`); set `DB_POOL_SIZE` to
+measure with the connection pool instead.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _setup import describe, setup_django
+
+
+def add_latency(seconds):
+    """
+    Makes every new database connection sleep `seconds` before each statement.
+    """
+    from django.db.backends.signals import connection_created
+
+    def sleep(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if sleep not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, sleep)
+
+    connection_created.connect(install, weak=False)
+
+
+def baseline_urlconf():
+    """
+    Builds a URLconf serving the catalog read endpoints with sync handlers.
+    """
+    import types
+    from django.urls import include, path
+    from django.utils.decorators import method_decorator
+    from django.views.decorators.http import condition
+    from rest_framework import status
+    from rest_framework.response import Response
+    from rest_framework.routers import DefaultRouter
+    from config.content_encoding import PrecompressedContent, PrecompressedResponse
+    from books.conditional import book_etag, book_last_modified, book_pages_etag, book_pages_last_modified
+    from books.repositories.book_repository import BookRepository
+    from books.serializers.book_filter_serializer import BookFilterSerializer
+    from books.views.book_page_view import BookPageViewSet
+    from books.views.book_view import BookViewSet
+
+    class SyncBookViewSet(BookViewSet):
+        def list(self, request):
+            params = BookFilterSerializer(data=request.query_params)
+            params.is_valid(raise_exception=True)
+            filters = dict(params.validated_data)
+            ordering = filters.pop("ordering")
+            books = self.book_service.get_book_rows(filters=filters, ordering=ordering)
+
+            paginator = self.pagination_class()
+            paginator.ordering = BookRepository.ORDERINGS[ordering]
+            paginated_books = paginator.paginate_queryset(books.queryset, request)
+            books.record_count(paginator.get_known_count())
+            if not paginated_books and paginator.is_first_page():
+                return Response({"message": "No books available"}, status=status.HTTP_204_NO_CONTENT)
+            return paginator.get_paginated_response(self.book_service.book_list_data(paginated_books))
+
+        @method_decorator(condition(etag_func=book_etag, last_modified_func=book_last_modified))
+        def retrieve(self, request, pk=None):
+            return Response(self.book_service.get_book_data(pk))
+
+    class SyncBookPageViewSet(BookPageViewSet):
+        @method_decorator(condition(etag_func=book_pages_etag, last_modified_func=book_pages_last_modified))
+        def list(self, request, book_id=None):
+            params = f"{request.get_host()}?{request.query_params.urlencode()}&{request.accepted_media_type}"
+            return PrecompressedResponse(
+                self.page_service.get_page_batch(book_id, params, lambda: self._render_page_batch(request, book_id))
+            )
+
+        def _build_page_batch(self, request, book_id):
+            pages = self.page_service.get_book_page_rows(book_id)
+            paginator = self.pagination_class()
+            paginated_pages = paginator.paginate_queryset(pages.queryset, request)
+            pages.record_count(paginator.get_known_count())
+            return paginator.get_paginated_response(self.page_service.page_list_data(paginated_pages)).data
+
+        def _render_page_batch(self, request, book_id):
+            renderer = request.accepted_renderer
+            body = renderer.render(
+                self._build_page_batch(request, book_id), request.accepted_media_type, self.get_renderer_context()
+            )
+            return PrecompressedContent.build(body, renderer.media_type)
+
+    router = DefaultRouter()
+    router.register(r"books", SyncBookViewSet, basename="books")
+    router.register(r"books/(?P<book_id>\d+)/pages", SyncBookPageViewSet, basename="bookpage")
+    urlconf = types.ModuleType("baseline_urls")
+    urlconf.urlpatterns = [path("api/", include(router.urls))]
+    return urlconf
+
+
+def run_wsgi(environ, requests, threads):
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test.utils import override_settings
+
+    handler = WSGIHandler()
+
+    def request(_):
+        started = time.perf_counter()
+        response = handler(dict(environ), lambda status, headers: None)
+        b"".join(response)
+        response.close()
+        assert response.status_code == 200, response.status_code
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with override_settings(ROOT_URLCONF=baseline_urlconf()), ThreadPoolExecutor(threads) as executor:
+        timings = list(executor.map(request, range(requests)))
+    return timings, time.perf_counter() - started
+
+
+async def run_asgi(scope, requests, concurrency):
+    from django.core.handlers.asgi import ASGIHandler
+
+    handler = ASGIHandler()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def request():
+        async with slots:
+            started = time.perf_counter()
+            sent = asyncio.Event()
+            status = []
+
+            async def receive():
+                if not sent.is_set():
+                    sent.set()
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await asyncio.Event().wait()  # the client never disconnects
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+
+            await handler(dict(scope), receive, send)
+            assert status == [200], status
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    timings = await asyncio.gather(*(request() for _ in range(requests)))
+    return list(timings), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--books", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=20, help="Pages of the first book.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1, help="WSGI request threads (sync workers).")
+    parser.add_argument("--concurrency", type=int, default=32, help="ASGI requests in flight.")
+    parser.add_argument("--db-latency", type=float, default=10.0, help="Milliseconds added to every SQL statement.")
+    parser.add_argument("--path", default="/api/books/")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Every request thread needs to see the same database: use a file.
+        if os.environ.get("SQLITE_PATH") != "":
+            os.environ["SQLITE_PATH"] = os.path.join(directory, "bench.sqlite3")
+        os.environ.setdefault("DB_CONN_MAX_AGE", "0")
+        setup_django()
+
+        from django.test import RequestFactory
+        from rest_framework_simplejwt.tokens import AccessToken
+        from books.models import Book, BookPage
+        from users.models import User
+
+        user = User.objects.create_user(username="bench", email="bench@example.com", password="bench-password", role="reader")
+        Book.objects.bulk_create(Book(title=f"Libro {n}", author=f"Autor {n % 20}") for n in range(args.books))
+        first = Book.objects.order_by("id").first()
+        BookPage.objects.bulk_create(
+            BookPage(book=first, page_number=n, content=f"Contenido de la página {n}. " * 40)
+            for n in range(1, args.pages + 1)
+        )
+        path = args.path.replace("/1/", f"/{first.id}/")
+        authorization = f"Bearer {AccessToken.for_user(user)}"
+        if args.db_latency:
+            add_latency(args.db_latency / 1000)
+
+        environ = RequestFactory().get(path, HTTP_AUTHORIZATION=authorization).environ
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+            "headers": [(b"host", b"testserver"), (b"authorization", authorization.encode())],
+            "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        }
+
+        print(f"GET {args.path}: {args.requests} requests, {args.db_latency:g} ms per SQL statement")
+        runs = {
+            f"WSGI sync, {args.threads} threads": lambda: run_wsgi(environ, args.requests, args.threads),
+            f"ASGI async, {args.concurrency} in flight": lambda: asyncio.run(run_asgi(scope, args.requests, args.concurrency)),
+        }
+        for name, run in runs.items():
+            run()  # warm the catalog cache and the code paths
+            timings, elapsed = run()
+            print(f"{name:>27}: {args.requests / elapsed:8.1f} req/s, {describe(timings)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Create-path cost of logging the raw request body versus a payload summary.
+
+Usage:
+    python benchmarks/bench_create_logging.py [--pages 200] [--page-size 4000] [--repeat 50]
+
+Times the log call made by `BookViewSet.create` with the raw `request.data`
+(previous behaviour) and with `summarize_payload`, through the configured
+logging pipeline including the listener's write to `logs/debug.log`, and then
+the full `POST /api/books/` round-trip.
+"""
+import argparse
+import logging
+import time
+
+from _setup import describe, measure, setup_django
+
+
+def drain():
+    """
+    Waits until the listener has written every queued record.
+    """
+    from config.log import start_listener, stop_listener
+
+    stop_listener()
+    start_listener()
+
+
+def logged(emit, repeat):
+    """
+    Returns the timings of `emit` on the calling thread, and its per-record
+    cost in seconds once the listener has formatted and written the records.
+    """
+    drain()
+    timings = measure(emit, repeat)
+    drain()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        emit()
+    drain()
+    return timings, (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=4000, help="Characters per page.")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from config.log import summarize_payload
+    from users.models import User
+
+    payload = {
+        "title": "Benchmark",
+        "author": "Autor",
+        "pages": [
+            {"page_number": n, "content": "á" + "x" * (args.page_size - 1)} for n in range(1, args.pages + 1)
+        ],
+    }
+    logger = logging.getLogger("books.views.book_view")
+
+    raw_message = "Creating book with data: %s" % (payload,)
+    summary_message = "Creating book: %s" % summarize_payload(payload)
+    raw_call, raw = logged(lambda: logger.info("Creating book with data: %s", payload), args.repeat)
+    summary_call, summary = logged(lambda: logger.info("Creating book: %s", summarize_payload(payload)), args.repeat)
+
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(
+        username="bench", email="bench@example.com", password="bench-password", role="editor"
+    ))
+    url = reverse("books-list")
+
+    def create_book():
+        response = client.post(url, payload, format="json")
+        assert response.status_code == 201, response.status_code
+
+    create = measure(create_book, max(1, args.repeat // 5))
+
+    print(f"payload: {args.pages} pages x {args.page_size} chars")
+    print(f"raw body: {len(raw_message.encode('utf-8'))} bytes logged, "
+          f"request thread {describe(raw_call)}, written {raw * 1000:.3f} ms/record")
+    print(f"summary:  {len(summary_message.encode('utf-8'))} bytes logged, "
+          f"request thread {describe(summary_call)}, written {summary * 1000:.3f} ms/record")
+    print(f"POST /api/books/: {describe(create)}")
+
+
+if __name__ == "__main__":
+    main()
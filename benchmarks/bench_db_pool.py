@@ -0,0 +1,116 @@
+"""
+Requests per second and latency of `GET /api/books/` with connections closed
+after every request, kept open (`CONN_MAX_AGE`) and taken from the pool.
+
+Usage:
+    python benchmarks/bench_db_pool.py [--books 200] [--threads 8] [--requests 2000] [--pool-size 4]
+
+Each mode runs in its own process (the database settings are read from the
+environment at startup) and serves the requests through Django's WSGI handler
+from `--threads` threads, as a gunicorn `gthread` worker would, so the
+request_started/request_finished connection handling is the real one.
+
+By default the database is a temporary SQLite file, where opening a connection
+is cheap; to measure against MySQL (e.g. the docker-compose `db` service on
+port 3307) run with an empty SQLITE_PATH:
+
+    SQLITE_PATH= DB_HOST=127.0.0.1 DB_PORT=3307 python benchmarks/bench_db_pool.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _setup import describe, setup_django
+
+MODES = {
+    "close per request": {"DB_CONN_MAX_AGE": "0", "DB_POOL_SIZE": "0"},
+    "persistent (60 s)": {"DB_CONN_MAX_AGE": "60", "DB_POOL_SIZE": "0"},
+    "pool": {"DB_CONN_MAX_AGE": "0"},
+}
+
+
+def run_worker(args):
+    """
+    Serves `args.requests` requests from `args.threads` threads and prints the results as JSON.
+    """
+    setup_django(migrate=False)
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from django.test import RequestFactory
+    from rest_framework_simplejwt.tokens import AccessToken
+    from users.models import User
+
+    opened = []
+    connection_created.connect(lambda sender, connection, **kwargs: opened.append(1), weak=False)
+    token = AccessToken.for_user(User.objects.get(username="bench"))
+    environ = RequestFactory().get("/api/books/", HTTP_AUTHORIZATION=f"Bearer {token}").environ
+    handler = WSGIHandler()
+
+    def request():
+        started = time.perf_counter()
+        response = handler(dict(environ), lambda status, headers: None)
+        b"".join(response)
+        response.close()  # sends request_finished, which closes or returns the connection
+        assert response.status_code == 200, response.status_code
+        return time.perf_counter() - started
+
+    opened.clear()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as executor:
+        timings = list(executor.map(lambda _: request(), range(args.requests)))
+    elapsed = time.perf_counter() - started
+    result = {"timings": timings, "elapsed": elapsed, "opened": len(opened), "waits": 0}
+    if "POOL" in connection.settings_dict:
+        # connection_created is also sent for connections taken from the pool.
+        result.update(opened=connection.pool.stats["created"], waits=connection.pool.stats["waits"])
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--books", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent request threads (gthread threads).")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--pool-size", type=int, default=4, help="DB_POOL_SIZE of the pooled run.")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args)
+
+    with tempfile.TemporaryDirectory() as directory:
+        if os.environ.get("SQLITE_PATH") != "":
+            os.environ["SQLITE_PATH"] = os.path.join(directory, "bench.sqlite3")
+        setup_django()
+
+        from books.models import Book
+        from users.models import User
+
+        User.objects.filter(username="bench").delete()
+        User.objects.create_user(username="bench", email="bench@example.com", password="bench-password", role="reader")
+        Book.objects.bulk_create(Book(title=f"Libro {n}", author=f"Autor {n % 20}") for n in range(args.books))
+
+        print(f"GET /api/books/: {args.requests} requests from {args.threads} threads")
+        for name, env in MODES.items():
+            env = {**os.environ, **env}
+            if name == "pool":
+                env["DB_POOL_SIZE"] = str(args.pool_size)
+                name = f"pool ({args.pool_size})"
+            output = subprocess.run(
+                [sys.executable, __file__, "--worker", "--threads", str(args.threads), "--requests", str(args.requests)],
+                env=env, check=True, stdout=subprocess.PIPE, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{name:>18}: {args.requests / result['elapsed']:8.1f} req/s, {describe(result['timings'])}, "
+                  f"{result['opened']} connections opened, {result['waits']} waits for a pooled connection")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Time to render and parse the API's JSON payloads with DRF's stdlib-based
+`JSONRenderer`/`JSONParser` and with `FastJSONRenderer`/`FastJSONParser`.
+
+Usage:
+    python benchmarks/bench_json.py [--books 100] [--pages 300] [--batch 100] [--repeat 200]
+
+Payloads are the serialized data the views render: a page of the book list
+(`--books` summaries), a book detail with `--pages` pages, and a batch of
+`--batch` pages as returned by `GET /api/books/{id}/pages/`. Page text is
+synthetic Spanish-like prose of about 1,500 characters. Parsing is timed on
+the book detail, sent back as a create request body.
+"""
+import argparse
+import io
+import random
+
+from _setup import describe, measure, setup_django
+from bench_response_compression import page_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--books", type=int, default=100, help="Books in the list payload.")
+    parser.add_argument("--pages", type=int, default=300, help="Pages of the book detail payload.")
+    parser.add_argument("--batch", type=int, default=100, help="Pages in the page batch payload.")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from books.models import Book, BookPage
+    from books.repositories.book_repository import BookRepository
+    from books.serializers.book_list_serializer import BookListSerializer
+    from books.serializers.book_page_serializer import BookPageSerializer
+    from books.serializers.book_serializer import BookSerializer
+    from config import renderers
+    from config.parsers import FastJSONParser
+    from config.renderers import FastJSONRenderer
+
+    if renderers.orjson is None:
+        print("orjson is not installed: the fast classes fall back to the stdlib")
+
+    rng = random.Random(0)
+    Book.objects.bulk_create(Book(title=f"Libro {n}", author=f"Autor {n % 20}") for n in range(args.books))
+    book = Book.objects.create(title="Libro largo", author="Autora")
+    BookPage.objects.bulk_create(
+        BookPage(book=book, page_number=n, content=page_text(rng)) for n in range(1, args.pages + 1)
+    )
+
+    books = BookRepository.get_all_books(BookRepository.SHAPE_SUMMARY).queryset[:args.books]
+    payloads = {
+        f"list ({args.books} books)": {"next": None, "previous": None, "results": BookListSerializer(books, many=True).data},
+        f"detail ({args.pages} pages)": BookSerializer(book).data,
+        f"page batch ({args.batch})": {
+            "next": None, "previous": None,
+            "results": BookPageSerializer(book.pages.all()[:args.batch], many=True).data,
+        },
+    }
+
+    print(f"{'payload':>20} {'bytes':>9}  renderer")
+    for name, data in payloads.items():
+        body = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == body
+        print(f"{name:>20} {len(body):>9}")
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            timings = measure(lambda: renderer.render(data), args.repeat)
+            print(f"{'':>31}{type(renderer).__name__:>17}: {describe(timings)}, "
+                  f"{len(body) / min(timings) / 1e6:7.1f} MB/s")
+
+    body = JSONRenderer().render(BookSerializer(book).data)
+    print(f"{'parse detail':>20} {len(body):>9}")
+    for json_parser in (JSONParser(), FastJSONParser()):
+        timings = measure(lambda: json_parser.parse(io.BytesIO(body)), args.repeat)
+        print(f"{'':>31}{type(json_parser).__name__:>17}: {describe(timings)}, "
+              f"{len(body) / min(timings) / 1e6:7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
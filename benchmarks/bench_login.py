@@ -0,0 +1,68 @@
+"""
+Login throughput per core for each password hasher, with and without the credential cache.
+
+Usage:
+    python benchmarks/bench_login.py [--users 20] [--logins 100] [--hasher pbkdf2 --hasher scrypt ...]
+
+Runs `UserService.authenticate_user` in a single process, so the figures are
+logins per second per core (hashers with parallelism > 1 may use extra
+threads). Cost parameters come from the usual settings/environment variables
+(`PASSWORD_PBKDF2_ITERATIONS`, `PASSWORD_ARGON2_*`, `PASSWORD_SCRYPT_*`).
+Divide the expected peak login rate by the reported figure to size workers.
+"""
+import argparse
+import time
+
+from _setup import setup_django
+
+HASHERS = {
+    "pbkdf2": "users.hashers.TunedPBKDF2PasswordHasher",
+    "argon2": "users.hashers.TunedArgon2PasswordHasher",
+    "scrypt": "users.hashers.TunedScryptPasswordHasher",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="Distinct accounts logging in.")
+    parser.add_argument("--logins", type=int, default=100, help="Logins measured per configuration.")
+    parser.add_argument("--hasher", action="append", choices=HASHERS, help="Hashers to measure (default: all).")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.test import override_settings
+    from users.models import User
+    from users.services.user_service import UserService
+
+    service = UserService()
+    for name in args.hasher or HASHERS:
+        with override_settings(PASSWORD_HASHERS=[HASHERS[name]]):
+            User.objects.all().delete()
+            try:
+                emails = []
+                for i in range(args.users):
+                    user = User.objects.create_user(
+                        username=f"{name}{i}", email=f"{name}{i}@example.com", password="bench-password"
+                    )
+                    emails.append(user.email)
+            except ValueError as e:  # e.g. argon2-cffi not installed
+                print(f"{name}: skipped ({e})")
+                continue
+
+            for timeout in (0, settings.LOGIN_CREDENTIAL_CACHE_TIMEOUT or 60):
+                with override_settings(LOGIN_CREDENTIAL_CACHE_TIMEOUT=timeout):
+                    cache.clear()
+                    started = time.perf_counter()
+                    for i in range(args.logins):
+                        service.authenticate_user(emails[i % len(emails)], "bench-password")
+                    elapsed = time.perf_counter() - started
+                label = "credential cache" if timeout else "no cache"
+                print(f"{name:7} {label:17} {args.logins / elapsed:8.1f} logins/s per core "
+                      f"({elapsed / args.logins * 1000:.2f} ms/login)")
+
+
+if __name__ == "__main__":
+    main()
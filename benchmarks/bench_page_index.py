@@ -0,0 +1,72 @@
+"""
+Build time, file size and query latency of the in-process page index.
+
+Usage:
+    python benchmarks/bench_page_index.py [--books 1000] [--pages 100] [--words 200] [--repeat 200]
+
+Pages are synthetic: words drawn from a Zipf-like vocabulary, so a few terms
+appear on most pages and most terms are rare, as in real text. The index is
+built to a temporary file and queried through the memory map.
+"""
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+
+from _setup import describe, measure, setup_django
+
+QUERIES = [
+    "w7",                     # frequent term
+    "w4000",                  # rare term
+    "w7 w4000",               # AND, rare clause first
+    "w3 w5 w8",               # AND of frequent terms
+    '"w1 w2"',                # phrase
+    "w4000 OR w4500 -w1",     # OR and negation
+]
+
+
+def synthetic_pages(books, pages, words, vocabulary, seed=1):
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(vocabulary)))
+    terms = [f"w{rank}" for rank in range(vocabulary)]
+    for book_id in range(1, books + 1):
+        for page_number in range(1, pages + 1):
+            yield book_id, page_number, " ".join(rng.choices(terms, cum_weights=cum_weights, k=words))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--pages", type=int, default=100, help="Pages per book.")
+    parser.add_argument("--words", type=int, default=200, help="Words per page.")
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=200, help="Runs per query.")
+    args = parser.parse_args()
+
+    setup_django(migrate=False)
+    from books.page_index import PageIndex
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pages.idx")
+        started = time.perf_counter()
+        count = PageIndex.build(synthetic_pages(args.books, args.pages, args.words, args.vocabulary), path)
+        print(f"built {count} pages in {time.perf_counter() - started:.1f} s, "
+              f"{os.path.getsize(path) / 2 ** 20:.1f} MiB")
+
+        started = time.perf_counter()
+        index = PageIndex(path)
+        print(f"opened in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        for query in QUERIES:
+            matches = len(index.search(query))
+            print(f"{query:22} {matches:8} pages  {describe(measure(lambda: index.search(query), args.repeat))}")
+
+        index.update_page(args.books + 1, 1, "w4000 w7")
+        print(f"{'w7 w4000 (with delta)':22} {len(index.search('w7 w4000')):8} pages  "
+              f"{describe(measure(lambda: index.search('w7 w4000'), args.repeat))}")
+
+
+if __name__ == "__main__":
+    main()
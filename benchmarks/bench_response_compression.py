@@ -0,0 +1,95 @@
+"""
+Size and latency of page batches sent plain, gzip and brotli, compressed per
+request versus served pre-compressed from the cache.
+
+Usage:
+    python benchmarks/bench_response_compression.py [--books 10,100,500] [--batches 10,50,100] [--repeat 50]
+
+For every book length (pages) and batch size the script requests the first
+batch of `GET /api/books/{id}/pages/` and reports the body size with each
+coding, the cold request (cache miss: load, render and compress at the
+pre-compression levels), the warm request (cache hit, stored bytes sent as is)
+and the CPU a per-request compression at the on-the-fly levels would add.
+Page text is synthetic Spanish-like prose of about 1,500 characters.
+"""
+import argparse
+import random
+
+from _setup import describe, measure, setup_django
+
+WORDS = (
+    "el la de que y en un una los las por con para como pero más sus le ya o este sí porque esta entre "
+    "cuando muy sin sobre también me hasta hay donde quien desde todo nos durante todos uno les ni contra "
+    "otros ese eso ante ellos e esto mí antes algunos qué unos yo otro otras otra él tanto esa estos mucho "
+    "casa camino noche ciudad río mar tiempo mundo vida mano ojos puerta palabra libro carta voz silencio"
+).split()
+
+
+def page_text(rng, length=1500):
+    words, size = [], 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words).capitalize() + "."
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--books", default="10,100,500", help="Comma-separated page counts, one book each.")
+    parser.add_argument("--batches", default="10,50,100", help="Comma-separated page_size values.")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from books.cache import catalog_cache
+    from books.models import Book, BookPage
+    from config import content_encoding
+    from users.models import User
+
+    rng = random.Random(0)
+    user = User.objects.create_user(username="bench", email="bench@example.com", password="bench-password", role="reader")
+    client = APIClient()
+    client.force_authenticate(user)
+
+    print(f"{'pages':>5} {'batch':>5} {'identity':>9} {'gzip':>8} {'br':>8}  latency")
+    for pages in [int(value) for value in args.books.split(",")]:
+        book = Book.objects.create(title=f"Libro de {pages} páginas", author="Autor")
+        BookPage.objects.bulk_create(
+            BookPage(book=book, page_number=n, content=page_text(rng)) for n in range(1, pages + 1)
+        )
+        url = reverse("bookpage-list", args=[book.id])
+
+        for batch in [int(value) for value in args.batches.split(",")]:
+            if batch > pages:
+                continue
+            query = {"page_size": batch}
+            sizes, lines = {}, []
+            for encoding in ("identity", "gzip", "br"):
+                def request():
+                    return client.get(url, query, HTTP_ACCEPT_ENCODING=encoding)
+
+                def cold():
+                    catalog_cache.cache.clear()
+                    request()
+
+                body = request().content
+                sizes[encoding] = len(body)
+                lines.append(f"{encoding:>8}: cold {describe(measure(cold, args.repeat))}, "
+                             f"warm {describe(measure(request, args.repeat))}")
+
+            plain = client.get(url, query).content
+            for encoding in ("gzip", "br"):
+                on_the_fly = measure(lambda: content_encoding.compress(plain, encoding), args.repeat)
+                lines.append(f"{encoding:>8}: per-request compression would add {describe(on_the_fly)}")
+
+            print(f"{pages:>5} {batch:>5} {sizes['identity']:>9} {sizes['gzip']:>8} {sizes['br']:>8}")
+            for line in lines:
+                print(f"{'':>40}{line}")
+
+
+if __name__ == "__main__":
+    main()
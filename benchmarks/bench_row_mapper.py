@@ -0,0 +1,86 @@
+"""
+Pages per second serialized by `BookPageSerializer` over model instances and
+by the row path (`values()` rows mapped by `RowMapper`), for the page list,
+the book detail and the book list.
+
+Usage:
+    python benchmarks/bench_row_mapper.py [--books 100] [--pages 300] [--batch 100] [--repeat 50]
+
+Each measurement includes the query, as the views run it: the serializer path
+loads model instances (decompressing page content) and serializes them, the
+row path loads `values()` rows and maps them. Both outputs are checked to
+render to the same bytes before timing. Page text is synthetic Spanish-like
+prose of about 1,500 characters.
+"""
+import argparse
+import random
+
+from _setup import describe, measure, setup_django
+from bench_response_compression import page_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--books", type=int, default=100, help="Books in the book list.")
+    parser.add_argument("--pages", type=int, default=300, help="Pages of the book detail.")
+    parser.add_argument("--batch", type=int, default=100, help="Pages in the page batch.")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django(migrate=True)
+
+    from rest_framework.renderers import JSONRenderer
+    from books.models import Book, BookPage
+    from books.repositories.book_repository import BookRepository
+    from books.serializers.book_list_serializer import BookListSerializer
+    from books.serializers.book_page_serializer import BookPageSerializer
+    from books.serializers.book_serializer import BookSerializer
+    from books.services.book_page_servicce import BookPageService
+    from books.services.book_service import BOOK_DETAIL_ROWS, BookService
+
+    rng = random.Random(0)
+    Book.objects.bulk_create(Book(title=f"Libro {n}", author=f"Autor {n % 20}") for n in range(args.books))
+    book = Book.objects.create(title="Libro largo", author="Autora")
+    BookPage.objects.bulk_create(
+        BookPage(book=book, page_number=n, content=page_text(rng)) for n in range(1, args.pages + 1)
+    )
+    book_service, page_service = BookService(), BookPageService()
+    detail_columns = (BOOK_DETAIL_ROWS.columns, BOOK_DETAIL_ROWS.children["pages"].columns)
+
+    cases = {
+        f"page batch ({args.batch})": (
+            args.batch,
+            lambda: BookPageSerializer(book.pages.all()[:args.batch], many=True).data,
+            lambda: page_service.page_list_data(page_service.get_book_page_rows(book.id).queryset[:args.batch]),
+        ),
+        f"detail ({args.pages} pages)": (
+            args.pages,
+            lambda: BookSerializer(Book.objects.get(id=book.id)).data,
+            lambda: _detail_data(book_service, book.id, detail_columns, BOOK_DETAIL_ROWS),
+        ),
+        f"list ({args.books} books)": (
+            args.books,
+            lambda: BookListSerializer(
+                BookRepository.get_all_books(BookRepository.SHAPE_SUMMARY).queryset[:args.books], many=True
+            ).data,
+            lambda: book_service.book_list_data(book_service.get_book_rows().queryset[:args.books]),
+        ),
+    }
+
+    print(f"{'payload':>20}  {'path':>10}")
+    for name, (items, serializer_path, row_path) in cases.items():
+        assert JSONRenderer().render(row_path()) == JSONRenderer().render(serializer_path())
+        print(f"{name:>20}")
+        for label, func in (("serializer", serializer_path), ("rows", row_path)):
+            timings = measure(func, args.repeat)
+            print(f"{'':>22}{label:>10}: {describe(timings)}, {items / min(timings):10,.0f} items/s")
+
+
+def _detail_data(book_service, book_id, columns, mapper):
+    """The uncached part of `BookService.get_book_data`."""
+    book, pages = book_service.book_repository.get_book_detail_rows(book_id, *columns)
+    return mapper.to_representation(book, pages=pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import hashlib
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class CacheStats:
+    """
+    Process-wide hit, miss and eviction counters for the catalog cache.
+
+    Counters are kept per process (per gunicorn worker); evictions are counted
+    by the backends defined in this module, or read from the server for Redis.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def incr(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def as_dict(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+stats = CacheStats()
+
+
+class LocMemLRUCache(LocMemCache):
+    """
+    In-process cache backend with LRU eviction once `MAX_ENTRIES` is reached.
+
+    Django's `LocMemCache` already keeps entries in least-recently-used order;
+    this subclass only counts the entries dropped by each cull.
+    """
+
+    def _cull(self):
+        size = len(self._cache)
+        super()._cull()
+        stats.incr("evictions", size - len(self._cache))
+
+
+class CountingFileBasedCache(FileBasedCache):
+    """
+    File-based cache backend that counts the entries removed by culling.
+    """
+
+    _culling = False
+
+    def _cull(self):
+        self._culling = True
+        try:
+            super()._cull()
+        finally:
+            self._culling = False
+
+    def _delete(self, fname):
+        deleted = super()._delete(fname)
+        if deleted and self._culling:
+            stats.incr("evictions")
+        return deleted
+
+
+def version_of(updated_at):
+    """
+    Returns the cache version string for a book's `updated_at` timestamp.
+    """
+    return str(int(updated_at.timestamp() * 1_000_000))
+
+
+class CatalogCache:
+    """
+    Read-through cache for serialized book and page payloads.
+
+    Payload keys embed the book version (its `updated_at`), so a write only has
+    to drop the small `book:<id>:version` pointer: the next read resolves the new
+    version and stale payloads age out through the backend's TTL/LRU policy.
+
+    With a process-local backend (`LocMemCache`) a write only drops the pointer
+    of the worker that made it; the other workers keep theirs, and serve the
+    previous version (payloads, `ETag`, 304s) until it expires. The pointer is
+    therefore kept for `settings.BOOK_CACHE_LOCAL_VERSION_TIMEOUT` seconds
+    there; use a shared backend (file or redis) to invalidate every worker at once.
+    """
+
+    def __init__(self, alias=None):
+        """
+        :param alias: The `CACHES` alias to use (defaults to `settings.BOOK_CACHE_ALIAS`).
+        """
+        self.alias = alias or settings.BOOK_CACHE_ALIAS
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def version_key(book_id):
+        return f"book:{book_id}:version"
+
+    @staticmethod
+    def book_key(book_id, version):
+        return f"book:{book_id}:{version}"
+
+    @staticmethod
+    def pages_key(book_id, version, params):
+        digest = hashlib.md5(params.encode("utf-8")).hexdigest()
+        return f"pages:{book_id}:{version}:{digest}"
+
+    @staticmethod
+    def page_key(book_id, version, page_number):
+        return f"page:{book_id}:{version}:{page_number}"
+
+    def book_version(self, book_id, load_updated_at):
+        """
+        Returns the current version of a book, reading the database only on a cache miss.
+
+        :param book_id: The ID of the book.
+        :param load_updated_at: Callable returning the book's `updated_at` (or None if it does not exist).
+        :return: The version string, or None if the book does not exist.
+        """
+        key = self.version_key(book_id)
+        version = self.cache.get(key)
+        if version is None:
+            updated_at = load_updated_at()
+            if updated_at is None:
+                return None
+            version = version_of(updated_at)
+            self.cache.set(key, version, self._version_timeout(updated_at))
+        return version
+
+    async def abook_version(self, book_id, load_updated_at):
+        """
+        Async version of `book_version`.
+
+        :param book_id: The ID of the book.
+        :param load_updated_at: Coroutine function returning the book's `updated_at` (or None if it does not exist).
+        :return: The version string, or None if the book does not exist.
+        """
+        key = self.version_key(book_id)
+        version = await self.cache.aget(key)
+        if version is None:
+            updated_at = await load_updated_at()
+            if updated_at is None:
+                return None
+            version = version_of(updated_at)
+            await self.cache.aset(key, version, self._version_timeout(updated_at))
+        return version
+
+    def _version_timeout(self, updated_at):
+        timeouts = []
+        if isinstance(self.cache, LocMemCache):
+            # Other workers do not see this worker's invalidations (see the class docstring).
+            timeouts.append(settings.BOOK_CACHE_LOCAL_VERSION_TIMEOUT)
+        # With read replicas the version may have been read from a replica that
+        # has not applied the latest write yet; a recently changed book keeps its
+        # pointer only until any replica in rotation has caught up.
+        if settings.DATABASE_REPLICAS and timezone.now() - updated_at < timedelta(seconds=settings.DATABASE_REPLICA_MAX_LAG):
+            timeouts.append(settings.DATABASE_REPLICA_MAX_LAG)
+        return min(timeouts, default=DEFAULT_TIMEOUT)
+
+    def get_or_set(self, key, producer):
+        """
+        Returns the cached value for `key`, calling `producer` and storing its result on a miss.
+
+        Exceptions raised by `producer` propagate and nothing is cached.
+        """
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            stats.incr("hits")
+            return value
+
+        stats.incr("misses")
+        value = producer()
+        self.cache.set(key, value)
+        return value
+
+    async def aget_or_set(self, key, producer):
+        """
+        Async version of `get_or_set`; `producer` is a coroutine function.
+        """
+        value = await self.cache.aget(key, _MISSING)
+        if value is not _MISSING:
+            stats.incr("hits")
+            return value
+
+        stats.incr("misses")
+        value = await producer()
+        await self.cache.aset(key, value)
+        return value
+
+    def get_many(self, keys):
+        """
+        Returns the cached values found among `keys` in a single round-trip.
+
+        Each key counts as a hit or a miss.
+        """
+        found = self.cache.get_many(keys)
+        stats.incr("hits", len(found))
+        stats.incr("misses", len(keys) - len(found))
+        return found
+
+    def set_many(self, values):
+        """
+        Stores several values in a single round-trip.
+        """
+        self.cache.set_many(values)
+
+    def invalidate_book(self, book_id):
+        """
+        Drops the version pointer of a book so its cached payloads are no longer served.
+        """
+        self.cache.delete(self.version_key(book_id))
+        logger.info("Cache invalidated for book ID %s", book_id)
+
+    def stats(self):
+        """
+        Returns the hit/miss/eviction counters of this process and the backend in use.
+        """
+        data = stats.as_dict()
+        data["backend"] = f"{type(self.cache).__module__}.{type(self.cache).__name__}"
+        client = getattr(self.cache, "_cache", None)
+        if hasattr(client, "get_client"):
+            try:
+                data["evictions"] = client.get_client().info("stats").get("evicted_keys", data["evictions"])
+            except Exception as e:
+                logger.warning("Could not read eviction stats from the cache server: %s", e)
+        return data
+
+
+catalog_cache = CatalogCache()
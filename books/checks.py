@@ -0,0 +1,24 @@
+import os
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches)
+def check_catalog_cache_is_shared(app_configs, **kwargs):
+    """
+    Warns when the catalog cache is process-local but gunicorn runs several workers.
+
+    Invalidations then only reach the worker that made the write; the others serve
+    the previous version for up to `BOOK_CACHE_LOCAL_VERSION_TIMEOUT` seconds.
+    """
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    if workers > 1 and isinstance(caches[settings.BOOK_CACHE_ALIAS], LocMemCache):
+        return [Warning(
+            f"The catalog cache is per process but WEB_CONCURRENCY={workers}: other workers "
+            f"serve a book's previous version for up to {settings.BOOK_CACHE_LOCAL_VERSION_TIMEOUT} s after a write.",
+            hint="Set BOOK_CACHE_BACKEND to file or redis.",
+            id="books.W001",
+        )]
+    return []
@@ -0,0 +1,269 @@
+import logging
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from django.conf import settings
+from django.db.models.functions import Length
+
+try:
+    import zstandard
+except ImportError:  # zlib is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Stored values start with a codec byte; compressed codecs are followed by the
+# ID of the dictionary they were compressed with (0 = none).
+RAW, ZLIB, ZSTD = 0, 1, 2
+CODECS = {"none": RAW, "zlib": ZLIB, "zstd": ZSTD}
+_DICTIONARY_ID = struct.Struct(">I")
+
+# zlib only looks back 32 KiB, so a larger preset dictionary is wasted.
+ZLIB_MAX_DICTIONARY_SIZE = 32 * 1024
+DEFAULT_LEVELS = {ZLIB: 6, ZSTD: 10}
+
+_WORDS = re.compile(r"\w+(?:\W+\w+){0,2}")
+
+
+class Compressor:
+    """
+    Compresses page text with one codec, level and (optional) dictionary.
+    """
+
+    def __init__(self, codec, level=None, dictionary_id=0, dictionary=b""):
+        """
+        :param codec: `RAW`, `ZLIB` or `ZSTD`.
+        :param level: Compression level (defaults to `DEFAULT_LEVELS`).
+        :param dictionary_id: Stored in every frame so readers can find the dictionary.
+        :param dictionary: The dictionary bytes (empty for none).
+        """
+        if codec == ZSTD and zstandard is None:
+            raise ValueError("BOOK_PAGE_COMPRESSION = 'zstd' requires the zstandard package")
+        self.codec = codec
+        self.level = level or DEFAULT_LEVELS.get(codec, 0)
+        self.dictionary_id = dictionary_id if dictionary else 0
+        self.dictionary = dictionary
+        self._zstd_dictionary = None
+        if codec == ZSTD and dictionary:
+            self._zstd_dictionary = zstandard.ZstdCompressionDict(dictionary)
+            self._zstd_dictionary.precompute_compress(level=self.level)
+
+    def compress(self, text):
+        """
+        Returns the stored form of `text`; short or incompressible text is stored as plain UTF-8.
+        """
+        data = text.encode("utf-8")
+        if self.codec == RAW or len(data) < settings.BOOK_PAGE_COMPRESSION_MIN_SIZE:
+            return bytes([RAW]) + data
+        if self.codec == ZLIB:
+            compressor = zlib.compressobj(self.level, zdict=self.dictionary) if self.dictionary else zlib.compressobj(self.level)
+            payload = compressor.compress(data) + compressor.flush()
+        else:
+            payload = zstandard.ZstdCompressor(level=self.level, dict_data=self._zstd_dictionary).compress(data)
+        header = bytes([self.codec]) + _DICTIONARY_ID.pack(self.dictionary_id)
+        if len(header) + len(payload) >= 1 + len(data):
+            return bytes([RAW]) + data
+        return header + payload
+
+
+def decompress(value, load_dictionary=None):
+    """
+    Returns the text of a stored value.
+
+    :param value: Bytes written by `Compressor.compress`.
+    :param load_dictionary: Callable returning the bytes of a dictionary ID (defaults to `get_dictionary`).
+    """
+    value = bytes(value)
+    codec = value[0] if value else RAW
+    if codec == RAW:
+        return value[1:].decode("utf-8")
+    (dictionary_id,) = _DICTIONARY_ID.unpack_from(value, 1)
+    payload = value[1 + _DICTIONARY_ID.size:]
+    dictionary = (load_dictionary or get_dictionary)(dictionary_id) if dictionary_id else b""
+    if codec == ZLIB:
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        data = decompressor.decompress(payload) + decompressor.flush()
+    elif codec == ZSTD:
+        if zstandard is None:
+            raise ValueError("Page compressed with zstd but the zstandard package is not installed")
+        dict_data = _zstd_dictionary(dictionary_id, dictionary) if dictionary else None
+        data = zstandard.ZstdDecompressor(dict_data=dict_data).decompress(payload)
+    else:
+        raise ValueError(f"Unknown page compression codec: {codec}")
+    return data.decode("utf-8")
+
+
+def train_dictionary(samples, codec, size=None):
+    """
+    Builds a dictionary from sample texts.
+
+    zstd uses its trainer; for zlib the dictionary is made of the word
+    sequences that would save the most bytes (frequency x length), the most
+    valuable last, since zlib favours the end of its preset dictionary.
+
+    :param samples: A list of page texts.
+    :param codec: `ZLIB` or `ZSTD`.
+    :param size: Maximum dictionary size in bytes (defaults to `settings.BOOK_PAGE_DICTIONARY_SIZE`).
+    :return: The dictionary bytes, or b"" when the samples are too few to train one.
+    """
+    size = size or settings.BOOK_PAGE_DICTIONARY_SIZE
+    if len(samples) < settings.BOOK_PAGE_DICTIONARY_MIN_SAMPLES:
+        return b""
+    if codec == ZSTD:
+        try:
+            return zstandard.train_dictionary(size, [text.encode("utf-8") for text in samples]).as_bytes()
+        except zstandard.ZstdError as e:
+            logger.warning("Could not train a zstd dictionary from %s samples: %s", len(samples), e)
+            return b""
+
+    size = min(size, ZLIB_MAX_DICTIONARY_SIZE)
+    counts = Counter()
+    for text in samples:
+        counts.update(match.group(0) for match in _WORDS.finditer(text))
+    chosen, total = [], 0
+    for phrase, count in sorted(counts.items(), key=lambda item: item[1] * len(item[0]), reverse=True):
+        if count < 2:
+            break
+        encoded = phrase.encode("utf-8") + b" "
+        if total + len(encoded) > size:
+            continue
+        chosen.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(chosen))
+
+
+def sample_texts(queryset, field, count):
+    """
+    Picks about `count` texts spread over the whole table, by primary key.
+    """
+    ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+    if len(ids) > count:
+        ids = sorted(random.Random(0).sample(ids, count))
+    texts = []
+    for start in range(0, len(ids), 500):
+        texts.extend(queryset.filter(pk__in=ids[start:start + 500]).values_list(field, flat=True))
+    return [text for text in texts if text]
+
+
+def recompress(queryset, compressor, source, target, batch_size=None, load_dictionary=None, output=None):
+    """
+    Rewrites the rows of `queryset` with `compressor`, in batches of primary keys.
+
+    :param queryset: Pages to rewrite (a migration's historical model also works).
+    :param compressor: The `Compressor` to write with.
+    :param source: Field the text is read from (a text field, or the compressed field itself).
+    :param target: Compressed field written to; `content_size` is updated too.
+    :param batch_size: Rows per batch (defaults to `settings.BOOK_PAGE_BATCH_SIZE`).
+    :param load_dictionary: Dictionary loader used to check the written values.
+    :param output: Optional callable receiving a progress line per batch.
+    :return: A report dictionary: rows, text and stored bytes, bytes saved, and
+             CPU seconds spent compressing and decompressing.
+    """
+    batch_size = batch_size or settings.BOOK_PAGE_BATCH_SIZE
+    report = {"rows": 0, "text_bytes": 0, "stored_bytes_before": 0, "stored_bytes": 0,
+              "compress_cpu_seconds": 0.0, "decompress_cpu_seconds": 0.0}
+    last_pk = 0
+    while True:
+        rows = list(
+            queryset.filter(pk__gt=last_pk).order_by("pk")
+            .annotate(stored_size=Length(source)).values_list("pk", source, "stored_size")[:batch_size]
+        )
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        pages = []
+        for pk, text, size in rows:
+            text = text or ""
+            # The compressed field is read back as text; its stored size is the column length.
+            report["stored_bytes_before"] += (size or 0) if source == target else len(text.encode("utf-8"))
+            started = time.process_time()
+            stored = compressor.compress(text)
+            report["compress_cpu_seconds"] += time.process_time() - started
+            started = time.process_time()
+            decompress(stored, load_dictionary)
+            report["decompress_cpu_seconds"] += time.process_time() - started
+
+            report["rows"] += 1
+            report["text_bytes"] += len(text.encode("utf-8"))
+            report["stored_bytes"] += len(stored)
+            pages.append(queryset.model(pk=pk, **{target: stored, "content_size": len(text)}))
+        queryset.model.objects.bulk_update(pages, [target, "content_size"])
+        if output:
+            output(f"Recompressed {report['rows']} pages (up to ID {last_pk})")
+
+    report["saved_bytes"] = report["stored_bytes_before"] - report["stored_bytes"]
+    report["ratio"] = round(report["stored_bytes"] / report["text_bytes"], 3) if report["text_bytes"] else 1.0
+    return report
+
+
+def format_report(report):
+    return (
+        f"{report['rows']} pages: {report['stored_bytes_before']} -> {report['stored_bytes']} bytes "
+        f"({report['saved_bytes']} saved, {report['ratio']:.1%} of the text); "
+        f"CPU {report['compress_cpu_seconds']:.2f} s compressing, {report['decompress_cpu_seconds']:.2f} s decompressing"
+    )
+
+
+# Process-wide state: dictionaries never change once stored, so they are cached
+# forever; the active compressor is re-read every BOOK_PAGE_DICTIONARY_REFRESH seconds.
+
+_dictionaries = {}
+_zstd_dictionaries = {}
+_active = {"compressor": None, "loaded_at": 0.0}
+_lock = threading.Lock()
+
+
+def get_dictionary(dictionary_id):
+    dictionary = _dictionaries.get(dictionary_id)
+    if dictionary is None:
+        from books.models import CompressionDictionary
+
+        dictionary = _dictionaries[dictionary_id] = bytes(
+            CompressionDictionary.objects.values_list("data", flat=True).get(pk=dictionary_id)
+        )
+    return dictionary
+
+
+def _zstd_dictionary(dictionary_id, dictionary):
+    dict_data = _zstd_dictionaries.get(dictionary_id)
+    if dict_data is None:
+        dict_data = _zstd_dictionaries[dictionary_id] = zstandard.ZstdCompressionDict(dictionary)
+    return dict_data
+
+
+def get_compressor():
+    """
+    Returns the compressor for new writes: the codec of
+    `settings.BOOK_PAGE_COMPRESSION` with its most recent dictionary.
+    """
+    now = time.monotonic()
+    compressor = _active["compressor"]
+    if compressor is not None and now - _active["loaded_at"] < settings.BOOK_PAGE_DICTIONARY_REFRESH:
+        return compressor
+    with _lock:
+        codec = CODECS[settings.BOOK_PAGE_COMPRESSION]
+        dictionary_id, dictionary = 0, b""
+        if codec != RAW:
+            from books.models import CompressionDictionary
+
+            latest = CompressionDictionary.objects.filter(codec=codec).order_by("-id").values_list("id", "data").first()
+            if latest:
+                dictionary_id, dictionary = latest[0], bytes(latest[1])
+                _dictionaries[dictionary_id] = dictionary
+        compressor = Compressor(codec, settings.BOOK_PAGE_COMPRESSION_LEVEL, dictionary_id, dictionary)
+        _active.update(compressor=compressor, loaded_at=now)
+    return compressor
+
+
+def reset():
+    """
+    Forgets the cached compressor and dictionaries.
+    """
+    with _lock:
+        _dictionaries.clear()
+        _zstd_dictionaries.clear()
+        _active.update(compressor=None, loaded_at=0.0)
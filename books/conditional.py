@@ -0,0 +1,136 @@
+"""
+ETag and Last-Modified callables for `django.views.decorators.http.condition`.
+
+Both are derived from the book version (its `updated_at`, which also moves
+whenever one of its pages is saved). The version is read from the catalog
+cache, so answering a conditional request costs at most one indexed lookup
+and never loads or serializes page content.
+"""
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from books.services.book_service import BookService
+
+
+def _book_version(book_id):
+    return BookService().get_book_version(book_id)
+
+
+async def _abook_version(book_id):
+    return await BookService().aget_book_version(book_id)
+
+
+def _last_modified(version):
+    return datetime.fromtimestamp(int(version) / 1_000_000, tz=timezone.utc) if version else None
+
+
+def _representation_digest(request):
+    params = f"{request.get_host()}?{request.GET.urlencode()}"
+    return hashlib.md5(params.encode("utf-8")).hexdigest()[:16]
+
+
+def book_etag(request, pk=None):
+    """
+    Strong ETag of a book detail representation.
+    """
+    version = _book_version(pk)
+    return f'"book-{pk}-{version}"' if version else None
+
+
+def book_last_modified(request, pk=None):
+    """
+    Last modification time of a book.
+    """
+    return _last_modified(_book_version(pk))
+
+
+def book_pages_etag(request, book_id=None, **kwargs):
+    """
+    Strong ETag of a batch of pages; it also depends on the query string,
+    since each pagination cursor is a different representation.
+    """
+    version = _book_version(book_id)
+    return f'"pages-{book_id}-{version}-{_representation_digest(request)}"' if version else None
+
+
+def book_pages_last_modified(request, book_id=None, **kwargs):
+    """
+    Last modification time of the pages of a book.
+    """
+    return _last_modified(_book_version(book_id))
+
+
+def book_page_etag(request, book_id=None, page_number=None):
+    """
+    Strong ETag of a single page.
+    """
+    version = _book_version(book_id)
+    return f'"page-{book_id}-{page_number}-{version}"' if version else None
+
+
+async def abook_etag(request, pk=None):
+    """
+    Async version of `book_etag`.
+    """
+    version = await _abook_version(pk)
+    return f'"book-{pk}-{version}"' if version else None
+
+
+async def abook_last_modified(request, pk=None):
+    """
+    Async version of `book_last_modified`.
+    """
+    return _last_modified(await _abook_version(pk))
+
+
+async def abook_pages_etag(request, book_id=None, **kwargs):
+    """
+    Async version of `book_pages_etag`.
+    """
+    version = await _abook_version(book_id)
+    return f'"pages-{book_id}-{version}-{_representation_digest(request)}"' if version else None
+
+
+async def abook_pages_last_modified(request, book_id=None, **kwargs):
+    """
+    Async version of `book_pages_last_modified`.
+    """
+    return _last_modified(await _abook_version(book_id))
+
+
+def acondition(etag_func=None, last_modified_func=None):
+    """
+    `django.views.decorators.http.condition` for async view methods, with
+    async ETag and Last-Modified callables.
+
+    Django's `condition` calls its callables synchronously, which would query
+    the database from the event loop, and `method_decorator` hides that the
+    decorated method is a coroutine function; this decorator is applied to the
+    method directly and keeps it one.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        async def inner(self, request, *args, **kwargs):
+            res_last_modified = None
+            if last_modified_func and (dt := await last_modified_func(request, *args, **kwargs)):
+                res_last_modified = int(dt.timestamp())
+            res_etag = await etag_func(request, *args, **kwargs) if etag_func else None
+            res_etag = quote_etag(res_etag) if res_etag is not None else None
+
+            response = get_conditional_response(request, etag=res_etag, last_modified=res_last_modified)
+            if response is None:
+                response = await method(self, request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD"):
+                if res_last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(res_last_modified)
+                if res_etag:
+                    response.headers.setdefault("ETag", res_etag)
+            return response
+
+        return inner
+
+    return decorator
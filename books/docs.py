@@ -1,6 +1,9 @@
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from books.serializers.book_serializer import BookSerializer
+from books.serializers.book_list_serializer import BookListSerializer
 from books.serializers.book_page_serializer import BookPageSerializer
+from books.serializers.book_search_serializer import BookSearchResultSerializer
 
 
 list_books_docs = extend_schema(
@@ -11,8 +14,33 @@ list_books_docs = extend_schema(
     **Notas:**
     - Solo usuarios autenticados pueden acceder.
     - No incluye las páginas del libro, solo información general.
+    - `page_count` y `total_size` resumen la cantidad de páginas y de caracteres del libro.
+    - La paginación es por cursor: sigue los enlaces `next`/`previous`. Enviar `page` o
+      `pagination=offset` activa la paginación por número de página (incluye `count`).
+    - Filtros: `author` (exacto), `title_prefix` (prefijo del título, sin distinguir mayúsculas)
+      y rangos de fechas `created_after`/`created_before`, `updated_after`/`updated_before`.
+    - `title_prefix` solo se combina con `ordering=title` o `-title` (el orden por defecto en ese caso).
     """,
-    responses={200: BookSerializer(many=True)}
+    parameters=[
+        OpenApiParameter(name="author", description="Autor exacto", required=False, type=str),
+        OpenApiParameter(name="title_prefix", description="Prefijo del título", required=False, type=str),
+        OpenApiParameter(name="created_after", description="Creados desde esta fecha (inclusive, ISO 8601)", required=False, type=OpenApiTypes.DATETIME),
+        OpenApiParameter(name="created_before", description="Creados antes de esta fecha (ISO 8601)", required=False, type=OpenApiTypes.DATETIME),
+        OpenApiParameter(name="updated_after", description="Modificados desde esta fecha (inclusive, ISO 8601)", required=False, type=OpenApiTypes.DATETIME),
+        OpenApiParameter(name="updated_before", description="Modificados antes de esta fecha (ISO 8601)", required=False, type=OpenApiTypes.DATETIME),
+        OpenApiParameter(
+            name="ordering", description="Orden de la lista (por defecto `-created_at`)", required=False, type=str,
+            enum=["-created_at", "created_at", "-updated_at", "updated_at", "title", "-title"],
+        ),
+        OpenApiParameter(name="cursor", description="Cursor opaco de los enlaces `next`/`previous`", required=False, type=str),
+        OpenApiParameter(name="page_size", description="Cantidad de libros por solicitud", required=False, type=int),
+        OpenApiParameter(name="pagination", description="`offset` para paginación por número de página", required=False, type=str),
+        OpenApiParameter(name="page", description="Número de página (modo `offset`)", required=False, type=int),
+    ],
+    responses={
+        200: BookListSerializer(many=True),
+        400: {"description": "Filtro u orden inválido"},
+    }
 )
 
 retrieve_book_docs = extend_schema(
@@ -23,12 +51,14 @@ retrieve_book_docs = extend_schema(
     **Notas:**
     - No incluye las páginas del libro, solo información general.
     - Disponible para todos los usuarios autenticados.
+    - Devuelve `ETag` y `Last-Modified`; con `If-None-Match`/`If-Modified-Since` responde 304 si el libro no cambió.
     """,
     parameters=[
         OpenApiParameter(name="id", description="ID del libro a obtener", required=True, type=int, location=OpenApiParameter.PATH)
     ],
     responses={
         200: BookSerializer(),
+        304: {"description": "El libro no cambió desde la versión indicada"},
         404: {"description": "Libro no encontrado"},
         500: {"description": "Error interno del servidor"},
     }
@@ -126,24 +156,133 @@ delete_book_docs = extend_schema(
     ]
 )
 
+bulk_import_books_docs = extend_schema(
+    summary="Importa libros en bloque",
+    description="""
+    Importa muchos libros en una sola solicitud a partir de un cuerpo NDJSON
+    (`Content-Type: application/x-ndjson`), con un libro por línea en el mismo
+    formato que acepta la creación de libros.
+
+    El cuerpo se procesa en streaming y se escribe en bloques. Las líneas inválidas
+    no detienen la importación: se devuelven en `errors` junto con su número de línea.
+
+    **Permisos:**
+    - Solo los editores pueden importar libros.
+    """,
+    request={"application/x-ndjson": {"type": "string"}},
+    responses={
+        200: {"description": "Reporte de importación con `created`, `pages`, `failed` y `errors`"},
+        403: {"description": "No tienes permisos para importar libros"},
+        500: {"description": "Error interno del servidor"},
+    },
+    examples=[
+        OpenApiExample(
+            name="Ejemplo de importación",
+            value='{"title": "Libro 1", "author": "Autor 1", "pages": [{"page_number": 1, "content": "..."}]}\n'
+                  '{"title": "Libro 2", "author": "Autor 2"}\n',
+            request_only=True
+        )
+    ]
+)
+
+export_books_docs = extend_schema(
+    summary="Exporta el catálogo completo",
+    description="""
+    Descarga todo el catálogo en streaming, sin paginación, como NDJSON (un libro por línea)
+    o CSV (una fila por libro, o una fila por página si se incluyen las páginas).
+
+    **Notas:**
+    - Disponible para todos los usuarios autenticados.
+    - La respuesta se genera por bloques, por lo que su tamaño no está limitado por la memoria del servidor.
+    """,
+    parameters=[
+        OpenApiParameter(name="file_format", description="Formato de exportación: `ndjson` (por defecto) o `csv`", required=False, type=str),
+        OpenApiParameter(name="include_pages", description="Incluye el contenido de las páginas (`true`/`false`)", required=False, type=bool),
+    ],
+    responses={
+        (200, "application/x-ndjson"): {"type": "string"},
+        (200, "text/csv"): {"type": "string"},
+        400: {"description": "Formato desconocido"},
+    }
+)
+
+search_books_docs = extend_schema(
+    summary="Busca libros por texto",
+    description="""
+    Búsqueda de texto completo sobre el título, el autor y el contenido de las páginas.
+
+    **Notas:**
+    - Disponible para todos los usuarios autenticados.
+    - Los libros se ordenan por relevancia; cada resultado incluye sus páginas más relevantes
+      con un fragmento del texto donde los términos buscados aparecen entre `<mark>` y `</mark>`.
+    """,
+    parameters=[
+        OpenApiParameter(name="q", description="Texto a buscar", required=True, type=str),
+        OpenApiParameter(name="limit", description="Cantidad máxima de libros devueltos", required=False, type=int),
+    ],
+    responses={
+        200: BookSearchResultSerializer(many=True),
+        400: {"description": "Falta el parámetro `q` o `limit` no es válido"},
+    }
+)
+
+cache_stats_docs = extend_schema(
+    summary="Estadísticas de la caché del catálogo",
+    description="""
+    Devuelve los contadores de aciertos, fallos y desalojos de la caché de libros y páginas.
+
+    **Notas:**
+    - Los contadores son por proceso del servidor.
+    - Solo accesible por administradores.
+    """,
+    responses={
+        200: {"description": "Contadores `hits`, `misses`, `evictions`, `hit_ratio` y `backend`"},
+        403: {"description": "No tienes permisos para ver las estadísticas"},
+    }
+)
+
 list_book_pages_docs = extend_schema(
     summary="Lista las páginas de un libro",
     description="""
     Devuelve una lista paginada de las páginas de un libro específico.
 
     **Notas:**
-    - Se puede usar paginación con `page` y `page_size`.
+    - La paginación es por cursor: sigue los enlaces `next`/`previous`. Enviar `page` o
+      `pagination=offset` activa la paginación por número de página (incluye `count`).
     - Disponible para todos los usuarios autenticados.
+    - Devuelve `ETag` y `Last-Modified`; con `If-None-Match`/`If-Modified-Since` responde 304 si las páginas no cambiaron.
     """,
-    responses={200: BookPageSerializer(many=True)},
+    responses={200: BookPageSerializer(many=True), 304: {"description": "Las páginas no cambiaron"}},
     parameters=[
         OpenApiParameter(name="book_id", description="ID del libro", required=True, type=int, location=OpenApiParameter.PATH),
-        OpenApiParameter(name="page", description="Número de la página de paginación", required=False, type=int),
-        OpenApiParameter(name="page_size", description="Cantidad de páginas por solicitud", required=False, type=int)
+        OpenApiParameter(name="cursor", description="Cursor opaco de los enlaces `next`/`previous`", required=False, type=str),
+        OpenApiParameter(name="page_size", description="Cantidad de páginas por solicitud", required=False, type=int),
+        OpenApiParameter(name="pagination", description="`offset` para paginación por número de página", required=False, type=str),
+        OpenApiParameter(name="page", description="Número de la página de paginación (modo `offset`)", required=False, type=int),
     ]
 )
 
-retrieve_book_page_docs = extend_schema(exclude=True)
+retrieve_book_page_docs = extend_schema(
+    summary="Obtiene una página de un libro",
+    description="""
+    Devuelve una única página de un libro a partir de su número de página.
+
+    **Notas:**
+    - Disponible para todos los usuarios autenticados.
+    - `prefetch=N` precarga en caché las N páginas siguientes para la lectura secuencial.
+    - Devuelve `ETag` y `Last-Modified`; con `If-None-Match`/`If-Modified-Since` responde 304 si la página no cambió.
+    """,
+    parameters=[
+        OpenApiParameter(name="book_id", description="ID del libro", required=True, type=int, location=OpenApiParameter.PATH),
+        OpenApiParameter(name="page_number", description="Número de la página", required=True, type=int, location=OpenApiParameter.PATH),
+        OpenApiParameter(name="prefetch", description="Cantidad de páginas siguientes a precargar", required=False, type=int),
+    ],
+    responses={
+        200: BookPageSerializer(),
+        304: {"description": "La página no cambió"},
+        404: {"description": "Libro o página no encontrados"},
+    }
+)
 
 create_book_page_docs = extend_schema(
     summary="Crea una nueva página dentro de un libro",
@@ -0,0 +1,63 @@
+from django import forms
+from django.db import models
+from books import compression
+
+
+class CompressedTextField(models.BinaryField):
+    """
+    Text field stored compressed (see `books.compression`).
+
+    Python code reads and assigns `str` values; the column holds the
+    compressed bytes (a `BLOB`/`LONGBLOB`), so lookups on its content are not
+    supported. Bytes assigned to the field are taken as already compressed.
+
+    `size_field` names an integer field that is kept equal to the length of
+    the text on save and bulk create, so aggregates over text sizes never
+    need to read or decompress the column. It must be declared after this
+    field. It is set in `pre_save`, which `QuerySet.update()` and
+    `bulk_update()` do not call: writes of the text through them must set the
+    size field too (e.g. `update(content=text, content_size=len(text))`), or
+    sizes and `total_size` go stale.
+    """
+
+    description = "Compressed text"
+
+    def __init__(self, *args, size_field=None, **kwargs):
+        self.size_field = size_field
+        kwargs.setdefault("editable", True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.size_field:
+            kwargs["size_field"] = self.size_field
+        if kwargs.get("editable") is True:
+            del kwargs["editable"]
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return compression.decompress(value)
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, memoryview)):
+            return compression.decompress(value)
+        return value
+
+    def get_prep_value(self, value):
+        if isinstance(value, str):
+            return compression.get_compressor().compress(value)
+        return value
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if self.size_field and isinstance(value, str):
+            setattr(model_instance, self.size_field, len(value))
+        return value
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+    def formfield(self, **kwargs):
+        return models.Field.formfield(self, **{"form_class": forms.CharField, "widget": forms.Textarea, **kwargs})
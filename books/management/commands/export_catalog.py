@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from books.services.catalog_export_service import CatalogExportService
+
+
+class Command(BaseCommand):
+    help = "Exports the whole catalog as NDJSON or CSV, streaming rows to a file or stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file-format", choices=CatalogExportService.FORMATS, default="ndjson")
+        parser.add_argument("--include-pages", action="store_true", help="Include page content.")
+        parser.add_argument("--output", default="-", help="Output path, or '-' for stdout (default).")
+        parser.add_argument("--chunk-size", type=int, help="Number of books fetched per database round-trip.")
+
+    def handle(self, *args, **options):
+        service = CatalogExportService(chunk_size=options["chunk_size"])
+        chunks = service.export(options["file_format"], options["include_pages"])
+
+        if options["output"] == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+        else:
+            with open(options["output"], "w", encoding="utf-8", newline="") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported {service.rows} rows in {service.elapsed:.2f} s ({service.rows_per_second:.0f} rows/s)"
+        ))
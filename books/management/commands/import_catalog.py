@@ -0,0 +1,30 @@
+import json
+import sys
+from django.core.management.base import BaseCommand
+from books.services.catalog_import_service import CatalogImportService
+
+
+class Command(BaseCommand):
+    help = "Imports books from a newline-delimited JSON file (one book per line). Use '-' to read from stdin."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the NDJSON file, or '-' for stdin.")
+        parser.add_argument("--chunk-size", type=int, help="Number of records validated and written together.")
+        parser.add_argument("--batch-size", type=int, help="Number of rows per INSERT.")
+
+    def handle(self, *args, **options):
+        service = CatalogImportService(chunk_size=options["chunk_size"], batch_size=options["batch_size"])
+
+        if options["path"] == "-":
+            report = service.import_lines(sys.stdin)
+        else:
+            with open(options["path"], encoding="utf-8") as stream:
+                report = service.import_lines(stream)
+
+        for error in report["errors"]:
+            self.stderr.write(f"Line {error['line']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} books ({report['pages']} pages), {report['failed']} failed "
+            f"in {report['elapsed_seconds']} s ({report['books_per_second']} books/s)"
+        ))
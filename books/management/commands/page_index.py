@@ -0,0 +1,51 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from books.page_index import PageIndex
+from books.repositories.book_page_repository import BookPageRepository
+
+
+class Command(BaseCommand):
+    help = "Builds or queries the in-process page index (settings.PAGE_INDEX_PATH)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["build", "query", "stats"])
+        parser.add_argument("query", nargs="?", help="Query for the 'query' action, e.g. '\"jardín de senderos\" -borges'.")
+        parser.add_argument("--path", help="Index file (defaults to settings.PAGE_INDEX_PATH).")
+        parser.add_argument("--limit", type=int, default=20, help="Maximum number of pages printed by 'query'.")
+        parser.add_argument(
+            "--every", type=float, metavar="SECONDS",
+            help="With 'build': keep running and rebuild every SECONDS (running workers pick up each build).",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"] or settings.PAGE_INDEX_PATH
+        if not path:
+            raise CommandError("Set PAGE_INDEX_PATH or pass --path")
+
+        if options["action"] == "build":
+            while True:
+                started = time.perf_counter()
+                count = PageIndex.build(BookPageRepository.iter_page_contents(), path)
+                self.stdout.write(self.style.SUCCESS(
+                    f"Indexed {count} pages into {path} in {time.perf_counter() - started:.2f} s"
+                ))
+                if not options["every"]:
+                    break
+                time.sleep(options["every"])
+            return
+
+        index = PageIndex(path)
+        if options["action"] == "stats":
+            for key, value in index.stats().items():
+                self.stdout.write(f"{key}: {value}")
+            return
+
+        if not options["query"]:
+            raise CommandError("The 'query' action needs a query")
+        started = time.perf_counter()
+        matches = index.search(options["query"])
+        elapsed = (time.perf_counter() - started) * 1000
+        for book_id, page_number in matches[:options["limit"]]:
+            self.stdout.write(f"book {book_id} page {page_number}")
+        self.stderr.write(self.style.SUCCESS(f"{len(matches)} pages matched in {elapsed:.2f} ms"))
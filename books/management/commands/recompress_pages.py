@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from books import compression
+from books.models import BookPage, CompressionDictionary
+
+
+class Command(BaseCommand):
+    help = "Rewrites every page with the configured compression, optionally training a new dictionary first."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--train", action="store_true",
+            help="Train a new dictionary on a sample of the current pages (BOOK_PAGE_DICTIONARY_SAMPLES).",
+        )
+        parser.add_argument("--batch-size", type=int, help="Number of pages rewritten per statement.")
+
+    def handle(self, *args, **options):
+        codec = compression.CODECS.get(settings.BOOK_PAGE_COMPRESSION)
+        if codec is None:
+            raise CommandError(f"Unknown BOOK_PAGE_COMPRESSION: {settings.BOOK_PAGE_COMPRESSION}")
+
+        if options["train"] and codec != compression.RAW:
+            samples = compression.sample_texts(BookPage.objects.all(), "content", settings.BOOK_PAGE_DICTIONARY_SAMPLES)
+            dictionary = compression.train_dictionary(samples, codec)
+            if dictionary:
+                dictionary_id = CompressionDictionary.objects.create(
+                    codec=codec, data=dictionary, sample_count=len(samples)
+                ).id
+                self.stdout.write(f"Trained dictionary {dictionary_id} ({len(dictionary)} bytes, {len(samples)} samples)")
+            else:
+                self.stdout.write(self.style.WARNING(f"Not enough pages to train a dictionary ({len(samples)} samples)"))
+
+        compression.reset()
+        report = compression.recompress(
+            BookPage.objects.all(), compression.get_compressor(), "content", "content",
+            batch_size=options["batch_size"], output=lambda line: self.stdout.write(line),
+        )
+        self.stdout.write(self.style.SUCCESS(compression.format_report(report)))
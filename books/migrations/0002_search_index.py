@@ -0,0 +1,68 @@
+from django.db import migrations
+
+# Full-text index of book titles, authors and page contents, maintained by
+# `books.repositories.search_repository.SearchRepository`. It is a separate table
+# (one row per book with title/author, one row per page with its content) so it
+# can use each backend's native full-text engine: FULLTEXT on MySQL, FTS5 on SQLite.
+# Both keep an uncompressed copy of every page next to the compressed
+# `books_bookpage.content` (on MySQL the `content` LONGTEXT column, plus its
+# FULLTEXT index); page compression does not shrink this table.
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE books_search USING fts5(
+    title, author, content, book_id UNINDEXED, page_number UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+MYSQL_CREATE = """
+CREATE TABLE books_search (
+    id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    book_id BIGINT NOT NULL,
+    page_number INT UNSIGNED NULL,
+    title VARCHAR(255) NOT NULL DEFAULT '',
+    author VARCHAR(255) NOT NULL DEFAULT '',
+    content LONGTEXT NOT NULL,
+    KEY books_search_book (book_id, page_number),
+    FULLTEXT KEY books_search_text (title, author, content)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+BACKFILL = [
+    """
+    INSERT INTO books_search (book_id, page_number, title, author, content)
+    SELECT id, NULL, title, author, '' FROM books_book
+    """,
+    """
+    INSERT INTO books_search (book_id, page_number, title, author, content)
+    SELECT book_id, page_number, '', '', content FROM books_bookpage
+    """,
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+    elif vendor == "mysql":
+        schema_editor.execute(MYSQL_CREATE)
+    else:
+        return
+    for statement in BACKFILL:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "mysql"):
+        schema_editor.execute("DROP TABLE books_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,35 @@
+import books.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Adds the compressed copy of page content (filled by 0005, swapped in by 0006).
+    """
+
+    dependencies = [
+        ('books', '0003_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompressionDictionary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codec', models.PositiveSmallIntegerField()),
+                ('data', models.BinaryField()),
+                ('sample_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='bookpage',
+            name='content_size',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='bookpage',
+            name='content_compressed',
+            field=books.fields.CompressedTextField(null=True),
+        ),
+    ]
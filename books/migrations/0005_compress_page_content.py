@@ -0,0 +1,50 @@
+import logging
+from django.conf import settings
+from django.db import migrations
+from books import compression
+
+logger = logging.getLogger(__name__)
+
+
+def compress_pages(apps, schema_editor):
+    """
+    Trains a dictionary on a sample of the existing pages, then compresses every
+    page not compressed yet in batches, logging the space saved and CPU time.
+    Interrupted runs can be resumed: converted pages are skipped.
+    """
+    BookPage = apps.get_model("books", "BookPage")
+    CompressionDictionary = apps.get_model("books", "CompressionDictionary")
+    pending = BookPage.objects.filter(content_compressed__isnull=True)
+    if not pending.exists():
+        return
+
+    codec = compression.CODECS[settings.BOOK_PAGE_COMPRESSION]
+    dictionary_id, dictionary = 0, b""
+    if codec != compression.RAW:
+        samples = compression.sample_texts(BookPage.objects.all(), "content", settings.BOOK_PAGE_DICTIONARY_SAMPLES)
+        dictionary = compression.train_dictionary(samples, codec)
+        if dictionary:
+            dictionary_id = CompressionDictionary.objects.create(
+                codec=codec, data=dictionary, sample_count=len(samples)
+            ).id
+
+    def load_dictionary(requested_id):
+        if requested_id == dictionary_id:
+            return dictionary
+        return bytes(CompressionDictionary.objects.get(pk=requested_id).data)
+
+    compressor = compression.Compressor(codec, settings.BOOK_PAGE_COMPRESSION_LEVEL, dictionary_id, dictionary)
+    report = compression.recompress(pending, compressor, "content", "content_compressed", load_dictionary=load_dictionary)
+    # WARNING so the report reaches the console handler during `migrate`.
+    logger.warning("Page compression (%s): %s", settings.BOOK_PAGE_COMPRESSION, compression.format_report(report))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0004_page_content_compression'),
+    ]
+
+    operations = [
+        migrations.RunPython(compress_pages, migrations.RunPython.noop, elidable=True),
+    ]
@@ -0,0 +1,55 @@
+import books.fields
+from django.db import migrations, models
+
+
+def restore_text(apps, schema_editor):
+    """
+    Reverse only: copies the text back into the restored text column (the
+    compressed field decompresses as it is read).
+    """
+    BookPage = apps.get_model("books", "BookPage")
+    last_pk = 0
+    while True:
+        rows = list(
+            BookPage.objects.filter(pk__gt=last_pk).order_by("pk")
+            .values_list("pk", "content_compressed")[:500]
+        )
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        BookPage.objects.bulk_update([BookPage(pk=pk, content=text or "") for pk, text in rows], ["content"])
+
+
+class Migration(migrations.Migration):
+    """
+    Replaces the text column with the compressed one filled by 0005.
+    """
+
+    dependencies = [
+        ('books', '0005_compress_page_content'),
+    ]
+
+    operations = [
+        # Nullable first, so that when reversed the text column can be re-added
+        # to a populated table and filled by restore_text before NOT NULL applies.
+        migrations.AlterField(
+            model_name='bookpage',
+            name='content',
+            field=models.TextField(null=True),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, restore_text),
+        migrations.RemoveField(
+            model_name='bookpage',
+            name='content',
+        ),
+        migrations.RenameField(
+            model_name='bookpage',
+            old_name='content_compressed',
+            new_name='content',
+        ),
+        migrations.AlterField(
+            model_name='bookpage',
+            name='content',
+            field=books.fields.CompressedTextField(size_field='content_size'),
+        ),
+    ]
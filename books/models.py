@@ -1,4 +1,5 @@
 from django.db import models
+from books.fields import CompressedTextField
 
 
 class Book(models.Model):
@@ -9,12 +10,36 @@ class Book(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        # One index per supported list ordering, alone and after an author filter,
+        # so filtered and ordered pages are read as index range scans.
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="book_created_idx"),
+            models.Index(fields=["updated_at", "id"], name="book_updated_idx"),
+            models.Index(fields=["title", "id"], name="book_title_idx"),
+            models.Index(fields=["author", "created_at", "id"], name="book_author_created_idx"),
+            models.Index(fields=["author", "updated_at", "id"], name="book_author_updated_idx"),
+            models.Index(fields=["author", "title", "id"], name="book_author_title_idx"),
+        ]
 
 class BookPage(models.Model):
     book = models.ForeignKey(Book, related_name="pages", on_delete=models.CASCADE)
     page_number = models.PositiveIntegerField()
-    content = models.TextField()
+    content = CompressedTextField(size_field="content_size")
+    content_size = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["page_number"]
         unique_together = ("book", "page_number")
+
+
+class CompressionDictionary(models.Model):
+    """
+    A dictionary trained on sample pages, shared by every page compressed with it.
+
+    Compressed pages store the ID of their dictionary, so rows are never
+    deleted; a newer dictionary only applies to pages written after it.
+    """
+    codec = models.PositiveSmallIntegerField()
+    data = models.BinaryField()
+    sample_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,477 @@
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+_COMBINING = re.compile(r"[\u0300-\u036f]")
+_QUERY_TOKEN = re.compile(r'(-?)"([^"]*)"|(\S+)')
+
+MAGIC = b"BKPX"
+VERSION = 1
+
+# A term whose posting list is this many times longer than the current matches
+# is checked page by page with binary searches instead of being loaded as a set.
+_LOOKUP_RATIO = 8
+
+# magic, version, byte order, built_at, term_count, key_count, position_count, term_bytes
+_HEADER = struct.Struct("<4sHH d QQQQ")
+
+
+def tokenize(text):
+    """
+    Splits text into lower-cased terms without diacritics ("Página" -> "pagina").
+
+    :return: A list of terms; a term's position is its index in the list.
+    """
+    text = text.lower()
+    if not text.isascii():
+        text = _COMBINING.sub("", unicodedata.normalize("NFKD", text))
+    return _TOKEN.findall(text)
+
+
+def page_key(book_id, page_number):
+    """
+    Packs a page into the 64-bit key stored in posting lists (sorted by book, then page).
+    """
+    return (book_id << 32) | page_number
+
+
+def split_key(key):
+    return key >> 32, key & 0xFFFFFFFF
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+class _Builder:
+    """
+    Accumulates posting lists in arrays: per term, the sorted page keys, the end
+    offset of each page's positions and the positions themselves.
+    """
+
+    def __init__(self):
+        self.terms = {}
+
+    def add(self, term, key, positions):
+        """
+        Appends one page to a term's posting list; keys must be added in ascending order.
+        """
+        postings = self.terms.get(term)
+        if postings is None:
+            postings = self.terms[term] = (array("Q"), array("Q"), array("I"))
+        keys, ends, term_positions = postings
+        term_positions.extend(positions)
+        keys.append(key)
+        ends.append(len(term_positions))
+
+    def add_page(self, key, terms):
+        for term, positions in _positions_by_term(terms).items():
+            self.add(term, key, positions)
+
+    def write(self, path, built_at):
+        """
+        Writes the index file (to a temporary file first, then atomically replaced).
+
+        Layout after the header, each section 8-byte aligned: the terms (UTF-8,
+        NUL-separated, sorted), their page counts (u32), then the page keys
+        (u64), position offsets (u64, one more than keys per term) and
+        positions (u32) of all terms, one term after the other.
+        """
+        terms = sorted(self.terms)
+        term_bytes = "\0".join(terms).encode("utf-8")
+        counts = array("I", (len(self.terms[term][0]) for term in terms))
+        keys, offsets, positions = array("Q"), array("Q"), array("I")
+        for term in terms:
+            term_keys, ends, term_positions = self.terms[term]
+            start = len(positions)
+            keys.extend(term_keys)
+            offsets.append(start)
+            offsets.extend(start + end for end in ends)
+            positions.extend(term_positions)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            byte_order = 1 if sys.byteorder == "little" else 2
+            f.write(_HEADER.pack(
+                MAGIC, VERSION, byte_order, built_at, len(terms), len(keys), len(positions), len(term_bytes)
+            ))
+            for section in (term_bytes, counts, keys, offsets, positions):
+                f.write(section)
+                f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+def _positions_by_term(terms):
+    positions = {}
+    for position, term in enumerate(terms):
+        positions.setdefault(term, []).append(position)
+    return positions
+
+
+class _Postings:
+    """
+    The posting list of one term: a slice of the memory-mapped arrays plus the
+    pages indexed in memory since the file was built.
+    """
+
+    __slots__ = ("index", "keys", "offsets", "delta")
+
+    def __init__(self, index, term):
+        self.index = index
+        entry = index._terms.get(term)
+        if entry is None:
+            self.keys = self.offsets = ()
+        else:
+            key_start, offset_start, count = entry
+            self.keys = index._keys[key_start:key_start + count]
+            self.offsets = index._offsets[offset_start:offset_start + count + 1]
+        self.delta = index._delta.get(term, {})
+
+    def __len__(self):
+        return len(self.keys) + len(self.delta)
+
+    def key_set(self):
+        """
+        Returns the keys of the live pages containing the term.
+        """
+        keys = set(self.keys)
+        if self.index._deleted_pages:
+            keys.difference_update(self.index._deleted_pages)
+        if self.index._deleted_books:
+            deleted_books = self.index._deleted_books
+            keys = {key for key in keys if key >> 32 not in deleted_books}
+        keys.update(self.delta)
+        return keys
+
+    def positions(self, key):
+        """
+        Returns the positions of the term in a page, or None if the page does not contain it.
+        """
+        positions = self.delta.get(key)
+        if positions is not None:
+            return positions
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key and self.index._is_live(key):
+            return self.index._positions[self.offsets[i]:self.offsets[i + 1]]
+        return None
+
+
+class PageIndex:
+    """
+    In-process inverted index of page content, for deployments without a
+    database full-text engine and for offline tools.
+
+    The index is a file of compact posting lists (page keys and term positions
+    in flat arrays) that is memory-mapped, so opening it costs one read of the
+    term dictionary and the posting lists are paged in by the OS on demand.
+    Pages saved after the file was built are kept in an in-memory delta (and
+    the file's copies hidden by tombstones) until the file is rebuilt with
+    `manage.py page_index build`; `reload()` then swaps in the new file and
+    drops the delta entries it already covers.
+
+    Queries (`search`) support implicit AND, `OR`, `NOT`/`-term` and
+    `"quoted phrases"`. Conjunctions start from the rarest term; much more
+    frequent terms are checked with binary searches on their sorted keys
+    instead of being loaded, so the cost of a query follows its rarest term
+    rather than the size of the catalog. Phrases are verified on positions
+    only for the pages left after that.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path: The index file; a missing file opens an empty index.
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self._reset_delta()
+        self._load()
+
+    def _reset_delta(self):
+        self._delta = {}  # term -> {key: positions}
+        self._delta_pages = {}  # key -> (indexed_at, terms)
+        self._deleted_pages = {}  # key -> deleted_at (hides the file's copy)
+        self._deleted_books = {}  # book_id -> deleted_at
+
+    def _load(self):
+        self._mmap = None
+        self._terms = {}
+        self._keys = self._offsets = self._positions = ()
+        self.built_at = 0.0
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            self._mtime = os.fstat(f.fileno()).st_mtime
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"Page index file is truncated: {self.path}")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, byte_order, built_at, term_count, key_count, position_count, term_bytes = (
+            _HEADER.unpack_from(self._mmap)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a page index file (or an unsupported version): {self.path}")
+        if byte_order != (1 if sys.byteorder == "little" else 2):
+            raise ValueError(f"Page index file was built on a machine with another byte order: {self.path}")
+
+        view = memoryview(self._mmap)
+        offset = _HEADER.size
+        terms = bytes(view[offset:offset + term_bytes]).decode("utf-8").split("\0") if term_count else []
+        offset = _align(offset + term_bytes)
+        counts = view[offset:offset + 4 * term_count].cast("I")
+        offset = _align(offset + 4 * term_count)
+        self._keys = view[offset:offset + 8 * key_count].cast("Q")
+        offset = _align(offset + 8 * key_count)
+        self._offsets = view[offset:offset + 8 * (key_count + term_count)].cast("Q")
+        offset = _align(offset + 8 * (key_count + term_count))
+        self._positions = view[offset:offset + 4 * position_count].cast("I")
+
+        key_start = 0
+        for i, (term, count) in enumerate(zip(terms, counts)):
+            self._terms[term] = (key_start, key_start + i, count)
+            key_start += count
+        self.built_at = built_at
+
+    @classmethod
+    def build(cls, pages, path):
+        """
+        Builds an index file from scratch.
+
+        :param pages: Iterable of `(book_id, page_number, content)` in ascending
+                      `(book_id, page_number)` order.
+        :param path: The file to write.
+        :return: The number of pages indexed.
+        """
+        built_at = time.time()
+        builder = _Builder()
+        count = 0
+        for book_id, page_number, content in pages:
+            builder.add_page(page_key(book_id, page_number), tokenize(content))
+            count += 1
+        builder.write(path, built_at)
+        return count
+
+    def reload(self):
+        """
+        Reopens the index file if it changed, keeping the in-memory updates that
+        are more recent than the new file.
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            if not self.path or not os.path.exists(self.path):
+                return
+            if os.stat(self.path).st_mtime == self._mtime:
+                return
+            self._load()
+            built_at = self.built_at
+            for key, (indexed_at, terms) in list(self._delta_pages.items()):
+                if indexed_at < built_at:
+                    self._remove_delta_page(key)
+            self._deleted_pages = {key: at for key, at in self._deleted_pages.items() if at >= built_at}
+            self._deleted_books = {book: at for book, at in self._deleted_books.items() if at >= built_at}
+            logger.info("Page index reloaded from %s (%s terms)", self.path, len(self._terms))
+
+    def reload_if_stale(self, interval):
+        """
+        Calls `reload()` if it has not been called for `interval` seconds.
+        """
+        if time.monotonic() - self._checked_at >= interval:
+            self.reload()
+
+    # Incremental updates
+
+    def _has_tombstones(self):
+        return bool(self._deleted_pages or self._deleted_books)
+
+    def _is_live(self, key):
+        return key not in self._deleted_pages and (key >> 32) not in self._deleted_books
+
+    def _remove_delta_page(self, key):
+        _, terms = self._delta_pages.pop(key)
+        for term in terms:
+            postings = self._delta.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._delta[term]
+
+    def update_page(self, book_id, page_number, content):
+        """
+        Indexes (or reindexes) one page.
+        """
+        key = page_key(book_id, page_number)
+        terms = tokenize(content)
+        now = time.time()
+        with self._lock:
+            if key in self._delta_pages:
+                self._remove_delta_page(key)
+            self._deleted_pages[key] = now
+            by_term = _positions_by_term(terms)
+            for term, positions in by_term.items():
+                self._delta.setdefault(term, {})[key] = array("I", positions)
+            self._delta_pages[key] = (now, tuple(by_term))
+
+    def remove_book(self, book_id):
+        """
+        Removes every page of a book.
+        """
+        with self._lock:
+            for key in [key for key in self._delta_pages if key >> 32 == book_id]:
+                self._remove_delta_page(key)
+            self._deleted_books[book_id] = time.time()
+
+    @property
+    def pending(self):
+        """
+        Number of pages indexed in memory since the file was built.
+        """
+        return len(self._delta_pages)
+
+    # Queries
+
+    @staticmethod
+    def parse(query):
+        """
+        Parses a query into a disjunction of conjunctions of `(negated, terms)`
+        clauses; a clause with several terms is a phrase.
+        """
+        conjunctions, clauses, negate = [], [], False
+        for match in _QUERY_TOKEN.finditer(query):
+            minus, phrase, word = match.groups()
+            if word == "OR":
+                if clauses:
+                    conjunctions.append(clauses)
+                clauses, negate = [], False
+                continue
+            if word == "AND":
+                continue
+            if word == "NOT":
+                negate = True
+                continue
+            if word is not None and word.startswith("-") and len(word) > 1:
+                minus, word = "-", word[1:]
+            terms = tuple(tokenize(phrase if phrase is not None else word))
+            if terms:
+                clauses.append((negate or bool(minus), terms))
+            negate = False
+        if clauses:
+            conjunctions.append(clauses)
+        return conjunctions
+
+    def search(self, query, limit=None):
+        """
+        Returns the pages matching a query.
+
+        :param query: E.g. `laberinto tiempo`, `"jardín de senderos"`, `espía OR sinólogo -borges`.
+        :param limit: Maximum number of pages returned.
+        :return: A sorted list of `(book_id, page_number)` tuples.
+        """
+        with self._lock:
+            cache = {}
+            matches = set()
+            for clauses in self.parse(query):
+                matches.update(self._match_conjunction(clauses, cache))
+            keys = sorted(matches)
+        if limit is not None:
+            keys = keys[:limit]
+        return [split_key(key) for key in keys]
+
+    def _postings(self, term, cache):
+        postings = cache.get(term)
+        if postings is None:
+            postings = cache[term] = _Postings(self, term)
+        return postings
+
+    def _match_conjunction(self, clauses, cache):
+        positive = [terms for negated, terms in clauses if not negated]
+        negative = [terms for negated, terms in clauses if negated]
+        if not positive:
+            return set()
+
+        terms = sorted({term for clause in positive for term in clause}, key=lambda term: len(self._postings(term, cache)))
+        matches = None
+        for term in terms:
+            postings = self._postings(term, cache)
+            if matches is None:
+                matches = postings.key_set()
+            elif len(postings) > _LOOKUP_RATIO * len(matches):
+                matches = {key for key in matches if postings.positions(key) is not None}
+            else:
+                matches &= postings.key_set()
+            if not matches:
+                return set()
+
+        for clause in positive:
+            if len(clause) > 1:
+                matches = {key for key in matches if self._matches(key, clause, cache)}
+        for clause in negative:
+            postings = self._postings(clause[0], cache)
+            if len(clause) == 1 and len(postings) <= _LOOKUP_RATIO * len(matches):
+                matches -= postings.key_set()
+            else:
+                matches = {key for key in matches if not self._matches(key, clause, cache)}
+        return matches
+
+    def _matches(self, key, terms, cache):
+        if len(terms) == 1:
+            return self._postings(terms[0], cache).positions(key) is not None
+        positions = []
+        for term in terms:
+            term_positions = self._postings(term, cache).positions(key)
+            if term_positions is None:
+                return False
+            positions.append(term_positions)
+        starts = set(positions[0])
+        for offset, term_positions in enumerate(positions[1:], 1):
+            starts &= {position - offset for position in term_positions}
+            if not starts:
+                return False
+        return True
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "terms": len(self._terms),
+            "postings": len(self._keys),
+            "positions": len(self._positions),
+            "pending_pages": self.pending,
+            "built_at": self.built_at,
+        }
+
+
+_page_index = None
+_page_index_lock = threading.Lock()
+
+
+def get_page_index():
+    """
+    Returns the process-wide index of `settings.PAGE_INDEX_PATH`, or None when
+    the in-process index is disabled (the default).
+
+    The file is checked for a newer build at most every
+    `settings.PAGE_INDEX_RELOAD_INTERVAL` seconds.
+    """
+    global _page_index
+    path = settings.PAGE_INDEX_PATH
+    if not path:
+        return None
+    with _page_index_lock:
+        if _page_index is None or _page_index.path != path:
+            _page_index = PageIndex(path)
+    _page_index.reload_if_stale(settings.PAGE_INDEX_RELOAD_INTERVAL)
+    return _page_index
@@ -0,0 +1,24 @@
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parser for newline-delimited JSON (one JSON document per line).
+
+    The body is not read up front: `request.data` is an iterator over the raw
+    lines of the request stream, so records can be decoded and validated while
+    the upload is still being read.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Returns a lazy iterator over the lines of the request body.
+
+        :param stream: The request stream (None when the body is empty).
+        :return: Iterator of raw lines (bytes).
+        """
+        if stream is None:
+            return iter(())
+        return iter(stream)
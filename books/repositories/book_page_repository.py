@@ -1,5 +1,7 @@
 import logging
+from django.conf import settings
 from books.models import BookPage
+from config.results import QueryResult
 
 logger = logging.getLogger(__name__) 
 
@@ -13,16 +15,77 @@ class BookPageRepository:
         """
         Retrieves all pages of a specific book, ordered by page number.
 
+        The queryset is not evaluated here; its cardinality is recorded on the
+        result by whichever layer paginates it.
+
+        :param book_id: The ID of the book whose pages are being retrieved.
+        :return: QueryResult wrapping the book's pages.
+        """
+        try:
+            return QueryResult(BookPage.objects.filter(book_id=book_id).order_by("page_number"))
+        except Exception as e:
+            logger.error("Error retrieving pages for book ID %s: %s", book_id, e) 
+            return None
+
+    @staticmethod
+    def get_page_rows_by_book(book_id, fields):
+        """
+        Retrieves the pages of a book as `values()` rows, ordered by page number.
+
         :param book_id: The ID of the book whose pages are being retrieved.
-        :return: QuerySet containing the book's pages.
+        :param fields: The columns to select.
+        :return: QueryResult wrapping the rows.
+        """
+        return QueryResult(BookPage.objects.filter(book_id=book_id).order_by("page_number").values(*fields))
+
+    @staticmethod
+    def get_page_range(book_id, first_page, last_page, fields=None):
+        """
+        Retrieves the pages of a book whose numbers fall within an inclusive range.
+
+        The query is a range scan on the `(book_id, page_number)` index.
+
+        :param book_id: The ID of the book containing the pages.
+        :param first_page: The first page number of the range.
+        :param last_page: The last page number of the range.
+        :param fields: Columns to select as `values()` rows instead of loading pages.
+        :return: A list of pages (or rows) ordered by page number.
+        :raises DatabaseError: If the query fails (logged and re-raised, so it is not taken for missing pages).
+        """
+        try:
+            pages = BookPage.objects.filter(
+                book_id=book_id, page_number__gte=first_page, page_number__lte=last_page
+            ).order_by("page_number")
+            return list(pages.values(*fields) if fields else pages)
+        except Exception as e:
+            logger.error("Error retrieving pages %s-%s for book ID %s: %s", first_page, last_page, book_id, e)
+            raise
+
+    @staticmethod
+    def get_page_by_id(book_id, page_id):
+        """
+        Retrieves one page of a book by its primary key.
+
+        :param book_id: The ID of the book containing the page.
+        :param page_id: The ID of the page to retrieve.
+        :return: The page object if found, otherwise None.
         """
         try:
-            pages = BookPage.objects.filter(book_id=book_id).order_by("page_number")
-            if pages.exists():
-                logger.info(f"Retrieved {pages.count()} pages for book ID {book_id}")
-            else:
-                logger.warning(f"No pages found for book ID {book_id}")
-            return pages
+            return BookPage.objects.filter(book_id=book_id, id=page_id).first()
         except Exception as e:
-            logger.error(f"Error retrieving pages for book ID {book_id}: {e}") 
+            logger.error("Error retrieving page ID %s for book ID %s: %s", page_id, book_id, e)
             return None
+
+    @staticmethod
+    def iter_page_contents(chunk_size=None):
+        """
+        Iterates over the content of every page, ordered by book and page number.
+
+        :param chunk_size: Number of rows fetched per round-trip (defaults to `settings.BOOK_EXPORT_CHUNK_SIZE`).
+        :return: An iterator of `(book_id, page_number, content)` tuples.
+        """
+        return (
+            BookPage.objects.order_by("book_id", "page_number")
+            .values_list("book_id", "page_number", "content")
+            .iterator(chunk_size=chunk_size or settings.BOOK_EXPORT_CHUNK_SIZE)
+        )
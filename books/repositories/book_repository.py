@@ -1,28 +1,118 @@
 import logging
+from collections import defaultdict, deque
+from django.conf import settings
+from django.db import DatabaseError, connections, router, transaction
+from django.db.models import Count, IntegerField, Max, OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Coalesce
 from books.models import Book, BookPage
+from books.cache import catalog_cache
+from books.repositories.search_repository import SearchRepository
+from books.signals import pages_created
+from config.results import QueryResult
 
 logger = logging.getLogger(__name__)  
 
+BOOK_FIELDS = ("id", "title", "author", "created_at", "updated_at")
+PAGE_FIELDS = ("id", "book_id", "page_number", "content")
+
 class BookRepository:
     """
     Repository class for handling database operations related to books.
     """
 
+    SHAPE_SUMMARY = "summary"
+    SHAPE_DETAIL = "detail"
+    SHAPES = (SHAPE_SUMMARY, SHAPE_DETAIL)
+
+    # Supported orderings of the book list, each backed by an index on `Book`
+    # ending in `id` so the keyset (ordering field, id) is read in index order.
+    ORDERINGS = {
+        "-created_at": ("-created_at", "-id"),
+        "created_at": ("created_at", "id"),
+        "-updated_at": ("-updated_at", "-id"),
+        "updated_at": ("updated_at", "id"),
+        "title": ("title", "id"),
+        "-title": ("-title", "-id"),
+    }
+    DEFAULT_ORDERING = "-created_at"
+
+    # Query filters and the lookups they map to.
+    FILTERS = {
+        "author": "author",
+        "title_prefix": "title__istartswith",
+        "created_after": "created_at__gte",
+        "created_before": "created_at__lt",
+        "updated_after": "updated_at__gte",
+        "updated_before": "updated_at__lt",
+    }
+
     @staticmethod
-    def get_all_books():
+    def get_all_books(shape, filters=None, ordering=None):
         """
-        Retrieves all books from the database.
+        Retrieves the books matching `filters`, shaped for the serializer that will read them.
+
+        - `summary`: book columns only, annotated with `page_count` and `total_size`
+          computed by correlated subqueries over `page_number`/`content_size`, so the
+          compressed page content is never read.
+        - `detail`: book columns with their pages fetched in a single prefetch query.
 
-        :return: QuerySet containing all books.
+        The queryset is not evaluated here, so no `COUNT(*)` is issued.
+
+        :param shape: One of `BookRepository.SHAPES`.
+        :param filters: A dictionary keyed by `BookRepository.FILTERS` (e.g. validated query parameters).
+        :param ordering: A key of `BookRepository.ORDERINGS` (defaults to newest first).
+        :return: QueryResult wrapping the matching books.
+        :raises ValueError: If the shape or ordering is unknown.
         """
+        if shape not in BookRepository.SHAPES:
+            raise ValueError(f"Unknown book shape: {shape}")
+        ordering = ordering or BookRepository.DEFAULT_ORDERING
+        if ordering not in BookRepository.ORDERINGS:
+            raise ValueError(f"Unknown book ordering: {ordering}")
+
         try:
-            books = Book.objects.all()
-            logger.info(f"Retrieved {books.count()} books from the database.")
-            return books
+            books = Book.objects.only(*BOOK_FIELDS).filter(**{
+                BookRepository.FILTERS[name]: value
+                for name, value in (filters or {}).items() if name in BookRepository.FILTERS
+            }).order_by(*BookRepository.ORDERINGS[ordering])
+            if shape == BookRepository.SHAPE_SUMMARY:
+                pages = BookPage.objects.filter(book=OuterRef("pk")).order_by().values("book")
+                books = books.annotate(
+                    page_count=Coalesce(
+                        Subquery(pages.annotate(total=Count("id")).values("total"), output_field=IntegerField()), 0
+                    ),
+                    total_size=Coalesce(
+                        Subquery(pages.annotate(total=Sum("content_size")).values("total"), output_field=IntegerField()), 0
+                    ),
+                )
+            else:
+                books = books.prefetch_related(
+                    Prefetch("pages", queryset=BookPage.objects.only(*PAGE_FIELDS))
+                )
+            return QueryResult(books)
         except Exception as e:
-            logger.error(f"Error retrieving all books: {e}")  
+            logger.error("Error retrieving all books: %s", e)  
             return None
 
+    @staticmethod
+    def iter_books(include_pages=False, chunk_size=None):
+        """
+        Iterates over every book in primary key order without caching the queryset.
+
+        Rows are fetched from the database `chunk_size` books at a time; when pages
+        are requested they are prefetched once per chunk.
+
+        :param include_pages: Whether to prefetch the pages of each book.
+        :param chunk_size: Number of books fetched per round-trip (defaults to `settings.BOOK_EXPORT_CHUNK_SIZE`).
+        :return: An iterator of Book instances.
+        """
+        books = Book.objects.only(*BOOK_FIELDS).order_by("id")
+        if include_pages:
+            books = books.prefetch_related(
+                Prefetch("pages", queryset=BookPage.objects.only(*PAGE_FIELDS).order_by("page_number"))
+            )
+        return books.iterator(chunk_size=chunk_size or settings.BOOK_EXPORT_CHUNK_SIZE)
+
     @staticmethod
     def get_book_by_id(book_id):
         """
@@ -34,40 +124,213 @@ class BookRepository:
         try:
             book = Book.objects.filter(id=book_id).first()
             if book:
-                logger.info(f"Book retrieved successfully: ID {book_id}")  
+                logger.info("Book retrieved successfully: ID %s", book_id)  
             else:
-                logger.warning(f"Book not found: ID {book_id}") 
+                logger.warning("Book not found: ID %s", book_id) 
             return book
         except Exception as e:
-            logger.error(f"Error retrieving book ID {book_id}: {e}")  
+            logger.error("Error retrieving book ID %s: %s", book_id, e)  
             return None
 
     @staticmethod
-    def create_book(data):
+    def get_book_updated_at(book_id):
+        """
+        Retrieves only the `updated_at` timestamp of a book.
+
+        :param book_id: The ID of the book.
+        :return: The timestamp, or None if the book does not exist.
+        :raises DatabaseError: If the lookup fails (logged and re-raised, so it is not taken for a missing book).
+        """
+        try:
+            return Book.objects.filter(id=book_id).values_list("updated_at", flat=True).first()
+        except Exception as e:
+            logger.error("Error retrieving version of book ID %s: %s", book_id, e)
+            raise
+
+    @staticmethod
+    async def aget_book_updated_at(book_id):
+        """
+        Async version of `get_book_updated_at`.
+
+        :param book_id: The ID of the book.
+        :return: The timestamp, or None if the book does not exist.
+        """
+        try:
+            return await Book.objects.filter(id=book_id).values_list("updated_at", flat=True).afirst()
+        except Exception as e:
+            logger.error("Error retrieving version of book ID %s: %s", book_id, e)
+            raise
+
+    @staticmethod
+    def get_book_rows(fields, filters=None, ordering=None):
+        """
+        Retrieves the summary of the books matching `filters` as `values()` rows.
+
+        The query is the one of the `summary` shape of `get_all_books`
+        (including the `page_count`/`total_size` annotations), without building
+        model instances.
+
+        :param fields: The columns and annotations to select.
+        :param filters: A dictionary keyed by `BookRepository.FILTERS`.
+        :param ordering: A key of `BookRepository.ORDERINGS` (defaults to newest first).
+        :return: QueryResult wrapping the rows, or None on error.
+        """
+        books = BookRepository.get_all_books(BookRepository.SHAPE_SUMMARY, filters, ordering)
+        if books is None:
+            return None
+        return QueryResult(books.queryset.values(*fields))
+
+    @staticmethod
+    def get_book_detail_rows(book_id, fields, page_fields):
+        """
+        Retrieves a book and its pages as `values()` rows, in two indexed queries.
+
+        :param book_id: The ID of the book.
+        :param fields: The book columns to select.
+        :param page_fields: The page columns to select.
+        :return: A tuple `(book row, page rows ordered by page number)`; the book row is None if it does not exist.
+        """
+        book = Book.objects.filter(id=book_id).values(*fields).first()
+        if book is None:
+            return None, []
+        return book, list(BookPage.objects.filter(book_id=book_id).order_by("page_number").values(*page_fields))
+
+    @staticmethod
+    async def aget_book_detail_rows(book_id, fields, page_fields):
+        """
+        Async version of `get_book_detail_rows`.
+        """
+        book = await Book.objects.filter(id=book_id).values(*fields).afirst()
+        if book is None:
+            return None, []
+        pages = BookPage.objects.filter(book_id=book_id).order_by("page_number").values(*page_fields)
+        return book, [page async for page in pages]
+
+    @staticmethod
+    def get_books_by_ids(book_ids):
+        """
+        Retrieves the summary fields of several books at once.
+
+        :param book_ids: The IDs of the books.
+        :return: A dictionary mapping IDs to books (missing IDs are left out).
+        """
+        try:
+            return Book.objects.only(*BOOK_FIELDS).in_bulk(book_ids)
+        except Exception as e:
+            logger.error("Error retrieving books %s: %s", book_ids, e)
+            return {}
+
+    @staticmethod
+    def create_book(data, batch_size=None):
         """
         Creates a new book along with its associated pages.
 
+        The book and all of its pages are written inside a single transaction;
+        pages are inserted with batched `bulk_create` calls.
+
         :param data: A dictionary containing book details, including optional pages.
+        :param batch_size: Number of pages per INSERT (defaults to `settings.BOOK_PAGE_BATCH_SIZE`).
         :return: The created book instance.
         """
         try:
             pages_data = data.pop("pages", [])
-            book = Book.objects.create(**data)
-            logger.info(f"Book created successfully: ID {book.id}, Title: {book.title}") 
-
-            for page_data in pages_data:
-                BookPage.objects.create(book=book, **page_data)
-            logger.info(f"{len(pages_data)} pages added to book ID {book.id}") 
+            with transaction.atomic():
+                book = Book.objects.create(**data)
+                pages = BookPage.objects.bulk_create(
+                    [BookPage(book=book, **page_data) for page_data in pages_data],
+                    batch_size=batch_size or settings.BOOK_PAGE_BATCH_SIZE,
+                )
+                SearchRepository.index_books([book])
+                SearchRepository.index_pages(book.id, pages)
+                pages_created.send(sender=BookPage, pages=pages)
+            logger.info("Book created successfully: ID %s, Title: %s", book.id, book.title) 
+            logger.info("%s pages added to book ID %s", len(pages_data), book.id) 
 
             return book
         except Exception as e:
-            logger.error(f"Error creating book: {e}") 
+            logger.error("Error creating book: %s", e) 
             return None
     
+    @staticmethod
+    def bulk_create_books(books_data, batch_size=None):
+        """
+        Creates several books and all of their pages in a single transaction.
+
+        Books and pages are inserted with batched `bulk_create`. On databases that
+        do not return the generated primary keys (MySQL), the books' keys are read
+        back afterwards (see `_fetch_book_ids`).
+
+        :param books_data: A list of validated book dictionaries, including optional pages.
+        :param batch_size: Number of rows per INSERT (defaults to `settings.BOOK_PAGE_BATCH_SIZE`).
+        :return: A tuple `(books, page_count)`, or None if the write failed.
+        """
+        batch_size = batch_size or settings.BOOK_PAGE_BATCH_SIZE
+        try:
+            db = router.db_for_write(Book)
+            books = [
+                Book(**{key: value for key, value in data.items() if key != "pages"})
+                for data in books_data
+            ]
+            with transaction.atomic(using=db):
+                if connections[db].features.can_return_rows_from_bulk_insert:
+                    Book.objects.using(db).bulk_create(books, batch_size=batch_size)
+                else:
+                    last_id = Book.objects.using(db).aggregate(last_id=Max("id"))["last_id"] or 0
+                    Book.objects.using(db).bulk_create(books, batch_size=batch_size)
+                    BookRepository._fetch_book_ids(db, books, last_id)
+
+                pages = [
+                    BookPage(book=book, **page_data)
+                    for book, data in zip(books, books_data)
+                    for page_data in data.get("pages", [])
+                ]
+                BookPage.objects.using(db).bulk_create(pages, batch_size=batch_size)
+
+                SearchRepository.index_books(books)
+                SearchRepository.index_new_pages(pages)
+                pages_created.send(sender=BookPage, pages=pages)
+
+            logger.info("%s books and %s pages created in bulk", len(books), len(pages))
+            return books, len(pages)
+        except Exception as e:
+            logger.error("Error creating books in bulk: %s", e)
+            return None
+
+    @staticmethod
+    def _fetch_book_ids(db, books, last_id):
+        """
+        Sets the primary keys of books just inserted by a `bulk_create` that did not return them.
+
+        The books are read back by their natural key (title, author and the
+        `created_at` set by the insert) among the rows after `last_id`, in one
+        query served by `book_created_idx`. Identical books of the same batch
+        take their keys in insertion order.
+
+        :param db: The database alias the books were inserted into.
+        :param books: The inserted Book instances, without primary keys.
+        :param last_id: The highest book ID before the insert.
+        :raises DatabaseError: If an inserted book cannot be found.
+        """
+        pending = defaultdict(deque)
+        for book in books:
+            pending[(book.title, book.author, book.created_at)].append(book)
+
+        created = [book.created_at for book in books]
+        rows = Book.objects.using(db).filter(
+            created_at__range=(min(created), max(created)), id__gt=last_id
+        ).order_by("id").values_list("id", "title", "author", "created_at")
+        for book_id, *key in rows:
+            same = pending.get(tuple(key))
+            if same:
+                same.popleft().pk = book_id
+
+        if any(book.pk is None for book in books):
+            raise DatabaseError("Could not read back the IDs of the inserted books")
+
     @staticmethod
     def update_book(book, data):
         """
-        Updates an existing book with new data.
+        Updates an existing book with new data and invalidates its cached payloads.
 
         :param book: The book instance to update.
         :param data: A dictionary containing the fields to update.
@@ -76,24 +339,30 @@ class BookRepository:
         try:
             for key, value in data.items():
                 setattr(book, key, value) 
-            book.save()
-            logger.info(f"Book updated successfully: ID {book.id}, Title: {book.title}")  
+            with transaction.atomic():
+                book.save()
+                SearchRepository.index_books([book])
+            catalog_cache.invalidate_book(book.id)
+            logger.info("Book updated successfully: ID %s, Title: %s", book.id, book.title)  
             return book
         except Exception as e:
-            logger.error(f"Error updating book ID {book.id}: {e}")  
+            logger.error("Error updating book ID %s: %s", book.id, e)  
             return None
 
     @staticmethod
     def delete_book(book):
         """
-        Deletes a book from the database.
+        Deletes a book from the database and invalidates its cached payloads.
 
         :param book: The book instance to delete.
         """
         try:
             book_id = book.id 
             title = book.title
-            book.delete()
-            logger.info(f"Book deleted successfully: ID {book_id}, Title: {title}")  
+            with transaction.atomic():
+                book.delete()
+                SearchRepository.remove_book(book_id)
+            catalog_cache.invalidate_book(book_id)
+            logger.info("Book deleted successfully: ID %s, Title: %s", book_id, title)  
         except Exception as e:
-            logger.error(f"Error deleting book ID {book.id}: {e}")  
+            logger.error("Error deleting book ID %s: %s", book.id, e)  
@@ -0,0 +1,240 @@
+import logging
+import re
+from django.conf import settings
+from functools import reduce
+from operator import or_
+from django.db import connections, router
+from django.db.models import Q
+from django.utils.html import escape
+from books.models import Book, BookPage
+from books.page_index import get_page_index
+
+logger = logging.getLogger(__name__)
+
+TABLE = "books_search"
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+
+# Scores of the in-process page index, which does not rank: a title/author
+# match weighs like several page matches, as with the engines' column weights.
+PAGE_INDEX_BOOK_SCORE = 5.0
+PAGE_INDEX_PAGE_SCORE = 1.0
+
+# Books whose matching pages are read in one query when building snippets.
+_SNIPPET_BOOKS_PER_QUERY = 200
+
+# Private-use characters marking matches until the snippet is HTML-escaped.
+_MATCH_START = "\ue000"
+_MATCH_END = "\ue001"
+
+
+def search_terms(query):
+    """
+    Splits a free-text query into the terms sent to the full-text engine.
+    """
+    return _TERM.findall(query.lower())
+
+
+def highlight(snippet):
+    """
+    HTML-escapes a snippet whose matches are delimited by the private-use
+    markers, then turns the markers into `<mark>` tags, so page content never
+    reaches clients as markup.
+    """
+    return str(escape(snippet)).replace(_MATCH_START, SNIPPET_START).replace(_MATCH_END, SNIPPET_END)
+
+
+def make_snippet(content, terms, width=None):
+    """
+    Returns a window of `content` around the first occurrence of any term,
+    HTML-escaped and with the matches wrapped in `<mark>` tags (used where the
+    engine has no snippet function).
+
+    :param content: The page content.
+    :param terms: Lower-cased search terms.
+    :param width: Approximate snippet length in characters (defaults to `settings.BOOK_SEARCH_SNIPPET_CHARS`).
+    """
+    width = width or settings.BOOK_SEARCH_SNIPPET_CHARS
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE) if terms else None
+    match = pattern.search(content) if pattern else None
+    start = max(0, match.start() - width // 3) if match else 0
+    end = min(len(content), start + width)
+    window = content[start:end]
+    if pattern:
+        window = pattern.sub(lambda m: f"{_MATCH_START}{m.group(0)}{_MATCH_END}", window)
+    return (SNIPPET_ELLIPSIS if start > 0 else "") + highlight(window) + (SNIPPET_ELLIPSIS if end < len(content) else "")
+
+
+class SearchRepository:
+    """
+    Repository class for the full-text index of books and pages (`books_search`).
+
+    The index holds one row per book (title and author) and one row per page
+    (content). It is an FTS5 virtual table on SQLite and an InnoDB table with a
+    FULLTEXT index on MySQL; both store an uncompressed copy of each page. On other backends searches are served by the
+    in-process page index (`books.page_index`) when `PAGE_INDEX_PATH` is set,
+    and return nothing otherwise. Rows are written by `BookRepository` and the page signals, inside
+    the same transaction as the catalog rows they mirror.
+    """
+
+    @staticmethod
+    def _connection(for_write=True):
+        # Searches may be served by a replica; index writes go to the primary.
+        return connections[router.db_for_write(Book) if for_write else router.db_for_read(Book)]
+
+    @staticmethod
+    def is_supported(connection=None):
+        return (connection or SearchRepository._connection()).vendor in ("sqlite", "mysql")
+
+    @staticmethod
+    def index_books(books):
+        """
+        Writes (or rewrites) the title/author rows of several books.
+
+        :param books: Book instances.
+        """
+        if not books or not SearchRepository.is_supported():
+            return
+        with SearchRepository._connection().cursor() as cursor:
+            ids = [book.id for book in books]
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE page_number IS NULL AND book_id IN ({placeholders})", ids
+            )
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (book_id, page_number, title, author, content) VALUES (%s, NULL, %s, %s, '')",
+                [(book.id, book.title, book.author) for book in books],
+            )
+
+    @staticmethod
+    def index_pages(book_id, pages):
+        """
+        Writes (or rewrites) the content rows of some pages of one book.
+
+        :param book_id: The ID of the book the pages belong to.
+        :param pages: Objects with `page_number` and `content`.
+        """
+        if not pages or not SearchRepository.is_supported():
+            return
+        with SearchRepository._connection().cursor() as cursor:
+            numbers = [page.page_number for page in pages]
+            placeholders = ", ".join(["%s"] * len(numbers))
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE book_id = %s AND page_number IN ({placeholders})", [book_id, *numbers]
+            )
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (book_id, page_number, title, author, content) VALUES (%s, %s, '', '', %s)",
+                [(book_id, page.page_number, page.content) for page in pages],
+            )
+
+    @staticmethod
+    def index_new_pages(pages):
+        """
+        Writes the content rows of pages that are not indexed yet (e.g. the pages
+        of books just created), for any number of books, in one statement.
+
+        :param pages: Objects with `book_id`, `page_number` and `content`.
+        """
+        if not pages or not SearchRepository.is_supported():
+            return
+        with SearchRepository._connection().cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (book_id, page_number, title, author, content) VALUES (%s, %s, '', '', %s)",
+                [(page.book_id, page.page_number, page.content) for page in pages],
+            )
+
+    @staticmethod
+    def remove_book(book_id):
+        """
+        Removes every index row of a book.
+        """
+        if not SearchRepository.is_supported():
+            return
+        with SearchRepository._connection().cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE book_id = %s", [book_id])
+
+    @staticmethod
+    def search(query, max_rows=None):
+        """
+        Runs a full-text query against the index.
+
+        :param query: Free text; every term must match (SQLite) or contributes to
+                      the relevance (MySQL natural language mode).
+        :param max_rows: Maximum number of matching rows read (defaults to `settings.BOOK_SEARCH_MAX_ROWS`).
+        :return: A list of `(book_id, page_number, score, snippet)` tuples, best
+                 first; `page_number` and `snippet` are None for title/author matches.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+        connection = SearchRepository._connection(for_write=False)
+        max_rows = max_rows or settings.BOOK_SEARCH_MAX_ROWS
+        if not SearchRepository.is_supported(connection):
+            index = get_page_index()
+            return SearchRepository._search_page_index(index, terms, max_rows) if index else []
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == "sqlite":
+                    return SearchRepository._search_sqlite(cursor, terms, max_rows)
+                return SearchRepository._search_mysql(cursor, terms, max_rows)
+        except Exception as e:
+            logger.error("Error searching books for %r: %s", query, e)
+            return []
+
+    @staticmethod
+    def _search_sqlite(cursor, terms, max_rows):
+        # Quoted terms are matched literally and combined with AND; bm25() is lower
+        # for better matches, with title and author weighted above page content.
+        expression = " ".join(f'"{term}"' for term in terms)
+        cursor.execute(
+            f"SELECT book_id, page_number, -bm25({TABLE}, 10.0, 5.0, 1.0), "
+            f"snippet({TABLE}, 2, %s, %s, %s, %s) "
+            f"FROM {TABLE} WHERE {TABLE} MATCH %s ORDER BY bm25({TABLE}, 10.0, 5.0, 1.0) LIMIT %s",
+            [_MATCH_START, _MATCH_END, SNIPPET_ELLIPSIS, settings.BOOK_SEARCH_SNIPPET_TOKENS, expression, max_rows],
+        )
+        return [
+            (book_id, page_number, score, highlight(snippet) if page_number is not None else None)
+            for book_id, page_number, score, snippet in cursor.fetchall()
+        ]
+
+    @staticmethod
+    def _search_page_index(index, terms, max_rows):
+        # Pages come from the in-process index (including the pages saved since
+        # its last build); title/author matches and snippet text from the database.
+        books = Book.objects.all()
+        for term in terms:
+            books = books.filter(Q(title__icontains=term) | Q(author__icontains=term))
+        rows = [(book_id, None, PAGE_INDEX_BOOK_SCORE, None) for book_id in books.values_list("id", flat=True)[:max_rows]]
+
+        numbers = {}
+        for book_id, page_number in index.search(" ".join(terms), limit=max_rows - len(rows)):
+            numbers.setdefault(book_id, []).append(page_number)
+        book_ids = list(numbers)
+        for start in range(0, len(book_ids), _SNIPPET_BOOKS_PER_QUERY):
+            pages = BookPage.objects.filter(reduce(or_, (
+                Q(book_id=book_id, page_number__in=numbers[book_id])
+                for book_id in book_ids[start:start + _SNIPPET_BOOKS_PER_QUERY]
+            ))).values_list("book_id", "page_number", "content")
+            rows.extend(
+                (book_id, page_number, PAGE_INDEX_PAGE_SCORE, make_snippet(content, terms))
+                for book_id, page_number, content in pages
+            )
+        return rows
+
+    @staticmethod
+    def _search_mysql(cursor, terms, max_rows):
+        expression = " ".join(terms)
+        cursor.execute(
+            f"SELECT book_id, page_number, MATCH (title, author, content) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score, "
+            f"content FROM {TABLE} WHERE MATCH (title, author, content) AGAINST (%s IN NATURAL LANGUAGE MODE) "
+            f"ORDER BY score DESC LIMIT %s",
+            [expression, expression, max_rows],
+        )
+        return [
+            (book_id, page_number, score, make_snippet(content, terms) if page_number is not None else None)
+            for book_id, page_number, score, content in cursor.fetchall()
+        ]
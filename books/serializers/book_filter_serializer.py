@@ -0,0 +1,31 @@
+from rest_framework import serializers
+from books.repositories.book_repository import BookRepository
+
+
+class BookFilterSerializer(serializers.Serializer):
+    """
+    Validates the filtering and ordering query parameters of the book list.
+
+    Only combinations that an index on `Book` can serve in order are accepted:
+    a title prefix is matched on the `title` index, so it requires ordering by
+    title (which becomes the default when `title_prefix` is given).
+    """
+    author = serializers.CharField(required=False)
+    title_prefix = serializers.CharField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    updated_after = serializers.DateTimeField(required=False)
+    updated_before = serializers.DateTimeField(required=False)
+    ordering = serializers.ChoiceField(choices=list(BookRepository.ORDERINGS), required=False)
+
+    def validate(self, data):
+        ordering = data.get("ordering")
+        if "title_prefix" in data:
+            if ordering is None:
+                data["ordering"] = "title"
+            elif ordering.lstrip("-") != "title":
+                raise serializers.ValidationError(
+                    {"ordering": "El filtro title_prefix solo puede ordenarse por title o -title."}
+                )
+        data.setdefault("ordering", BookRepository.DEFAULT_ORDERING)
+        return data
@@ -0,0 +1,16 @@
+from rest_framework import serializers
+from books.models import Book
+
+class BookListSerializer(serializers.ModelSerializer):
+    """
+    Summary representation of a book used by list views.
+
+    Pages are not included; `page_count` and `total_size` (number of characters
+    across all pages) are annotated by the repository in the same query.
+    """
+    page_count = serializers.IntegerField(read_only=True)
+    total_size = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Book
+        fields = ["id", "title", "author", "created_at", "updated_at", "page_count", "total_size"]
@@ -2,6 +2,9 @@ from rest_framework import serializers
 from books.models import BookPage
 
 class BookPageSerializer(serializers.ModelSerializer):
+    # Stored compressed; the model field reads and writes plain text.
+    content = serializers.CharField(style={"base_template": "textarea.html"})
+
     class Meta:
         model = BookPage
         fields = ["page_number", "content"]
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+
+class PageMatchSerializer(serializers.Serializer):
+    """
+    A page matching a search, with its text around the match.
+
+    Matching terms in `snippet` are wrapped in `<mark>` tags.
+    """
+    page_number = serializers.IntegerField()
+    score = serializers.FloatField()
+    snippet = serializers.CharField()
+
+
+class BookSearchResultSerializer(serializers.Serializer):
+    """
+    A book matching a search, with its best matching pages.
+    """
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    author = serializers.CharField()
+    score = serializers.FloatField()
+    pages = PageMatchSerializer(many=True)
@@ -0,0 +1,85 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+# Fields whose representation of the value the database returns is the value
+# itself (`str(value)` / `int(value)` in DRF).
+PLAIN_FIELDS = (serializers.CharField, serializers.IntegerField)
+
+
+class RowMapper:
+    """
+    Builds the read representation of a `ModelSerializer` straight from
+    `values()` rows, without instantiating the serializer or its fields per row.
+
+    The mapping is compiled once from the serializer's declared fields: plain
+    fields are copied from their source column, datetime fields are converted
+    with the field's own `to_representation` (so formats and time zones stay
+    DRF's), and nested `many=True` serializers are mapped by a child
+    `RowMapper` from rows passed in by the caller. Output dicts have the
+    serializer's keys in the serializer's order.
+
+    Any other field type raises `ImproperlyConfigured` when the mapper is
+    built, so a serializer change that the fast path cannot reproduce fails
+    at import instead of changing responses.
+    """
+
+    def __init__(self, serializer_class):
+        """
+        :param serializer_class: The serializer whose output is reproduced.
+        """
+        self.serializer_class = serializer_class
+        self.fields = []       # (name, source column or None, child mapper or None)
+        self.converters = []   # (name, to_representation)
+        self.children = {}
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.ListSerializer):
+                child = self.children[name] = RowMapper(type(field.child))
+                self.fields.append((name, None, child))
+                continue
+            if "." in field.source or field.source == "*":
+                raise ImproperlyConfigured(f"{serializer_class.__name__}.{name}: dotted sources are not supported")
+            if isinstance(field, serializers.DateTimeField):
+                self.converters.append((name, field.to_representation))
+            elif not isinstance(field, PLAIN_FIELDS):
+                raise ImproperlyConfigured(f"{serializer_class.__name__}.{name}: {type(field).__name__} is not supported")
+            self.fields.append((name, field.source, None))
+
+    @property
+    def columns(self):
+        """
+        The columns to select with `values()` (nested fields excluded).
+        """
+        return tuple(source for _, source, child in self.fields if child is None)
+
+    def to_representation(self, row, **nested):
+        """
+        Returns the representation of one row.
+
+        :param row: A `values()` dict holding `columns`.
+        :param nested: The rows of each nested field, keyed by field name.
+        """
+        data = {
+            name: row[source] if child is None else child.many(nested[name])
+            for name, source, child in self.fields
+        }
+        for name, convert in self.converters:
+            if data[name] is not None:
+                data[name] = convert(data[name])
+        return data
+
+    def many(self, rows):
+        """
+        Returns the representations of several rows.
+
+        :raises ImproperlyConfigured: If the mapper has nested fields (use `to_representation`).
+        """
+        if self.children:
+            raise ImproperlyConfigured(
+                f"{self.serializer_class.__name__}: rows with nested fields are mapped one by one with to_representation()"
+            )
+        if not self.converters:
+            pairs = [(name, source) for name, source, _ in self.fields]
+            return [{name: row[source] for name, source in pairs} for row in rows]
+        return [self.to_representation(row) for row in rows]
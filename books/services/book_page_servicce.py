@@ -1,8 +1,16 @@
 import logging
+from rest_framework.exceptions import NotFound
+from books.cache import CatalogCache
 from books.repositories.book_page_repository import BookPageRepository
+from books.repositories.book_repository import BookRepository
+from books.serializers.book_page_serializer import BookPageSerializer
+from books.serializers.row_mapper import RowMapper
 
 logger = logging.getLogger(__name__) 
 
+# Read representation built from `values()` rows (same output as `BookPageSerializer`).
+PAGE_ROWS = RowMapper(BookPageSerializer)
+
 class BookPageService:
     """
     Service layer for handling business logic related to book pages.
@@ -10,52 +18,144 @@ class BookPageService:
 
     def __init__(self):
         """
-        Initializes the BookPageService with a repository instance.
+        Initializes the BookPageService with repository and cache instances.
         """
         self.page_repository = BookPageRepository()
+        self.book_repository = BookRepository()
+        self.cache = CatalogCache()
 
     def get_book_pages(self, book_id):
         """
         Retrieves all pages for a specific book.
 
         :param book_id: The ID of the book whose pages are being retrieved.
-        :return: QuerySet containing the book's pages.
+        :return: QueryResult wrapping the book's pages.
         """
         try:
-            pages = self.page_repository.get_pages_by_book(book_id)
-            if pages and pages.exists():
-                logger.info(f"Retrieved {pages.count()} pages for book ID {book_id}") 
-            else:
-                logger.warning(f"No pages found for book ID {book_id}")  
-            return pages
+            return self.page_repository.get_pages_by_book(book_id)
         except Exception as e:
-            logger.error(f"Error retrieving pages for book ID {book_id}: {e}") 
+            logger.error("Error retrieving pages for book ID %s: %s", book_id, e) 
             return None
-        
 
-    def get_book_page(self, book_id, page_id):
+    def get_book_page_rows(self, book_id):
         """
-        Fetch a specific page of a book.
+        Retrieves all pages for a specific book as rows for `page_list_data`.
 
-        :param book_id: The ID of the book containing the page.
-        :param page_id: The ID of the page to retrieve.
-        :return: The requested page object.
+        :param book_id: The ID of the book whose pages are being retrieved.
+        :return: QueryResult wrapping the `values()` rows, ordered by page number.
         """
         try:
-            page = self.page_repository.get_page_by_id(book_id, page_id)
-            if page:
-                logger.info(f"Retrieved page {page_id} for book ID {book_id}")
-            else:
-                logger.warning(f"Page {page_id} not found for book ID {book_id}")
-            return page
+            return self.page_repository.get_page_rows_by_book(book_id, PAGE_ROWS.columns)
         except Exception as e:
-            logger.error(f"Error retrieving page {page_id} for book ID {book_id}: {e}")
+            logger.error("Error retrieving pages for book ID %s: %s", book_id, e)
+            return None
+
+    @staticmethod
+    def page_list_data(rows):
+        """
+        Builds the representation (`BookPageSerializer` output) of page rows.
+
+        :param rows: Rows returned through `get_book_page_rows`.
+        :return: A list of dictionaries.
+        """
+        return PAGE_ROWS.many(rows)
+
+    def get_page_batch(self, book_id, params, build):
+        """
+        Retrieves one paginated batch of pages, served from the cache while the book has not changed.
+
+        :param book_id: The ID of the book whose pages are being retrieved.
+        :param params: A string identifying the batch (e.g. host and query string).
+        :param build: Callable that builds the serialized batch on a cache miss.
+        :return: The serialized batch.
+        :raises NotFound: If the book does not exist.
+        """
+        version = self.get_book_version(book_id)
+        if version is None:
+            logger.warning("No pages found for book ID %s: book does not exist", book_id)
+            raise NotFound("No pages available for this book")
+        return self.cache.get_or_set(self.cache.pages_key(book_id, version, params), build)
+
+    async def aget_page_batch(self, book_id, params, build):
+        """
+        Async version of `get_page_batch`; `build` is a coroutine function.
+
+        :param book_id: The ID of the book whose pages are being retrieved.
+        :param params: A string identifying the batch (e.g. host and query string).
+        :param build: Coroutine function that builds the serialized batch on a cache miss.
+        :return: The serialized batch.
+        :raises NotFound: If the book does not exist.
+        """
+        version = await self.aget_book_version(book_id)
+        if version is None:
+            logger.warning("No pages found for book ID %s: book does not exist", book_id)
+            raise NotFound("No pages available for this book")
+        return await self.cache.aget_or_set(self.cache.pages_key(book_id, version, params), build)
+
+    def get_book_version(self, book_id):
+        """
+        Returns the cache version of a book (derived from its `updated_at`).
+
+        :param book_id: The ID of the book.
+        :return: The version string, or None if the book does not exist.
+        """
+        return self.cache.book_version(book_id, lambda: self.book_repository.get_book_updated_at(book_id))
+
+    async def aget_book_version(self, book_id):
+        """
+        Async version of `get_book_version`.
+
+        :param book_id: The ID of the book.
+        :return: The version string, or None if the book does not exist.
+        """
+        return await self.cache.abook_version(book_id, lambda: self.book_repository.aget_book_updated_at(book_id))
+
+    def get_book_page(self, book_id, page_number, prefetch=0):
+        """
+        Fetch a specific page of a book by its page number, through the cache.
+
+        On a cache miss the page is loaded with an indexed range query. When
+        `prefetch` is given, the following pages that are not cached yet are
+        loaded in the same query and stored, so sequential readers find their
+        next page turns already cached.
+
+        :param book_id: The ID of the book containing the page.
+        :param page_number: The number of the page to retrieve.
+        :param prefetch: Number of following pages to warm in the cache.
+        :return: The serialized page, or None if the book or page does not exist.
+        :raises DatabaseError: If the page cannot be read (not reported as a missing page).
+        """
+        version = self.get_book_version(book_id)
+        if version is None:
+            logger.warning("Page %s not found: book ID %s does not exist", page_number, book_id)
             return None
-        
+
+        keys = {
+            number: self.cache.page_key(book_id, version, number)
+            for number in range(page_number, page_number + prefetch + 1)
+        }
+        cached = self.cache.get_many(list(keys.values()))
+        missing = [number for number, key in keys.items() if key not in cached]
+
+        if missing:
+            pages = self.page_repository.get_page_range(book_id, min(missing), max(missing), PAGE_ROWS.columns)
+            loaded = {
+                keys[page["page_number"]]: PAGE_ROWS.to_representation(page)
+                for page in pages if page["page_number"] in keys
+            }
+            self.cache.set_many(loaded)
+            cached.update(loaded)
+
+        page = cached.get(keys[page_number])
+        if page:
+            logger.info("Retrieved page %s for book ID %s (%s loaded from the database)", page_number, book_id, len(missing))
+        else:
+            logger.warning("Page %s not found for book ID %s", page_number, book_id)
+        return page
 
     def get_page_by_id(self, book_id, page_id):
         """
-        Fetch a specific page of a book.
+        Fetch a specific page of a book by its primary key.
 
         :param book_id: The ID of the book containing the page.
         :param page_id: The ID of the page to retrieve.
@@ -64,10 +164,10 @@ class BookPageService:
         try:
             page = self.page_repository.get_page_by_id(book_id, page_id)
             if page:
-                logger.info(f"Retrieved page {page_id} for book ID {book_id}")
+                logger.info("Retrieved page %s for book ID %s", page_id, book_id)
             else:
-                logger.warning(f"Page {page_id} not found for book ID {book_id}")
+                logger.warning("Page %s not found for book ID %s", page_id, book_id)
             return page
         except Exception as e:
-            logger.error(f"Error retrieving page {page_id} for book ID {book_id}: {e}")
+            logger.error("Error retrieving page %s for book ID %s: %s", page_id, book_id, e)
             return None
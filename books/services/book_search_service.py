@@ -0,0 +1,58 @@
+import logging
+from django.conf import settings
+from books.repositories.book_repository import BookRepository
+from books.repositories.search_repository import SearchRepository
+
+logger = logging.getLogger(__name__)
+
+
+class BookSearchService:
+    """
+    Service layer for full-text search over book titles, authors and page content.
+    """
+
+    def __init__(self):
+        """
+        Initializes the BookSearchService with repository instances.
+        """
+        self.search_repository = SearchRepository()
+        self.book_repository = BookRepository()
+
+    def search(self, query, limit=None):
+        """
+        Searches the catalog and groups the matches by book.
+
+        A book's score is the sum of the scores of its matching rows (its title
+        and author plus each matching page), so books matching in several places
+        rank first. Each result lists its best pages with a highlighted snippet.
+
+        :param query: Free-text query.
+        :param limit: Maximum number of books returned (defaults to `settings.BOOK_SEARCH_MAX_RESULTS`).
+        :return: A list of result dictionaries (`id`, `title`, `author`, `score`, `pages`), best first.
+        """
+        limit = limit or settings.BOOK_SEARCH_MAX_RESULTS
+        matches = {}
+        for book_id, page_number, score, snippet in self.search_repository.search(query):
+            match = matches.setdefault(book_id, {"score": 0.0, "pages": []})
+            match["score"] += score
+            if page_number is not None:
+                match["pages"].append({"page_number": page_number, "score": score, "snippet": snippet})
+
+        ranked = sorted(matches.items(), key=lambda item: item[1]["score"], reverse=True)[:limit]
+        books = self.book_repository.get_books_by_ids([book_id for book_id, _ in ranked])
+
+        results = []
+        for book_id, match in ranked:
+            book = books.get(book_id)
+            if book is None:
+                continue
+            pages = sorted(match["pages"], key=lambda page: page["score"], reverse=True)
+            results.append({
+                "id": book.id,
+                "title": book.title,
+                "author": book.author,
+                "score": round(match["score"], 4),
+                "pages": pages[:settings.BOOK_SEARCH_PAGES_PER_BOOK],
+            })
+        logger.info("Search for %r matched %s books", query, len(results))
+        return results
@@ -1,10 +1,18 @@
 import logging
+import time
+from books.cache import CatalogCache
 from books.repositories.book_repository import BookRepository
+from books.serializers.book_list_serializer import BookListSerializer
 from books.serializers.book_serializer import BookSerializer
+from books.serializers.row_mapper import RowMapper
 from rest_framework.exceptions import NotFound, ValidationError
 
 logger = logging.getLogger(__name__)  # Initialize logger for this module
 
+# Read representations built from `values()` rows (same output as the serializers).
+BOOK_LIST_ROWS = RowMapper(BookListSerializer)
+BOOK_DETAIL_ROWS = RowMapper(BookSerializer)
+
 class BookService:
     """
     Service layer for handling business logic related to books.
@@ -12,24 +20,50 @@ class BookService:
 
     def __init__(self):
         """
-        Initializes the BookService with a repository instance.
+        Initializes the BookService with a repository and a cache instance.
         """
         self.book_repository = BookRepository()
+        self.cache = CatalogCache()
+
+    def get_books(self, shape=BookRepository.SHAPE_SUMMARY, filters=None, ordering=None):
+        """
+        Retrieves all books, or those matching `filters`.
+
+        :param shape: The queryset shape to request from the repository (see `BookRepository.SHAPES`).
+        :param filters: Filter values keyed by `BookRepository.FILTERS`.
+        :param ordering: A key of `BookRepository.ORDERINGS`.
+        :return: QueryResult wrapping the matching books.
+        """
+        try:
+            return self.book_repository.get_all_books(shape, filters, ordering)
+        except Exception as e:
+            logger.error("Error retrieving all books: %s", e)  # ✅ Log unexpected errors
+            return None
 
-    def get_books(self):
+    def get_book_rows(self, filters=None, ordering=None):
         """
-        Retrieves all books.
+        Retrieves the books matching `filters` as rows for `book_list_data`.
 
-        :return: QuerySet containing all books.
+        :param filters: Filter values keyed by `BookRepository.FILTERS`.
+        :param ordering: A key of `BookRepository.ORDERINGS`.
+        :return: QueryResult wrapping the `values()` rows.
         """
         try:
-            books = self.book_repository.get_all_books()
-            logger.info(f"Retrieved {len(books)} books from the database.")  # ✅ Log successful retrieval
-            return books
+            return self.book_repository.get_book_rows(BOOK_LIST_ROWS.columns, filters, ordering)
         except Exception as e:
-            logger.error(f"Error retrieving all books: {e}")  # ✅ Log unexpected errors
+            logger.error("Error retrieving all books: %s", e)
             return None
 
+    @staticmethod
+    def book_list_data(rows):
+        """
+        Builds the list representation (`BookListSerializer` output) of book rows.
+
+        :param rows: Rows returned through `get_book_rows`.
+        :return: A list of dictionaries.
+        """
+        return BOOK_LIST_ROWS.many(rows)
+
     def get_book_by_id(self, book_id):
         """
         Retrieves a book by its ID.
@@ -41,33 +75,109 @@ class BookService:
         try:
             book = self.book_repository.get_book_by_id(book_id)
             if not book:
-                logger.warning(f"Book not found: ID {book_id}")  # ✅ Log when book is not found
+                logger.warning("Book not found: ID %s", book_id)  # ✅ Log when book is not found
                 raise NotFound("Book not found")
-            logger.info(f"Book retrieved successfully: ID {book_id}")  # ✅ Log successful retrieval
+            logger.info("Book retrieved successfully: ID %s", book_id)  # ✅ Log successful retrieval
             return book
         except Exception as e:
-            logger.error(f"Error retrieving book ID {book_id}: {e}")  # ✅ Log unexpected errors
+            logger.error("Error retrieving book ID %s: %s", book_id, e)  # ✅ Log unexpected errors
             raise
 
+    def get_book_version(self, book_id):
+        """
+        Returns the cache version of a book (derived from its `updated_at`).
+
+        :param book_id: The ID of the book.
+        :return: The version string, or None if the book does not exist.
+        """
+        return self.cache.book_version(book_id, lambda: self.book_repository.get_book_updated_at(book_id))
+
+    def get_book_data(self, book_id):
+        """
+        Retrieves the serialized representation of a book, served from the cache
+        while the book has not changed.
+
+        :param book_id: The ID of the book to retrieve.
+        :return: A dictionary with the book data, including its pages.
+        :raises NotFound: If the book does not exist.
+        """
+        version = self.get_book_version(book_id)
+        if version is None:
+            logger.warning("Book not found: ID %s", book_id)
+            raise NotFound("Book not found")
+        def load():
+            book, pages = self.book_repository.get_book_detail_rows(
+                book_id, BOOK_DETAIL_ROWS.columns, BOOK_DETAIL_ROWS.children["pages"].columns
+            )
+            if book is None:
+                raise NotFound("Book not found")
+            logger.info("Book retrieved successfully: ID %s", book_id)
+            return BOOK_DETAIL_ROWS.to_representation(book, pages=pages)
+
+        return self.cache.get_or_set(self.cache.book_key(book_id, version), load)
+
+    async def aget_book_version(self, book_id):
+        """
+        Async version of `get_book_version`.
+
+        :param book_id: The ID of the book.
+        :return: The version string, or None if the book does not exist.
+        """
+        return await self.cache.abook_version(book_id, lambda: self.book_repository.aget_book_updated_at(book_id))
+
+    async def aget_book_data(self, book_id):
+        """
+        Async version of `get_book_data`: on a cache miss the book and its pages
+        are loaded with the async ORM.
+
+        :param book_id: The ID of the book to retrieve.
+        :return: A dictionary with the book data, including its pages.
+        :raises NotFound: If the book does not exist.
+        """
+        version = await self.aget_book_version(book_id)
+        if version is None:
+            logger.warning("Book not found: ID %s", book_id)
+            raise NotFound("Book not found")
+
+        async def load():
+            book, pages = await self.book_repository.aget_book_detail_rows(
+                book_id, BOOK_DETAIL_ROWS.columns, BOOK_DETAIL_ROWS.children["pages"].columns
+            )
+            if book is None:
+                raise NotFound("Book not found")
+            logger.info("Book retrieved successfully: ID %s", book_id)
+            return BOOK_DETAIL_ROWS.to_representation(book, pages=pages)
+
+        return await self.cache.aget_or_set(self.cache.book_key(book_id, version), load)
+
     def create_book(self, data):
         """
         Validates and creates a new book.
 
+        Logs the number of rows written (the book plus its pages) and the time
+        spent validating and writing them.
+
         :param data: A dictionary containing book details.
         :return: The created book instance.
         :raises ValidationError: If validation fails.
         """
         try:
+            started = time.perf_counter()
             serializer = BookSerializer(data=data)
             serializer.is_valid(raise_exception=True)
+            rows = 1 + len(serializer.validated_data.get("pages", []))
             book = self.book_repository.create_book(serializer.validated_data)
-            logger.info(f"Book created successfully")
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "Book created successfully: %s rows written in %.1f ms (%.0f rows/s)",
+                rows, elapsed * 1000, rows / max(elapsed, 1e-6),
+            )
             return book
         except ValidationError as e:
-            logger.warning(f"Book creation failed (validation error): {e}")
+            logger.warning("Book creation failed (validation error): %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error creating book: {e}")
+            logger.error("Unexpected error creating book: %s", e)
             raise
 
     def update_book(self, book_id, data):
@@ -85,16 +195,16 @@ class BookService:
             serializer = BookSerializer(book, data=data, partial=True)
             serializer.is_valid(raise_exception=True)
             updated_book = self.book_repository.update_book(book, serializer.validated_data)
-            logger.info(f"Book updated successfully")  # ✅ Log successful update
+            logger.info("Book updated successfully")  # ✅ Log successful update
             return updated_book
         except NotFound as e:
-            logger.warning(f"Book update failed: ID {book_id} not found")  # ✅ Log book not found
+            logger.warning("Book update failed: ID %s not found", book_id)  # ✅ Log book not found
             raise
         except ValidationError as e:
-            logger.warning(f"Book update failed (validation error): {e}")  # ✅ Log validation errors
+            logger.warning("Book update failed (validation error): %s", e)  # ✅ Log validation errors
             raise
         except Exception as e:
-            logger.error(f"Unexpected error updating book ID {book_id}: {e}")  # ✅ Log unexpected errors
+            logger.error("Unexpected error updating book ID %s: %s", book_id, e)  # ✅ Log unexpected errors
             raise
 
     def delete_book(self, book_id):
@@ -108,11 +218,11 @@ class BookService:
         try:
             book = self.book_repository.get_book_by_id(book_id)
             if not book:
-                logger.warning(f"Book deletion failed: ID {book_id} not found")  # ✅ Log book not found
+                logger.warning("Book deletion failed: ID %s not found", book_id)  # ✅ Log book not found
                 raise NotFound("Book not found")
 
             self.book_repository.delete_book(book)
-            logger.info(f"Book deleted successfully: ID {book_id}")  # ✅ Log successful deletion
+            logger.info("Book deleted successfully: ID %s", book_id)  # ✅ Log successful deletion
         except Exception as e:
-            logger.error(f"Unexpected error deleting book ID {book_id}: {e}")  # ✅ Log unexpected errors
+            logger.error("Unexpected error deleting book ID %s: %s", book_id, e)  # ✅ Log unexpected errors
             raise
@@ -0,0 +1,111 @@
+import json
+import logging
+import time
+from django.conf import settings
+from books.repositories.book_repository import BookRepository
+from books.serializers.book_serializer import BookSerializer
+
+logger = logging.getLogger(__name__)
+
+class CatalogImportService:
+    """
+    Service layer for importing books in bulk from newline-delimited JSON.
+
+    Records are read lazily, validated with `BookSerializer` and written in
+    chunks, so memory usage depends on the chunk size and not on the size of
+    the feed.
+    """
+
+    def __init__(self, chunk_size=None, batch_size=None):
+        """
+        Initializes the CatalogImportService with a repository instance.
+
+        :param chunk_size: Number of records validated and written together (defaults to `settings.BOOK_IMPORT_CHUNK_SIZE`).
+        :param batch_size: Number of rows per INSERT (defaults to `settings.BOOK_PAGE_BATCH_SIZE`).
+        """
+        self.book_repository = BookRepository()
+        self.chunk_size = chunk_size or settings.BOOK_IMPORT_CHUNK_SIZE
+        self.batch_size = batch_size
+
+    def import_lines(self, lines):
+        """
+        Imports books from an iterable of NDJSON lines.
+
+        Blank lines are skipped. Invalid records are reported and do not prevent
+        the remaining records from being imported.
+
+        :param lines: An iterable of lines (str or bytes), each holding one book payload.
+        :return: A report dictionary with `created`, `pages`, `failed`, `errors`,
+                 `elapsed_seconds` and `books_per_second`.
+        """
+        started = time.perf_counter()
+        report = {"created": 0, "pages": 0, "failed": 0, "errors": []}
+
+        chunk = []
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            chunk.append((line_number, line))
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk, report)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk, report)
+
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["books_per_second"] = round(report["created"] / max(elapsed, 1e-6), 1)
+        logger.info(
+            "Catalog import finished: %s books, %s pages, %s failed in %.2f s (%s books/s)",
+            report["created"], report["pages"], report["failed"], elapsed, report["books_per_second"],
+        )
+        return report
+
+    def _import_chunk(self, chunk, report):
+        """
+        Validates and writes one chunk of records, updating the report in place.
+
+        If the bulk write fails (e.g. a database constraint), the valid records of
+        the chunk are retried one by one so the failure is reported per record.
+        """
+        valid = []
+        for line_number, line in chunk:
+            try:
+                payload = json.loads(line)
+            except ValueError as e:
+                self._add_error(report, line_number, {"non_field_errors": [f"Invalid JSON: {e}"]})
+                continue
+
+            serializer = BookSerializer(data=payload)
+            if serializer.is_valid():
+                valid.append((line_number, serializer.validated_data))
+            else:
+                self._add_error(report, line_number, serializer.errors)
+
+        if not valid:
+            return
+
+        result = self.book_repository.bulk_create_books([data for _, data in valid], self.batch_size)
+        if result is not None:
+            books, page_count = result
+            report["created"] += len(books)
+            report["pages"] += page_count
+            return
+
+        logger.warning("Bulk write failed for a chunk of %s records, retrying individually", len(valid))
+        for line_number, data in valid:
+            result = self.book_repository.bulk_create_books([data], self.batch_size)
+            if result is None:
+                self._add_error(report, line_number, {"non_field_errors": ["The book could not be saved."]})
+            else:
+                report["created"] += 1
+                report["pages"] += result[1]
+
+    @staticmethod
+    def _add_error(report, line_number, errors):
+        """
+        Records a failed line, keeping at most `settings.BOOK_IMPORT_MAX_ERRORS` entries.
+        """
+        report["failed"] += 1
+        if len(report["errors"]) < settings.BOOK_IMPORT_MAX_ERRORS:
+            report["errors"].append({"line": line_number, "errors": errors})
@@ -0,0 +1,74 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+from books.cache import catalog_cache
+from books.models import Book, BookPage
+from books.page_index import get_page_index
+from books.repositories.search_repository import SearchRepository
+
+# Sent by `BookRepository` after pages are inserted with `bulk_create`, which
+# sends no `post_save`. Arguments: `pages`, the created BookPage instances.
+pages_created = Signal()
+
+
+@receiver(post_save, sender=BookPage)
+def touch_book_on_page_save(sender, instance, raw=False, **kwargs):
+    """
+    Marks the parent book as modified whenever one of its pages is saved, so its
+    version (`updated_at`) moves forward and cached payloads are no longer served,
+    and reindexes the page for full-text search.
+
+    Bulk inserts do not send this signal; they only happen for new books, which
+    have nothing cached yet.
+    """
+    if raw:
+        return
+    Book.objects.filter(pk=instance.book_id).update(updated_at=timezone.now())
+    SearchRepository.index_pages(instance.book_id, [instance])
+    catalog_cache.invalidate_book(instance.book_id)
+
+
+@receiver(post_save, sender=BookPage)
+def index_page_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Updates the in-process page index (when enabled) once the transaction commits.
+    """
+    index = get_page_index()
+    if index is None or raw:
+        return
+    book_id, page_number, content = instance.book_id, instance.page_number, instance.content
+    transaction.on_commit(lambda: index.update_page(book_id, page_number, content))
+
+
+@receiver(pages_created)
+def index_created_pages(sender, pages, **kwargs):
+    """
+    Adds bulk-created pages to the in-process page index (when enabled) once the transaction commits.
+    """
+    index = get_page_index()
+    if index is None:
+        return
+    entries = [(page.book_id, page.page_number, page.content) for page in pages]
+
+    def update():
+        for entry in entries:
+            index.update_page(*entry)
+
+    transaction.on_commit(update)
+
+
+@receiver(post_delete, sender=Book)
+def remove_book_from_page_index(sender, instance, **kwargs):
+    """
+    Drops the pages of a deleted book from the in-process page index (when enabled).
+
+    Pages are removed with their book (they have no delete endpoint), so a
+    per-page receiver is not needed; connecting one would also stop the ORM
+    from deleting a book's pages with a single query.
+    """
+    index = get_page_index()
+    if index is None:
+        return
+    book_id = instance.pk
+    transaction.on_commit(lambda: index.remove_book(book_id))
@@ -4,9 +4,18 @@ from books.models import Book, BookPage
 from unittest.mock import patch
 from books.services.book_service import BookService
 from rest_framework.test import APIClient
+from books.cache import catalog_cache, stats
 
 User = get_user_model()
 
+@pytest.fixture(autouse=True)
+def clear_catalog_cache():
+    """Start every test with an empty catalog cache and zeroed counters"""
+    catalog_cache.cache.clear()
+    stats.reset()
+    yield
+    catalog_cache.cache.clear()
+
 @pytest.fixture
 def api_client():
     """Create an instance of the Django test client"""
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from config import content_encoding
+
+
+def asgi_get(user, url, **headers):
+    """GET `url` through Django's ASGI handler, authenticated as `user`"""
+    headers["Authorization"] = f"Bearer {AccessToken.for_user(user)}"
+    return async_to_sync(AsyncClient().get)(url, headers=headers)
+
+
+def test_read_routes_are_async():
+    """Test that the list and detail routes of books, and the page list, are served by async views"""
+    assert iscoroutinefunction(resolve(reverse("books-list")).func)
+    assert iscoroutinefunction(resolve(reverse("books-detail", args=[1])).func)
+    assert iscoroutinefunction(resolve(reverse("bookpage-list", args=[1])).func)
+    assert not iscoroutinefunction(resolve(reverse("bookpage-detail", args=[1, 1])).func)
+
+@pytest.mark.django_db
+def test_book_list_over_asgi_matches_sync(api_client, create_books, create_reader_user):
+    """Test that the async book list returns the same body under ASGI as under WSGI"""
+    api_client.force_authenticate(user=create_reader_user)
+    url = reverse("books-list") + "?ordering=title&page_size=1"
+
+    response = asgi_get(create_reader_user, url)
+
+    assert response.status_code == 200
+    assert response.data == api_client.get(url).data
+    assert [book["title"] for book in response.data["results"]] == ["Libro 1"]
+    assert response.data["next"]
+
+@pytest.mark.django_db
+def test_book_list_offset_mode_over_asgi(create_books, create_reader_user):
+    """Test that offset pagination counts the books through the async ORM"""
+    response = asgi_get(create_reader_user, reverse("books-list") + "?page=1&page_size=1")
+
+    assert response.status_code == 200
+    assert response.data["count"] == 2
+    assert asgi_get(create_reader_user, reverse("books-list") + "?page=5").status_code == 404
+
+@pytest.mark.django_db
+def test_book_retrieve_over_asgi(create_book_with_pages, create_reader_user, settings):
+    """Test that the async detail view returns the book with its pages and honours If-None-Match"""
+    settings.REQUEST_METRICS_SERVER_TIMING = True
+    url = reverse("books-detail", args=[create_book_with_pages.id])
+
+    response = asgi_get(create_reader_user, url)
+    not_modified = asgi_get(create_reader_user, url, **{"If-None-Match": response["ETag"]})
+
+    assert response.status_code == 200
+    assert [page["page_number"] for page in response.data["pages"]] == [1, 2]
+    assert 'desc="0 queries"' not in response["Server-Timing"]  # metrics see the ORM thread's queries
+    assert not_modified.status_code == 304
+    assert asgi_get(create_reader_user, reverse("books-detail", args=[999])).status_code == 404
+
+@pytest.mark.django_db
+def test_page_list_over_asgi(create_book_with_many_pages, create_reader_user):
+    """Test that the async page list paginates, caches and compresses under ASGI"""
+    url = reverse("bookpage-list", args=[create_book_with_many_pages.id])
+
+    first = asgi_get(create_reader_user, url)
+    cached = asgi_get(create_reader_user, url, **{"Accept-Encoding": "gzip"})
+
+    assert first.status_code == 200
+    assert [page["page_number"] for page in json.loads(first.content)["results"]] == list(range(1, 11))
+    assert cached["Content-Encoding"] == "gzip"
+    assert asgi_get(create_reader_user, reverse("bookpage-list", args=[999])).status_code == 404
+
+@pytest.mark.django_db
+def test_large_responses_are_compressed_off_the_event_loop(create_book_with_many_pages, create_reader_user, settings):
+    """Test that on-the-fly compression of a large body runs in a worker thread under ASGI"""
+    settings.RESPONSE_COMPRESSION_THREAD_MIN_SIZE = 1024
+    compress, on_loop = content_encoding.compress, []
+
+    def recording_compress(body, encoding):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return compress(body, encoding)
+
+    with patch.object(content_encoding, "compress", recording_compress):
+        response = asgi_get(create_reader_user, reverse("books-detail", args=[create_book_with_many_pages.id]),
+                            **{"Accept-Encoding": "gzip"})
+
+    assert response["Content-Encoding"] == "gzip"
+    assert on_loop == [False]
+
+def test_asgi_entry_point_disables_persistent_connections():
+    """Test that serving through config.asgi closes connections after every request"""
+    code = "import config.asgi; from django.conf import settings; print(settings.DATABASES['default']['CONN_MAX_AGE'])"
+    env = {**os.environ, "DB_CONN_MAX_AGE": "60", "SQLITE_PATH": ":memory:"}
+    env.pop("DJANGO_SETTINGS_MODULE", None)
+
+    result = subprocess.run([sys.executable, "-c", code], env=env, cwd=settings.BASE_DIR, capture_output=True, text=True)
+
+    assert result.stdout.strip() == "0", result.stderr
@@ -0,0 +1,94 @@
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from books.models import Book
+from books.repositories.book_repository import BookRepository
+
+
+@pytest.fixture
+def dated_books(db):
+    """Create books with distinct authors, titles and timestamps"""
+    now = timezone.now()
+    rows = [
+        ("Ficciones", "Borges", 5, 1),
+        ("El Aleph", "Borges", 4, 3),
+        ("Rayuela", "Cortázar", 3, 2),
+        ("Final del juego", "Cortázar", 2, 5),
+        ("Fervor de Buenos Aires", "Borges", 1, 4),
+    ]
+    books = {}
+    for title, author, created_days_ago, updated_days_ago in rows:
+        book = Book.objects.create(title=title, author=author)
+        Book.objects.filter(pk=book.pk).update(
+            created_at=now - timedelta(days=created_days_ago), updated_at=now - timedelta(days=updated_days_ago)
+        )
+        books[title] = book.id
+    return now, books
+
+
+def titles(response):
+    return [book["title"] for book in response.data["results"]]
+
+@pytest.mark.django_db
+def test_filter_by_author_and_created_range(api_client, create_reader_user, dated_books):
+    """Test author and created_at range filters with the default ordering"""
+    now, _ = dated_books
+    api_client.force_authenticate(user=create_reader_user)
+
+    response = api_client.get(reverse("books-list"), {
+        "author": "Borges", "created_after": (now - timedelta(days=4, hours=1)).isoformat(),
+    })
+
+    assert titles(response) == ["Fervor de Buenos Aires", "El Aleph"]
+
+@pytest.mark.django_db
+def test_order_by_updated_at_across_cursor_pages(api_client, create_reader_user, dated_books):
+    """Test that a non-default ordering is kept by the cursor links"""
+    api_client.force_authenticate(user=create_reader_user)
+
+    response = api_client.get(reverse("books-list"), {"ordering": "-updated_at", "page_size": 2})
+    seen = titles(response)
+    while response.data["next"]:
+        response = api_client.get(response.data["next"])
+        seen += titles(response)
+
+    assert seen == ["Ficciones", "Rayuela", "El Aleph", "Fervor de Buenos Aires", "Final del juego"]
+
+@pytest.mark.django_db
+def test_title_prefix_orders_by_title(api_client, create_reader_user, dated_books):
+    """Test that a title prefix is case-insensitive and ordered by title"""
+    api_client.force_authenticate(user=create_reader_user)
+
+    response = api_client.get(reverse("books-list"), {"title_prefix": "f"})
+
+    assert titles(response) == ["Fervor de Buenos Aires", "Ficciones", "Final del juego"]
+
+@pytest.mark.django_db
+def test_invalid_filters_are_rejected(api_client, create_reader_user, dated_books):
+    """Test that unsupported orderings, combinations and dates return 400"""
+    api_client.force_authenticate(user=create_reader_user)
+    url = reverse("books-list")
+
+    assert api_client.get(url, {"ordering": "author"}).status_code == 400
+    assert api_client.get(url, {"title_prefix": "F", "ordering": "-created_at"}).status_code == 400
+    assert api_client.get(url, {"created_after": "ayer"}).status_code == 400
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("filters, ordering", [
+    ({}, "-created_at"),
+    ({}, "updated_at"),
+    ({"author": "Borges"}, "-created_at"),
+    ({"author": "Borges"}, "-updated_at"),
+    ({"author": "Borges", "title_prefix": "F"}, "title"),
+    ({"title_prefix": "F"}, "-title"),
+    ({"created_after": timezone.now()}, "created_at"),
+])
+def test_filter_and_ordering_use_an_index(filters, ordering):
+    """Test that every supported filter/ordering combination is read in index order (no sort step)"""
+    result = BookRepository.get_all_books(BookRepository.SHAPE_SUMMARY, filters, ordering)
+
+    plan = result.queryset.explain()
+
+    assert "USING INDEX book_" in plan
+    assert "TEMP B-TREE" not in plan
@@ -1,5 +1,9 @@
 import pytest
+from unittest.mock import patch
+from django.db import DatabaseError, OperationalError, connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from books.models import Book, BookPage
 
 @pytest.mark.django_db
 def test_list_book_pages(api_client, create_book_with_pages):
@@ -48,3 +52,110 @@ def test_list_book_pages_invalid_page(api_client, create_book_with_pages):
     response = api_client.get(url, {"page": 999})
 
     assert response.status_code == 404
+
+@pytest.mark.django_db
+def test_list_book_pages_cursor_navigation(api_client, create_book_with_many_pages):
+    """Test that cursor links walk every page forwards and backwards without counting"""
+    api_client.force_authenticate(user=create_book_with_many_pages.author)
+    url = reverse("bookpage-list", args=[create_book_with_many_pages.id])
+
+    response = api_client.get(url, {"page_size": 6})
+    assert response.status_code == 200
+    assert "count" not in response.data
+    assert response.data["previous"] is None
+
+    seen = [page["page_number"] for page in response.data["results"]]
+    while response.data["next"]:
+        response = api_client.get(response.data["next"])
+        seen += [page["page_number"] for page in response.data["results"]]
+    assert seen == list(range(1, 21))
+
+    response = api_client.get(response.data["previous"])
+    assert [page["page_number"] for page in response.data["results"]] == [13, 14, 15, 16, 17, 18]
+
+@pytest.mark.django_db
+def test_list_book_pages_offset_mode(api_client, create_book_with_many_pages):
+    """Test that offset pagination stays available behind a query parameter"""
+    api_client.force_authenticate(user=create_book_with_many_pages.author)
+    url = reverse("bookpage-list", args=[create_book_with_many_pages.id])
+    response = api_client.get(url, {"pagination": "offset", "page_size": 5})
+
+    assert response.status_code == 200
+    assert response.data["count"] == 20
+    assert len(response.data["results"]) == 5
+
+@pytest.mark.django_db
+def test_list_book_pages_invalid_cursor(api_client, create_book_with_pages):
+    """Test that a malformed cursor is rejected"""
+    api_client.force_authenticate(user=create_book_with_pages.author)
+    url = reverse("bookpage-list", args=[create_book_with_pages.id])
+    response = api_client.get(url, {"cursor": "not-a-cursor"})
+
+    assert response.status_code == 404
+
+@pytest.mark.django_db
+def test_retrieve_single_page(api_client, create_book_with_many_pages):
+    """Test fetching one page by its page number"""
+    api_client.force_authenticate(user=create_book_with_many_pages.author)
+    url = reverse("bookpage-detail", args=[create_book_with_many_pages.id, 7])
+    response = api_client.get(url)
+
+    assert response.status_code == 200
+    assert response.data == {"page_number": 7, "content": "Contenido de la página 7"}
+
+@pytest.mark.django_db
+def test_retrieve_missing_page(api_client, create_book_with_pages):
+    """Test fetching a page number that does not exist"""
+    api_client.force_authenticate(user=create_book_with_pages.author)
+    response = api_client.get(reverse("bookpage-detail", args=[create_book_with_pages.id, 99]))
+    assert response.status_code == 404
+
+    response = api_client.get(reverse("bookpage-detail", args=[999, 1]))
+    assert response.status_code == 404
+
+@pytest.mark.django_db
+def test_retrieve_page_prefetches_following_pages(api_client, create_book_with_many_pages):
+    """Test that prefetch warms the cache so the next page turns do not query pages"""
+    api_client.force_authenticate(user=create_book_with_many_pages.author)
+    book_id = create_book_with_many_pages.id
+
+    with CaptureQueriesContext(connection) as queries:
+        api_client.get(reverse("bookpage-detail", args=[book_id, 3]), {"prefetch": 3})
+    assert len([q for q in queries if "books_bookpage" in q["sql"]]) == 1
+
+    with CaptureQueriesContext(connection) as queries:
+        for page_number in (4, 5, 6):
+            response = api_client.get(reverse("bookpage-detail", args=[book_id, page_number]))
+            assert response.data["page_number"] == page_number
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_retrieve_page_database_error_is_not_a_404(api_client, create_book_with_pages):
+    """Test that a failing page query is reported as a server error, not as a missing page"""
+    api_client.force_authenticate(user=create_book_with_pages.author)
+    url = reverse("bookpage-detail", kwargs={"book_id": create_book_with_pages.id, "page_number": 1})
+
+    with patch.object(BookPage.objects, "filter", side_effect=DatabaseError("connection lost")):
+        response = api_client.get(url)
+
+    assert response.status_code == 500
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["books-detail", "bookpage-list", "bookpage-detail"])
+def test_version_lookup_database_error_is_not_a_404(api_client, create_book_with_pages, url_name):
+    """Test that a failing book version lookup is a server error on every read endpoint, not a missing book"""
+    book = create_book_with_pages
+    kwargs = {
+        "books-detail": {"pk": book.id},
+        "bookpage-list": {"book_id": book.id},
+        "bookpage-detail": {"book_id": book.id, "page_number": 1},
+    }[url_name]
+    api_client.force_authenticate(user=book.author)
+    api_client.raise_request_exception = False
+
+    with patch.object(Book.objects, "filter", side_effect=OperationalError("database is locked")):
+        response = api_client.get(reverse(url_name, kwargs=kwargs))
+
+    assert response.status_code == 500
@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import patch
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from books.models import Book, BookPage
+from books.repositories.book_repository import BookRepository
+
+
+@pytest.mark.django_db
+def test_create_book_inserts_pages_in_batches():
+    """Test that pages are written with batched bulk inserts"""
+    data = {
+        "title": "Libro largo",
+        "author": "Autor",
+        "pages": [{"page_number": i, "content": f"Contenido {i}"} for i in range(1, 26)],
+    }
+
+    with CaptureQueriesContext(connection) as queries:
+        book = BookRepository.create_book(data, batch_size=10)
+
+    page_inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "books_bookpage"')]
+    assert len(page_inserts) == 3
+    assert book.pages.count() == 25
+
+@pytest.mark.django_db
+def test_create_book_is_atomic():
+    """Test that a failure while writing pages does not leave a partial book"""
+    data = {
+        "title": "Libro roto",
+        "author": "Autor",
+        "pages": [{"page_number": 1, "content": "Contenido"}],
+    }
+
+    with patch.object(BookPage.objects, "bulk_create", side_effect=RuntimeError("boom")):
+        book = BookRepository.create_book(data)
+
+    assert book is None
+    assert not Book.objects.filter(title="Libro roto").exists()
+
+@pytest.mark.django_db
+def test_get_all_books_shapes():
+    """Test that the summary shape is annotated and the detail shape prefetches the pages in one query"""
+    book = Book.objects.create(title="Libro", author="Autor")
+    BookPage.objects.bulk_create(BookPage(book=book, page_number=n, content=f"Contenido {n}") for n in (1, 2))
+
+    summary = BookRepository.get_all_books(BookRepository.SHAPE_SUMMARY).queryset.get()
+    with CaptureQueriesContext(connection) as queries:
+        detail = list(BookRepository.get_all_books(BookRepository.SHAPE_DETAIL).queryset)
+        pages = [page.page_number for page in detail[0].pages.all()]
+
+    assert (summary.page_count, summary.total_size) == (2, len("Contenido 1") + len("Contenido 2"))
+    assert sorted(pages) == [1, 2]
+    assert len(queries) == 2
+    with pytest.raises(ValueError):
+        BookRepository.get_all_books("full")
+
+@pytest.mark.django_db
+def test_bulk_create_books_without_returned_ids():
+    """Test that without RETURNING (MySQL) books are inserted in one statement and their IDs read back"""
+    Book.objects.create(title="Anterior", author="Autor")
+    data = [
+        {"title": "Gemelo", "author": "Autor", "pages": [{"page_number": 1, "content": "primero"}]},
+        {"title": "Otro", "author": "Autora", "pages": [{"page_number": 1, "content": "otro"}]},
+        {"title": "Gemelo", "author": "Autor", "pages": [{"page_number": 1, "content": "segundo"}]},
+    ]
+
+    with patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False):
+        with CaptureQueriesContext(connection) as queries:
+            books, page_count = BookRepository.bulk_create_books(data)
+
+    book_inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "books_book"')]
+    assert len(book_inserts) == 1
+    assert page_count == 3
+    assert len({book.id for book in books}) == 3
+    for book, expected in zip(books, data):
+        assert Book.objects.get(id=book.id).title == expected["title"]
+        assert book.pages.get().content == expected["pages"][0]["content"]
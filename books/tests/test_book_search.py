@@ -0,0 +1,119 @@
+import pytest
+from django.urls import reverse
+from books.models import BookPage
+from books.repositories.book_repository import BookRepository
+from books.repositories.search_repository import SearchRepository, make_snippet
+
+BOOK = {
+    "title": "El jardín de senderos",
+    "author": "Jorge Luis Borges",
+    "pages": [
+        {"page_number": 1, "content": "Un laberinto de símbolos, un invisible laberinto de tiempo."},
+        {"page_number": 2, "content": "El espía se detuvo frente a la casa del sinólogo."},
+    ],
+}
+
+
+def search(api_client, q, **params):
+    return api_client.get(reverse("books-search"), {"q": q, **params})
+
+
+@pytest.mark.django_db
+def test_search_finds_pages_with_snippets(api_client, create_editor_user):
+    """Test that a created book is found by its page content, with highlighted snippets"""
+    api_client.force_authenticate(user=create_editor_user)
+    book_id = api_client.post(reverse("books-list"), BOOK, format="json").data["id"]
+
+    response = search(api_client, "laberinto")
+
+    assert response.status_code == 200
+    assert [result["id"] for result in response.data] == [book_id]
+    pages = response.data[0]["pages"]
+    assert [page["page_number"] for page in pages] == [1]
+    assert "<mark>laberinto</mark>" in pages[0]["snippet"]
+
+@pytest.mark.django_db
+def test_search_matches_title_and_author(api_client, create_editor_user):
+    """Test that title and author matches rank a book without listing pages"""
+    api_client.force_authenticate(user=create_editor_user)
+    api_client.post(reverse("books-list"), BOOK, format="json")
+    api_client.post(reverse("books-list"), {"title": "Ficciones", "author": "Otro autor"}, format="json")
+
+    response = search(api_client, "Borges")
+
+    assert [result["title"] for result in response.data] == ["El jardín de senderos"]
+    assert response.data[0]["pages"] == []
+
+@pytest.mark.django_db
+def test_updates_are_reindexed(api_client, create_editor_user):
+    """Test that updated titles and pages saved through the ORM are searchable"""
+    api_client.force_authenticate(user=create_editor_user)
+    book_id = api_client.post(reverse("books-list"), BOOK, format="json").data["id"]
+
+    api_client.put(reverse("books-detail", args=[book_id]), {"title": "Ficciones"}, format="json")
+    page = BookPage.objects.get(book_id=book_id, page_number=2)
+    page.content = "Tlön, Uqbar, Orbis Tertius"
+    page.save()
+
+    assert search(api_client, "jardín").data == []
+    assert search(api_client, "sinólogo").data == []
+    assert [result["id"] for result in search(api_client, "ficciones").data] == [book_id]
+    assert search(api_client, "uqbar").data[0]["pages"][0]["page_number"] == 2
+
+@pytest.mark.django_db
+def test_deleted_books_are_not_found(api_client, create_editor_user):
+    """Test that deleting a book removes it from the index"""
+    api_client.force_authenticate(user=create_editor_user)
+    book_id = api_client.post(reverse("books-list"), BOOK, format="json").data["id"]
+
+    api_client.delete(reverse("books-detail", args=[book_id]))
+
+    assert search(api_client, "laberinto").data == []
+
+@pytest.mark.django_db
+def test_search_requires_query(api_client, create_reader_user):
+    """Test that an empty query or an invalid limit is rejected"""
+    api_client.force_authenticate(user=create_reader_user)
+
+    assert api_client.get(reverse("books-search")).status_code == 400
+    assert search(api_client, "laberinto", limit="cero").status_code == 400
+
+def test_make_snippet_marks_terms():
+    """Test the snippet built where the database has no snippet function"""
+    content = "a" * 300 + " El Laberinto " + "b" * 300
+
+    snippet = make_snippet(content, ["laberinto"], width=60)
+
+    assert "<mark>Laberinto</mark>" in snippet
+    assert snippet.startswith("…") and snippet.endswith("…")
+
+def test_make_snippet_escapes_content():
+    """Test that markup in page content is escaped and only the highlight tags are HTML"""
+    snippet = make_snippet('<script>alert("laberinto")</script> & <mark>', ["laberinto"])
+
+    assert snippet == "&lt;script&gt;alert(&quot;<mark>laberinto</mark>&quot;)&lt;/script&gt; &amp; &lt;mark&gt;"
+
+@pytest.mark.django_db
+def test_search_snippets_escape_page_content(api_client, create_editor_user):
+    """Test that engine-built snippets escape markup stored in page content"""
+    api_client.force_authenticate(user=create_editor_user)
+    page = {"page_number": 1, "content": 'Un <img src=x onerror="alert(1)"> laberinto <b>oscuro</b>'}
+    api_client.post(reverse("books-list"), {"title": "Peligro", "author": "Anónimo", "pages": [page]}, format="json")
+
+    snippet = search(api_client, "laberinto").data[0]["pages"][0]["snippet"]
+
+    assert "<img" not in snippet and "<b>" not in snippet
+    assert "&lt;img" in snippet
+    assert "<mark>laberinto</mark>" in snippet
+
+@pytest.mark.django_db
+def test_bulk_created_pages_are_indexed():
+    """Test that pages of every book of an import batch are indexed under their own book"""
+    books, _ = BookRepository.bulk_create_books([
+        {"title": "Uno", "author": "A", "pages": [{"page_number": 1, "content": "niebla"}, {"page_number": 2, "content": "río"}]},
+        {"title": "Dos", "author": "B", "pages": [{"page_number": 1, "content": "niebla y río"}]},
+    ])
+
+    hits = {(book_id, page_number) for book_id, page_number, _, _ in SearchRepository.search("niebla")}
+
+    assert hits == {(books[0].id, 1), (books[1].id, 1)}
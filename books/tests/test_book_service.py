@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import patch
+from config.results import QueryResult
 from rest_framework.exceptions import NotFound, ValidationError
 
 
@@ -7,11 +8,12 @@ from rest_framework.exceptions import NotFound, ValidationError
 def test_get_books(book_service):
     """Tests that get_books() returns the expected list of books."""
     service, mock_repo = book_service
-    mock_repo.get_all_books.return_value = ["Book 1", "Book 2"]  # ✅ Explicitly set return value
+    mock_repo.get_all_books.return_value = QueryResult(["Book 1", "Book 2"])  # ✅ Explicitly set return value
 
     books = service.get_books()
 
-    assert books == ["Book 1", "Book 2"]  # ✅ Now it should pass
+    assert list(books) == ["Book 1", "Book 2"]
+    assert books.known_count is None  # ✅ The service must not count the books itself
     mock_repo.get_all_books.assert_called_once()  # ✅ Ensure the mock was used
 
 @pytest.mark.django_db
@@ -1,5 +1,8 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from books.models import Book, BookPage
 
 @pytest.mark.django_db
 def test_list_books(api_client, create_books, create_reader_user):
@@ -88,3 +91,66 @@ def test_delete_book_unauthenticated(api_client, create_books):
     url = reverse("books-detail", args=[create_books[0].id])
     response = api_client.delete(url)
     assert response.status_code == 401 
+
+@pytest.mark.django_db
+def test_list_books_summary(api_client, create_book_with_pages, create_reader_user):
+    """Test that the book list returns the summary representation without pages"""
+    api_client.force_authenticate(user=create_reader_user)
+    url = reverse("books-list")
+    response = api_client.get(url)
+    assert response.status_code == 200
+    book = response.data["results"][0]
+    assert "pages" not in book
+    assert book["page_count"] == 2
+    assert book["total_size"] == len("Contenido de la página 1") + len("Contenido de la página 2")
+
+@pytest.mark.django_db
+def test_list_books_queries_do_not_grow_with_books(api_client, create_reader_user):
+    """Test that listing books does not issue one query per book"""
+    api_client.force_authenticate(user=create_reader_user)
+    url = reverse("books-list")
+
+    def count_list_queries():
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"page_size": 50})
+        assert response.status_code == 200
+        return len(queries)
+
+    for i in range(2):
+        book = Book.objects.create(title=f"Libro {i}", author="Autor")
+        BookPage.objects.create(book=book, page_number=1, content="Contenido")
+    baseline = count_list_queries()
+
+    for i in range(2, 20):
+        book = Book.objects.create(title=f"Libro {i}", author="Autor")
+        BookPage.objects.create(book=book, page_number=1, content="Contenido")
+    assert count_list_queries() == baseline
+
+@pytest.mark.django_db
+def test_create_book_with_pages(api_client, create_editor_user):
+    """Test book creation with pages as an editor"""
+    api_client.force_authenticate(user=create_editor_user)
+    url = reverse("books-list")
+    data = {
+        "title": "New Book",
+        "author": "New Author",
+        "pages": [{"page_number": i, "content": f"Page {i}"} for i in range(1, 6)],
+    }
+    response = api_client.post(url, data, format="json")
+    assert response.status_code == 201
+    assert [page["page_number"] for page in response.data["pages"]] == [1, 2, 3, 4, 5]
+
+@pytest.mark.django_db
+def test_list_books_cursor_breaks_created_at_ties(api_client, create_reader_user):
+    """Test that books sharing created_at are neither skipped nor repeated across cursor pages"""
+    api_client.force_authenticate(user=create_reader_user)
+    books = [Book.objects.create(title=f"Libro {i}", author="Autor") for i in range(7)]
+    Book.objects.filter(id__in=[book.id for book in books]).update(created_at=books[0].created_at)
+
+    response = api_client.get(reverse("books-list"), {"page_size": 3})
+    seen = [book["id"] for book in response.data["results"]]
+    while response.data["next"]:
+        response = api_client.get(response.data["next"])
+        seen += [book["id"] for book in response.data["results"]]
+
+    assert seen == sorted((book.id for book in books), reverse=True)
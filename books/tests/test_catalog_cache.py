@@ -0,0 +1,111 @@
+import time
+import pytest
+from unittest.mock import patch
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from books.cache import LocMemLRUCache, stats
+from books.checks import check_catalog_cache_is_shared
+from books.models import Book, BookPage
+
+
+@pytest.mark.django_db
+def test_retrieve_book_is_served_from_cache(api_client, create_book_with_pages):
+    """Test that a second read of an unchanged book does not hit the database"""
+    api_client.force_authenticate(user=create_book_with_pages.author)
+    url = reverse("books-detail", args=[create_book_with_pages.id])
+
+    first = api_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        second = api_client.get(url)
+
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert len(queries) == 0
+    assert stats.as_dict()["hits"] == 1
+
+@pytest.mark.django_db
+def test_update_book_invalidates_cache(api_client, create_editor_user, create_books):
+    """Test that updating a book is visible on the next read"""
+    api_client.force_authenticate(user=create_editor_user)
+    url = reverse("books-detail", args=[create_books[0].id])
+
+    api_client.get(url)
+    api_client.put(url, {"title": "Título nuevo"})
+    response = api_client.get(url)
+
+    assert response.data["title"] == "Título nuevo"
+
+@pytest.mark.django_db
+def test_page_save_invalidates_cached_pages(api_client, create_book_with_pages):
+    """Test that saving a page invalidates the cached page batches of its book"""
+    api_client.force_authenticate(user=create_book_with_pages.author)
+    url = reverse("bookpage-list", args=[create_book_with_pages.id])
+
+    api_client.get(url)
+    page = BookPage.objects.get(book=create_book_with_pages, page_number=1)
+    page.content = "Contenido corregido"
+    page.save()
+    response = api_client.get(url)
+
+    assert response.data["results"][0]["content"] == "Contenido corregido"
+
+@pytest.mark.django_db
+def test_locmem_version_expires_for_other_workers_writes(api_client, create_editor_user, create_books):
+    """Test that a write this process did not see is served within BOOK_CACHE_LOCAL_VERSION_TIMEOUT"""
+    api_client.force_authenticate(user=create_editor_user)
+    url = reverse("books-detail", args=[create_books[0].id])
+    api_client.get(url)
+
+    # Another worker's write: the row changes but this process's pointer is not dropped.
+    Book.objects.filter(id=create_books[0].id).update(title="Título nuevo", updated_at=timezone.now())
+    assert api_client.get(url).data["title"] != "Título nuevo"
+
+    later = time.time() + settings.BOOK_CACHE_LOCAL_VERSION_TIMEOUT + 1
+    with patch("django.core.cache.backends.locmem.time.time", return_value=later):
+        assert api_client.get(url).data["title"] == "Título nuevo"
+
+def test_locmem_cache_with_several_workers_is_reported(monkeypatch):
+    """Test that the system check warns about a per-process catalog cache behind several workers"""
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    assert check_catalog_cache_is_shared(None) == []
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert [warning.id for warning in check_catalog_cache_is_shared(None)] == ["books.W001"]
+
+@pytest.mark.django_db
+def test_pages_of_nonexistent_book_are_not_cached(api_client, create_editor_user):
+    """Test that a missing book is reported without caching anything"""
+    api_client.force_authenticate(user=create_editor_user)
+    response = api_client.get(reverse("bookpage-list", args=[999]))
+
+    assert response.status_code == 404
+    assert stats.as_dict()["misses"] == 0
+
+def test_locmem_cache_counts_lru_evictions():
+    """Test that culling the LRU backend is reflected in the eviction counter"""
+    cache = LocMemLRUCache("test-evictions", {"OPTIONS": {"MAX_ENTRIES": 3, "CULL_FREQUENCY": 3}})
+    stats.reset()
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    cache.get("a")
+    cache.set("d", "d")
+
+    assert stats.as_dict()["evictions"] == 1
+    assert cache.get("a") == "a"
+    assert cache.get("b") is None
+
+@pytest.mark.django_db
+def test_cache_stats_requires_admin(api_client, create_reader_user):
+    """Test that only administrators can read the cache counters"""
+    api_client.force_authenticate(user=create_reader_user)
+    response = api_client.get(reverse("books-cache-stats"))
+    assert response.status_code == 403
+
+    create_reader_user.is_staff = True
+    create_reader_user.save()
+    response = api_client.get(reverse("books-cache-stats"))
+    assert response.status_code == 200
+    assert set(response.data) >= {"hits", "misses", "evictions", "backend"}
@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+
+def streamed_text(response):
+    return b"".join(response.streaming_content).decode("utf-8")
+
+@pytest.mark.django_db
+def test_export_ndjson_with_pages(api_client, create_book_with_pages, create_reader_user):
+    """Test that the catalog is streamed as NDJSON including pages"""
+    api_client.force_authenticate(user=create_reader_user)
+    response = api_client.get(reverse("books-export"), {"include_pages": "true"})
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in streamed_text(response).splitlines()]
+    assert len(records) == 1
+    assert records[0]["id"] == create_book_with_pages.id
+    assert [page["page_number"] for page in records[0]["pages"]] == [1, 2]
+
+@pytest.mark.django_db
+def test_export_csv_one_row_per_page(api_client, create_book_with_pages, create_books, create_reader_user):
+    """Test that the CSV export writes one row per page and one row for books without pages"""
+    api_client.force_authenticate(user=create_reader_user)
+    response = api_client.get(reverse("books-export"), {"file_format": "csv", "include_pages": "1"})
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(streamed_text(response))))
+    assert len(rows) == 4
+    assert [row["page_number"] for row in rows if row["id"] == str(create_book_with_pages.id)] == ["1", "2"]
+
+@pytest.mark.django_db
+def test_export_unknown_format(api_client, create_reader_user):
+    """Test that an unknown export format is rejected"""
+    api_client.force_authenticate(user=create_reader_user)
+    response = api_client.get(reverse("books-export"), {"file_format": "xml"})
+    assert response.status_code == 400
+
+@pytest.mark.django_db
+def test_export_catalog_command(create_books, tmp_path):
+    """Test the export_catalog management command"""
+    path = tmp_path / "catalog.csv"
+    err = io.StringIO()
+    call_command("export_catalog", "--file-format", "csv", "--output", str(path), stderr=err)
+
+    rows = list(csv.DictReader(path.open(encoding="utf-8")))
+    assert {row["title"] for row in rows} == {"Libro 1", "Libro 2"}
+    assert "rows/s" in err.getvalue()
@@ -0,0 +1,69 @@
+import json
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from books.models import Book, BookPage
+from books.services.catalog_import_service import CatalogImportService
+
+
+def ndjson(*records):
+    return "\n".join(record if isinstance(record, str) else json.dumps(record) for record in records) + "\n"
+
+@pytest.mark.django_db
+def test_bulk_import_as_editor(api_client, create_editor_user):
+    """Test that an editor can import books from NDJSON and gets a per-line error report"""
+    api_client.force_authenticate(user=create_editor_user)
+    url = reverse("books-bulk")
+    body = ndjson(
+        {"title": "Libro 1", "author": "Autor 1", "pages": [{"page_number": 1, "content": "Uno"}]},
+        "{not json",
+        {"title": "", "author": "Autor 3"},
+        {"title": "Libro 4", "author": "Autor 4"},
+    )
+    response = api_client.post(url, body, content_type="application/x-ndjson")
+
+    assert response.status_code == 200
+    assert response.data["created"] == 2
+    assert response.data["pages"] == 1
+    assert response.data["failed"] == 2
+    assert [error["line"] for error in response.data["errors"]] == [2, 3]
+    assert Book.objects.count() == 2
+
+@pytest.mark.django_db
+def test_bulk_import_as_reader(api_client, create_reader_user):
+    """Test that a reader cannot import books"""
+    api_client.force_authenticate(user=create_reader_user)
+    url = reverse("books-bulk")
+    response = api_client.post(url, ndjson({"title": "Libro", "author": "Autor"}), content_type="application/x-ndjson")
+    assert response.status_code == 403
+
+@pytest.mark.django_db
+def test_import_isolates_records_that_fail_on_write():
+    """Test that a database error in one record does not discard the rest of its chunk"""
+    lines = ndjson(
+        {"title": "Libro 1", "author": "Autor"},
+        {"title": "Duplicado", "author": "Autor", "pages": [
+            {"page_number": 1, "content": "A"}, {"page_number": 1, "content": "B"},
+        ]},
+        {"title": "Libro 3", "author": "Autor"},
+    ).splitlines()
+
+    report = CatalogImportService(chunk_size=10).import_lines(lines)
+
+    assert report["created"] == 2
+    assert report["errors"][0]["line"] == 2
+    assert not Book.objects.filter(title="Duplicado").exists()
+
+@pytest.mark.django_db
+def test_import_catalog_command(tmp_path):
+    """Test the import_catalog management command"""
+    path = tmp_path / "catalog.ndjson"
+    path.write_text(ndjson(*[
+        {"title": f"Libro {i}", "author": "Autor", "pages": [{"page_number": 1, "content": f"Texto {i}"}]}
+        for i in range(7)
+    ]), encoding="utf-8")
+
+    call_command("import_catalog", str(path), "--chunk-size", "3")
+
+    assert Book.objects.count() == 7
+    assert BookPage.objects.count() == 7
@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from books.models import BookPage
+
+
+@pytest.mark.django_db
+def test_retrieve_book_sets_validators(api_client, create_books, create_reader_user):
+    """Test that the book detail carries a strong ETag and Last-Modified"""
+    api_client.force_authenticate(user=create_reader_user)
+    response = api_client.get(reverse("books-detail", args=[create_books[0].id]))
+
+    assert response.status_code == 200
+    assert response["ETag"].startswith('"book-')
+    assert "Last-Modified" in response
+
+@pytest.mark.django_db
+def test_retrieve_book_not_modified(api_client, create_books, create_reader_user):
+    """Test that a matching If-None-Match returns 304 without touching the database"""
+    api_client.force_authenticate(user=create_reader_user)
+    url = reverse("books-detail", args=[create_books[0].id])
+    etag = api_client.get(url)["ETag"]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert len(queries) == 0
+
+@pytest.mark.django_db
+def test_retrieve_book_modified_after_update(api_client, create_editor_user, create_books):
+    """Test that an update changes the ETag so stale validators get a full response"""
+    api_client.force_authenticate(user=create_editor_user)
+    url = reverse("books-detail", args=[create_books[0].id])
+    etag = api_client.get(url)["ETag"]
+
+    api_client.put(url, {"title": "Otro título"})
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+@pytest.mark.django_db
+def test_retrieve_book_if_modified_since(api_client, create_books, create_reader_user):
+    """Test that If-Modified-Since equal to Last-Modified returns 304"""
+    api_client.force_authenticate(user=create_reader_user)
+    url = reverse("books-detail", args=[create_books[0].id])
+    last_modified = api_client.get(url)["Last-Modified"]
+
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 304
+
+@pytest.mark.django_db
+def test_book_pages_etag_depends_on_cursor_and_content(api_client, create_book_with_many_pages):
+    """Test that each page batch has its own ETag and that page edits change it"""
+    api_client.force_authenticate(user=create_book_with_many_pages.author)
+    url = reverse("bookpage-list", args=[create_book_with_many_pages.id])
+
+    first = api_client.get(url)
+    second = api_client.get(first.data["next"])
+    assert first["ETag"] != second["ETag"]
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+    page = BookPage.objects.get(book=create_book_with_many_pages, page_number=1)
+    page.content = "Nuevo contenido"
+    page.save()
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 200
+
+@pytest.mark.django_db
+def test_conditional_request_still_requires_authentication(api_client, create_books):
+    """Test that conditional headers do not bypass authentication"""
+    response = api_client.get(reverse("books-detail", args=[create_books[0].id]), HTTP_IF_NONE_MATCH="*")
+    assert response.status_code == 401
@@ -0,0 +1,96 @@
+import sqlite3
+import threading
+import pytest
+from django.db import connection
+from config.backends.sqlite3.base import DatabaseWrapper
+from config.db_pool import ConnectionPool, PoolTimeout
+
+
+def make_pool(**options):
+    options = {"max_size": 2, "timeout": 0.05, "recycle": 3600, "check_interval": 30, **options}
+    return ConnectionPool(**options)
+
+def connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+def check(conn):
+    conn.execute("SELECT 1")
+
+
+def test_released_connection_is_reused():
+    """Test that a released connection is handed out again instead of opening a new one"""
+    pool = make_pool()
+    first = pool.acquire(connect, check)
+    pool.release(first)
+
+    assert pool.acquire(connect, check) is first
+    assert pool.stats["created"] == 1
+    assert pool.stats["reused"] == 1
+
+def test_acquire_times_out_when_pool_is_exhausted():
+    """Test that a request waits at most the pool timeout for a free connection"""
+    pool = make_pool(max_size=1)
+    pool.acquire(connect, check)
+
+    with pytest.raises(PoolTimeout):
+        pool.acquire(connect, check)
+    assert pool.size == 1
+
+def test_waiting_request_gets_released_connection():
+    """Test that a waiting request is woken up when a connection is released"""
+    pool = make_pool(max_size=1, timeout=5)
+    held = pool.acquire(connect, check)
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(connect, check)))
+
+    waiter.start()
+    pool.release(held)
+    waiter.join(timeout=5)
+
+    assert acquired == [held]
+
+def test_unusable_and_old_connections_are_replaced():
+    """Test that connections failing the check or past the recycle age are discarded"""
+    pool = make_pool(check_interval=0)
+    broken = pool.acquire(connect, check)
+    pool.release(broken)
+    broken.close()
+
+    replacement = pool.acquire(connect, check)
+    pool.release(replacement)
+    recycling = make_pool(recycle=0)
+    old = recycling.acquire(connect, check)
+    recycling.release(old)
+
+    assert replacement is not broken
+    assert pool.stats["discarded"] == 1
+    assert recycling.acquire(connect, check) is not old
+
+def test_release_rolls_back_open_transaction():
+    """Test that uncommitted work is rolled back before a connection is reused"""
+    pool = make_pool()
+    conn = pool.acquire(connect, check)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")
+
+    pool.release(conn)
+
+    assert pool.acquire(connect, check).execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+
+@pytest.mark.django_db
+def test_backend_returns_connections_to_pool(tmp_path):
+    """Test that closing the pooled backend keeps the connection for the next request"""
+    settings_dict = {**connection.settings_dict, "NAME": str(tmp_path / "pool.sqlite3"), "POOL": {"MAX_SIZE": 1}}
+    wrapper = DatabaseWrapper(settings_dict, alias="pooled-test")
+    wrapper.ensure_connection()
+    raw = wrapper.connection
+
+    wrapper.close()
+    wrapper.ensure_connection()
+
+    assert wrapper.connection is raw
+    assert wrapper.pool.stats["created"] == 1
+    wrapper.close()
+    wrapper.pool.close()
+    assert wrapper.pool.size == 0
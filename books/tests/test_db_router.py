@@ -0,0 +1,110 @@
+import threading
+import time
+import pytest
+from django.db import connections, router
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from books.models import Book
+from config.db_router import ReplicaMonitor, replica_monitor
+
+
+@pytest.fixture
+def replica(transactional_db, tmp_path, settings):
+    """Add a SQLite file standing in for a replica of the (in-memory) primary"""
+    connections["replica"] = DatabaseWrapper(
+        {**connections["default"].settings_dict, "NAME": str(tmp_path / "replica.sqlite3")}, alias="replica"
+    )
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.DATABASE_REPLICA_CHECK_INTERVAL = 3600  # lags only change through explicit checks
+    replica_monitor.reset()
+    yield "replica"
+    replica_monitor.reset()
+    connections["replica"].close()
+    del connections["replica"]
+
+def replicate():
+    """Copy the primary over the replica, as replication would"""
+    replica_monitor.check()  # writes the heartbeat that travels with the copy
+    for alias in ("default", "replica"):
+        connections[alias].ensure_connection()
+    connections["default"].connection.backup(connections["replica"].connection)
+    replica_monitor.check()
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+def listed_titles(client):
+    return {book["title"] for book in client.get(reverse("books-list")).data["results"]}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_go_to_replica(replica, create_reader_user, create_books):
+    """Test that safe-method catalog reads are served by the replica"""
+    replicate()
+    Book.objects.create(title="Sin replicar", author="Autor")
+
+    assert listed_titles(client_for(create_reader_user)) == {"Libro 1", "Libro 2"}
+    assert router.db_for_read(Book) == "default"  # outside a request
+
+@pytest.mark.django_db(transaction=True)
+def test_writer_reads_own_writes(replica, create_editor_user, create_reader_user, create_books):
+    """Test that a client that wrote reads from the primary during the pin window"""
+    replicate()
+    editor, reader = client_for(create_editor_user), client_for(create_reader_user)
+
+    response = editor.post(reverse("books-list"), {"title": "Nuevo", "author": "Autor"}, format="json")
+
+    assert response.status_code == 201
+    assert Book.objects.using("replica").filter(title="Nuevo").count() == 0
+    assert "Nuevo" in listed_titles(editor)
+    assert "Nuevo" not in listed_titles(reader)
+
+@pytest.mark.django_db(transaction=True)
+def test_lagging_replica_is_taken_out_of_rotation(replica, create_reader_user, create_books):
+    """Test that a replica behind by more than the maximum lag is not read from"""
+    replicate()
+    Book.objects.create(title="Sin replicar", author="Autor")
+    with connections["replica"].cursor() as cursor:
+        cursor.execute("UPDATE config_replicationheartbeat SET beat = %s", [time.time() - 60])
+    replica_monitor.check()
+
+    assert "Sin replicar" in listed_titles(client_for(create_reader_user))
+    assert replica_monitor.lags["replica"] >= 60
+
+@pytest.mark.django_db(transaction=True)
+def test_unreachable_replica_is_taken_out_of_rotation(replica, create_reader_user, create_books):
+    """Test that a replica without the heartbeat table (or down) falls back to the primary"""
+    replica_monitor.check()
+    assert listed_titles(client_for(create_reader_user)) == {"Libro 1", "Libro 2"}
+    assert replica_monitor.lags["replica"] is None
+
+def test_replicas_are_never_written_or_migrated(settings):
+    """Test that writes go to the primary and replicas are left to replication"""
+    settings.DATABASE_REPLICAS = ["replica"]
+
+    assert router.db_for_write(Book) == "default"
+    assert router.allow_migrate("replica", "books") is False
+    assert router.allow_migrate("default", "books") is True
+
+def test_stale_lags_are_refreshed_in_the_background(settings):
+    """Test that a read never waits for a replica check and is answered from the last known lags"""
+    settings.DATABASE_REPLICAS = ["replica"]
+    monitor = ReplicaMonitor()
+    monitor.lags = {"replica": 0.5}
+    started, release = threading.Event(), threading.Event()
+
+    def slow_check():
+        started.set()
+        release.wait(5)
+        monitor.lags = {"replica": None}
+
+    monitor.check = slow_check
+
+    assert monitor.healthy_replicas() == ["replica"]
+    assert started.wait(5)
+    assert monitor.healthy_replicas() == ["replica"]  # a single check runs at a time
+    release.set()
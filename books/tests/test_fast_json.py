@@ -0,0 +1,75 @@
+import io
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+import pytest
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+from config import renderers
+from config.parsers import FastJSONParser
+from config.renderers import FastJSONRenderer
+
+PAYLOAD = {
+    "title": "Año nuevo \u2028 línea \u2029 párrafo",
+    "created_at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+    "price": Decimal("9.50"),
+    "label": gettext_lazy("Libros"),
+    "results": [ReturnDict({"id": 1, "content": "x" * 3000, "ratio": 0.1}, serializer=None)],
+}
+
+
+@pytest.mark.parametrize("fast_library", [True, False])
+def test_renderer_matches_drf(monkeypatch, fast_library):
+    """Test that the fast renderer produces DRF's bytes, with and without orjson"""
+    if not fast_library:
+        monkeypatch.setattr(renderers, "orjson", None)
+
+    assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+def test_renderer_falls_back_for_indent_and_unsupported_data():
+    """Test that indented output and non-string keys are rendered by the stdlib"""
+    indented = "application/json; indent=4"
+    data = {1: "uno", "big": 2 ** 70}
+
+    assert FastJSONRenderer().render(PAYLOAD, indented) == JSONRenderer().render(PAYLOAD, indented)
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+def test_renderer_float_formatting():
+    """Test that floats written in another form by orjson decode to DRF's values, and NaN becomes null"""
+    if renderers.orjson is None:
+        pytest.skip("orjson is not installed")
+    data = {"scores": [1e-05, 0.1, 1e16, 123456789.123, 5.0]}
+
+    assert json.loads(FastJSONRenderer().render(data)) == json.loads(JSONRenderer().render(data))
+    assert FastJSONRenderer().render({"score": 1e-05}) == b'{"score":0.00001}'
+    assert FastJSONRenderer().render({"score": float("nan")}) == b'{"score":null}'
+    with pytest.raises(ValueError):
+        JSONRenderer().render({"score": float("nan")})
+
+def test_parser_matches_drf_and_rejects_invalid_json():
+    """Test that the fast parser decodes like DRF's and raises ParseError on bad input"""
+    body = json.dumps({"title": "Título", "pages": [{"page_number": 1, "content": "ñ"}]}).encode()
+
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+    for invalid in (b'{"title": ', b'{"n": NaN}'):
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(invalid))
+
+@pytest.mark.django_db
+def test_api_uses_fast_json(api_client, create_editor_user):
+    """Test that the API parses requests and renders responses with the fast classes"""
+    api_client.force_authenticate(user=create_editor_user)
+
+    response = api_client.post(
+        reverse("books-list"),
+        json.dumps({"title": "Libro rápido", "author": "Autora", "pages": [{"page_number": 1, "content": "Hola"}]}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 201
+    assert isinstance(response.accepted_renderer, FastJSONRenderer)
+    assert response.content == JSONRenderer().render(response.data)
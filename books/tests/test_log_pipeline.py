@@ -0,0 +1,64 @@
+import json
+import logging
+import queue
+from config.log import JSONFormatter, QueueHandler, SamplingFilter, summarize_payload
+
+
+def make_record(name="books.views.book_view", level=logging.INFO, msg="Retrieved %s pages", args=(3,), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    """Records are written as one JSON object with the interpolated message and extras"""
+    line = JSONFormatter().format(make_record(metrics={"queries": 2}))
+    data = json.loads(line)
+    assert data["message"] == "Retrieved 3 pages"
+    assert data["level"] == "INFO"
+    assert data["logger"] == "books.views.book_view"
+    assert data["metrics"] == {"queries": 2}
+
+
+def test_sampling_filter_drops_info_of_sampled_loggers_only():
+    """INFO of a sampled logger (and its children) is dropped; warnings and other loggers are kept"""
+    sampling = SamplingFilter({"books.views.book_page_view": 0.0})
+    assert not sampling.filter(make_record(name="books.views.book_page_view"))
+    assert not sampling.filter(make_record(name="books.views.book_page_view.child"))
+    assert sampling.filter(make_record(name="books.views.book_page_view", level=logging.WARNING))
+    assert sampling.filter(make_record(name="books.views.book_view"))
+
+
+def test_queue_handler_enqueues_prepared_records():
+    """The queue handler interpolates the message and does not write anything itself"""
+    handler = QueueHandler()
+    handler.queue = queue.SimpleQueue()  # keep the record away from the running listener
+    handler.handle(make_record())
+    record = handler.queue.get_nowait()
+    assert record.msg == "Retrieved 3 pages"
+    assert record.args is None
+
+
+def test_payload_summary_omits_content():
+    """A book payload is logged as field names, page count, size and hash, never as content"""
+    payload = {"title": "Libro", "author": "Autor", "pages": [{"page_number": 1, "content": "ñ" * 5000}]}
+    summary = summarize_payload(payload, max_bytes=64)
+
+    data = summary.summarize()
+    assert data["fields"] == ["author", "pages", "title"]
+    assert data["pages"] == 1
+    assert data["bytes"] > 10000
+    assert data["truncated"]
+    assert "ñ" not in str(summary)
+    assert str(summary) == str(summarize_payload(payload, max_bytes=64))
+
+
+def test_payload_summary_redacts_secrets():
+    """Passwords and tokens are left out of the summary: changing them does not change what is logged"""
+    signup = {"email": "lector@example.com", "password": "hunter22", "role": "reader"}
+    changed = dict(signup, password="correct horse battery staple")
+
+    assert str(summarize_payload(signup)) == str(summarize_payload(changed))
+    assert summarize_payload(signup).summarize()["fields"] == ["email", "password", "role"]
+    assert str(summarize_payload({"refresh": "a.b.c"})) == str(summarize_payload({"refresh": "x.y.z"}))
+    assert str(summarize_payload({"user": {"new_password": "1"}})) == str(summarize_payload({"user": {"new_password": "2"}}))
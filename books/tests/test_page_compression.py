@@ -0,0 +1,78 @@
+import io
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from books import compression
+from books.models import Book, BookPage, CompressionDictionary
+
+TEXT = ("En el principio era el Verbo, y el Verbo era con Dios, y el Verbo era Dios. " * 20).strip()
+
+
+@pytest.fixture(autouse=True)
+def reset_compression():
+    compression.reset()
+    yield
+    compression.reset()
+
+
+def stored_content(page_id):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT content FROM books_bookpage WHERE id = %s", [page_id])
+        return bytes(cursor.fetchone()[0])
+
+@pytest.mark.parametrize("codec", [compression.ZLIB, compression.ZSTD])
+def test_round_trip_with_dictionary(codec):
+    """Test that text survives compression with and without a trained dictionary"""
+    samples = [f"Página {i}: {TEXT}" for i in range(200)]
+    dictionary = compression.train_dictionary(samples, codec, size=4096)
+    plain = compression.Compressor(codec)
+    trained = compression.Compressor(codec, dictionary_id=7, dictionary=dictionary)
+
+    value = trained.compress(samples[3])
+
+    assert dictionary
+    assert compression.decompress(plain.compress(samples[3])) == samples[3]
+    assert compression.decompress(value, {7: dictionary}.get) == samples[3]
+    assert len(value) < len(samples[3].encode("utf-8")) // 4
+
+def test_short_text_is_stored_raw():
+    """Test that text below the minimum size is not compressed"""
+    value = compression.Compressor(compression.ZSTD).compress("Hola")
+
+    assert value == b"\x00Hola"
+    assert compression.decompress(value) == "Hola"
+
+@pytest.mark.django_db
+def test_pages_are_stored_compressed(api_client, create_editor_user):
+    """Test that the API reads and writes text while the column holds compressed bytes"""
+    api_client.force_authenticate(user=create_editor_user)
+    pages = [{"page_number": 1, "content": TEXT}, {"page_number": 2, "content": "Breve"}]
+    book_id = api_client.post(reverse("books-list"), {"title": "Juan", "author": "Juan", "pages": pages}, format="json").data["id"]
+
+    page = BookPage.objects.get(book_id=book_id, page_number=1)
+    listed = api_client.get(reverse("books-list")).data["results"][0]
+
+    assert page.content == TEXT
+    assert page.content_size == len(TEXT)
+    assert len(stored_content(page.id)) < len(TEXT) // 4
+    assert api_client.get(reverse("bookpage-list", args=[book_id])).data["results"][0]["content"] == TEXT
+    assert listed["total_size"] == len(TEXT) + len("Breve")
+
+@pytest.mark.django_db
+def test_recompress_command_trains_dictionary(create_editor_user):
+    """Test that recompression with a new dictionary keeps every page readable"""
+    book = Book.objects.create(title="Muchas", author="Autor")
+    BookPage.objects.bulk_create(
+        BookPage(book=book, page_number=i, content=f"Página {i}. {TEXT}") for i in range(1, 151)
+    )
+    before = stored_content(BookPage.objects.get(book=book, page_number=5).id)
+
+    call_command("recompress_pages", "--train", "--batch-size", "40", stdout=io.StringIO())
+
+    dictionary = CompressionDictionary.objects.get()
+    page = BookPage.objects.get(book=book, page_number=5)
+    after = stored_content(page.id)
+    assert page.content == f"Página 5. {TEXT}"
+    assert after[1:5] == dictionary.id.to_bytes(4, "big")
+    assert len(after) < len(before)
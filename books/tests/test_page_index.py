@@ -0,0 +1,98 @@
+import os
+import pytest
+from django.urls import reverse
+from books.models import BookPage
+from books.repositories.search_repository import SearchRepository
+from books.page_index import PageIndex, get_page_index, tokenize
+
+PAGES = [
+    (1, 1, "Un laberinto de símbolos, un invisible laberinto de tiempo."),
+    (1, 2, "El jardín de senderos que se bifurcan."),
+    (2, 1, "El espía se detuvo frente a la casa del sinólogo."),
+    (2, 2, "Tiempo y laberinto en la casa de Albert."),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "pages.idx")
+    PageIndex.build(PAGES, path)
+    return PageIndex(path)
+
+def test_tokenize_folds_case_and_diacritics():
+    """Test that terms are lower-cased and stripped of accents"""
+    assert tokenize("Página del JARDÍN, 2") == ["pagina", "del", "jardin", "2"]
+
+def test_boolean_and_phrase_queries(index):
+    """Test implicit AND, OR, negation and phrases against the memory-mapped file"""
+    assert index.search("laberinto tiempo") == [(1, 1), (2, 2)]
+    assert index.search("laberinto -albert") == [(1, 1)]
+    assert index.search("espía OR jardin") == [(1, 2), (2, 1)]
+    assert index.search('"jardín de senderos"') == [(1, 2)]
+    assert index.search('"senderos de jardín"') == []
+    assert index.search("NOT laberinto") == []
+    assert index.search("inexistente") == []
+
+def test_incremental_updates(index):
+    """Test that updated and deleted pages are reflected before the file is rebuilt"""
+    index.update_page(1, 2, "Tlön, Uqbar, Orbis Tertius")
+    index.update_page(3, 1, "Otro jardín")
+    index.remove_book(2)
+
+    assert index.search("jardín") == [(3, 1)]
+    assert index.search("uqbar") == [(1, 2)]
+    assert index.search("laberinto") == [(1, 1)]
+    assert index.pending == 2
+
+def test_reload(index, tmp_path):
+    """Test that a newer build replaces the delta entries it covers and keeps the later ones"""
+    index.update_page(6, 1, "Indexada antes de la reconstrucción")
+    PageIndex.build(PAGES, index.path)
+    index.update_page(5, 1, "Funes el memorioso")
+    os.utime(index.path, (0, 0))
+    index.reload()
+
+    assert index.search("sinólogo") == [(2, 1)]
+    assert index.search("funes") == [(5, 1)]
+    assert index.search("reconstrucción") == []
+
+@pytest.mark.django_db
+def test_signals_update_index(api_client, create_editor_user, settings, tmp_path, django_capture_on_commit_callbacks):
+    """Test that pages created, saved and deleted through the ORM reach the in-process index"""
+    settings.PAGE_INDEX_PATH = str(tmp_path / "pages.idx")
+    api_client.force_authenticate(user=create_editor_user)
+    book = {"title": "Ficciones", "author": "Borges", "pages": [{"page_number": 1, "content": "Funes el memorioso"}]}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        book_id = api_client.post(reverse("books-list"), book, format="json").data["id"]
+    assert get_page_index().search("memorioso") == [(book_id, 1)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        page = BookPage.objects.get(book_id=book_id, page_number=1)
+        page.content = "La biblioteca de Babel"
+        page.save()
+    assert get_page_index().search("memorioso OR babel") == [(book_id, 1)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.delete(reverse("books-detail", args=[book_id]))
+    assert get_page_index().search("babel") == []
+
+@pytest.mark.django_db
+def test_search_falls_back_to_page_index(api_client, create_editor_user, settings, tmp_path, monkeypatch,
+                                         django_capture_on_commit_callbacks):
+    """Test that the search endpoint is served by the page index where the database has no full-text engine"""
+    settings.PAGE_INDEX_PATH = str(tmp_path / "pages.idx")
+    monkeypatch.setattr(SearchRepository, "is_supported", staticmethod(lambda connection=None: False))
+    api_client.force_authenticate(user=create_editor_user)
+    book = {"title": "Ficciones", "author": "Borges", "pages": [
+        {"page_number": 1, "content": "Funes el memorioso"}, {"page_number": 2, "content": "La lotería en Babilonia"},
+    ]}
+    with django_capture_on_commit_callbacks(execute=True):
+        book_id = api_client.post(reverse("books-list"), book, format="json").data["id"]
+
+    results = api_client.get(reverse("books-search"), {"q": "memorioso"}).data
+    by_author = api_client.get(reverse("books-search"), {"q": "borges"}).data
+
+    assert [result["id"] for result in results] == [book_id]
+    assert results[0]["pages"] == [{"page_number": 1, "score": 1.0, "snippet": "Funes el <mark>memorioso</mark>"}]
+    assert [result["id"] for result in by_author] == [book_id] and by_author[0]["pages"] == []
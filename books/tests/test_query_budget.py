@@ -0,0 +1,106 @@
+import pytest
+from django.urls import reverse
+from books.models import Book, BookPage
+
+# Maximum number of SQL queries each read endpoint may issue. A regression that
+# reintroduces a redundant `exists()`/`count()` or an N+1 pattern fails here.
+BOOK_LIST_CURSOR_BUDGET = 1
+BOOK_LIST_OFFSET_BUDGET = 2
+BOOK_DETAIL_BUDGET = 3
+PAGE_LIST_CURSOR_BUDGET = 2
+PAGE_LIST_OFFSET_BUDGET = 3
+PAGE_DETAIL_BUDGET = 2
+
+
+@pytest.fixture
+def catalog(db, create_editor_user):
+    """Create several books with pages so the budgets are checked against real data"""
+    books = []
+    for i in range(12):
+        book = Book.objects.create(title=f"Libro {i}", author="Autor")
+        BookPage.objects.bulk_create(
+            BookPage(book=book, page_number=n, content=f"Contenido {n}") for n in range(1, 16)
+        )
+        books.append(book)
+    return books
+
+
+@pytest.mark.django_db
+def test_book_list_cursor_budget(api_client, create_reader_user, catalog, django_assert_max_num_queries):
+    """The cursor-paginated book list is a single query, on every page"""
+    api_client.force_authenticate(user=create_reader_user)
+    with django_assert_max_num_queries(BOOK_LIST_CURSOR_BUDGET):
+        response = api_client.get(reverse("books-list"))
+    assert response.status_code == 200
+
+    with django_assert_max_num_queries(BOOK_LIST_CURSOR_BUDGET):
+        response = api_client.get(response.data["next"])
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_book_list_offset_budget(api_client, create_reader_user, catalog, django_assert_max_num_queries):
+    """Offset mode adds only the paginator's COUNT(*)"""
+    api_client.force_authenticate(user=create_reader_user)
+    with django_assert_max_num_queries(BOOK_LIST_OFFSET_BUDGET):
+        response = api_client.get(reverse("books-list"), {"page": 2})
+    assert response.status_code == 200
+    assert response.data["count"] == len(catalog)
+
+
+@pytest.mark.django_db
+def test_book_list_empty_budget(api_client, create_reader_user, django_assert_max_num_queries):
+    """An empty catalog is detected from the page itself, without an extra exists()"""
+    api_client.force_authenticate(user=create_reader_user)
+    with django_assert_max_num_queries(BOOK_LIST_CURSOR_BUDGET):
+        response = api_client.get(reverse("books-list"))
+    assert response.status_code == 204
+
+
+@pytest.mark.django_db
+def test_book_detail_budget(api_client, create_reader_user, catalog, django_assert_max_num_queries):
+    """A cold book detail costs version + book + pages; a warm one hits no table"""
+    api_client.force_authenticate(user=create_reader_user)
+    url = reverse("books-detail", args=[catalog[0].id])
+    with django_assert_max_num_queries(BOOK_DETAIL_BUDGET):
+        assert api_client.get(url).status_code == 200
+    with django_assert_max_num_queries(0):
+        assert api_client.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_page_list_budget(api_client, create_reader_user, catalog, django_assert_max_num_queries):
+    """The page list costs the book version plus one page query (and COUNT(*) in offset mode)"""
+    api_client.force_authenticate(user=create_reader_user)
+    url = reverse("bookpage-list", args=[catalog[0].id])
+    with django_assert_max_num_queries(PAGE_LIST_CURSOR_BUDGET):
+        response = api_client.get(url)
+    assert response.status_code == 200
+
+    with django_assert_max_num_queries(PAGE_LIST_CURSOR_BUDGET - 1):
+        assert api_client.get(response.data["next"]).status_code == 200
+
+    with django_assert_max_num_queries(PAGE_LIST_OFFSET_BUDGET - 1):
+        response = api_client.get(url, {"page": 2})
+    assert response.data["count"] == 15
+
+
+@pytest.mark.django_db
+def test_page_list_empty_budget(api_client, create_reader_user, django_assert_max_num_queries):
+    """A book without pages answers 404 from the empty first page"""
+    api_client.force_authenticate(user=create_reader_user)
+    book = Book.objects.create(title="Sin páginas", author="Autor")
+    with django_assert_max_num_queries(PAGE_LIST_CURSOR_BUDGET):
+        response = api_client.get(reverse("bookpage-list", args=[book.id]))
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_page_detail_budget(api_client, create_reader_user, catalog, django_assert_max_num_queries):
+    """A cold single page costs the book version plus one page lookup"""
+    api_client.force_authenticate(user=create_reader_user)
+    url = reverse("bookpage-detail", args=[catalog[0].id, 3])
+    with django_assert_max_num_queries(PAGE_DETAIL_BUDGET):
+        assert api_client.get(url).status_code == 200
+    with django_assert_max_num_queries(0):
+        assert api_client.get(url).status_code == 200
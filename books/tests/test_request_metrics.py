@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import patch
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from books.models import Book
+from config.middleware import RequestMetricsMiddleware, sql_template
+
+
+@pytest.mark.django_db
+def test_server_timing_header(api_client, create_books, create_reader_user, settings):
+    """When enabled, every response carries the query count and the db/render/total timings"""
+    settings.REQUEST_METRICS_SERVER_TIMING = True
+    api_client.force_authenticate(user=create_reader_user)
+    response = api_client.get(reverse("books-list"))
+
+    metrics = response.wsgi_request.metrics
+    assert metrics.queries == 1
+    assert metrics.render_time > 0
+    assert metrics.total_time >= metrics.db_time + metrics.render_time
+    header = response["Server-Timing"]
+    assert 'db;dur=' in header and 'desc="1 queries"' in header
+    assert "render;dur=" in header and "total;dur=" in header
+
+
+@pytest.mark.django_db
+def test_server_timing_is_off_by_default(api_client, create_reader_user):
+    """Metrics are collected but not exposed to clients unless the header is enabled"""
+    api_client.force_authenticate(user=create_reader_user)
+    response = api_client.get(reverse("books-list"))
+    assert response.wsgi_request.metrics.queries == 1
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+def test_metrics_disabled(api_client, create_reader_user, settings):
+    """The middleware is a no-op when disabled"""
+    settings.REQUEST_METRICS_ENABLED = False
+    api_client.force_authenticate(user=create_reader_user)
+    response = api_client.get(reverse("books-list"))
+    assert "Server-Timing" not in response
+    assert not hasattr(response.wsgi_request, "metrics")
+
+
+@pytest.mark.django_db
+def test_repeated_queries_are_detected(create_books, settings):
+    """A sampled request that repeats one statement past the threshold reports it"""
+    settings.REQUEST_METRICS_SAMPLE_RATE = 1.0
+    settings.REQUEST_METRICS_N_PLUS_ONE_THRESHOLD = 3
+
+    def n_plus_one_view(request):
+        for book_id in range(1, 6):
+            Book.objects.filter(pk=book_id).first()
+        return HttpResponse("ok")
+
+    request = RequestFactory().get("/")
+    with patch("config.middleware.logger") as logger:
+        RequestMetricsMiddleware(n_plus_one_view)(request)
+
+    repeated = request.metrics.repeated_templates(3)
+    assert len(repeated) == 1 and repeated[0][1] == 5
+    logger.warning.assert_called_once()
+
+
+def test_sql_template_collapses_placeholder_lists():
+    """IN lists of different lengths map to the same template"""
+    assert sql_template("SELECT * FROM t WHERE id IN (%s, %s)") == sql_template("SELECT *  FROM t\nWHERE id IN (%s,%s,%s)")
@@ -0,0 +1,86 @@
+import gzip
+import json
+import brotli
+import pytest
+from unittest.mock import patch
+from django.urls import reverse
+from books.models import Book
+from config import content_encoding
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("br;q=0, *", "gzip"),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate(header, expected):
+    """Test that client q-values win and the server preference breaks ties"""
+    assert content_encoding.negotiate(header, ["br", "gzip"]) == expected
+
+def test_compress_stream_round_trip():
+    """Test that streamed chunks decode to the original body"""
+    chunks = [b"linea %d\n" % i for i in range(1000)]
+
+    assert gzip.decompress(b"".join(content_encoding.compress_stream(chunks, "gzip"))) == b"".join(chunks)
+    assert brotli.decompress(b"".join(content_encoding.compress_stream(chunks, "br"))) == b"".join(chunks)
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("encoding, decode", [("gzip", gzip.decompress), ("br", brotli.decompress)])
+def test_page_list_is_compressed(api_client, create_book_with_many_pages, encoding, decode):
+    """Test that the page list is sent compressed with the negotiated coding"""
+    api_client.force_authenticate(user=create_book_with_many_pages.author)
+    url = reverse("bookpage-list", args=[create_book_with_many_pages.id])
+    plain = api_client.get(url, {"page_size": 20})
+
+    response = api_client.get(url, {"page_size": 20}, HTTP_ACCEPT_ENCODING=encoding)
+
+    assert response["Content-Encoding"] == encoding
+    assert "Accept-Encoding" in response["Vary"]
+    assert response["ETag"] == "W/" + plain["ETag"]
+    assert int(response["Content-Length"]) == len(response.content) < len(plain.content)
+    assert decode(response.content) == plain.content
+
+@pytest.mark.django_db
+def test_cached_page_list_is_not_recompressed(api_client, create_book_with_many_pages):
+    """Test that a cache hit serves the stored compressed bytes without compressing again"""
+    api_client.force_authenticate(user=create_book_with_many_pages.author)
+    url = reverse("bookpage-list", args=[create_book_with_many_pages.id])
+    first = api_client.get(url, {"page_size": 20}, HTTP_ACCEPT_ENCODING="gzip")
+
+    with patch("config.content_encoding.compress", wraps=content_encoding.compress) as compress:
+        second = api_client.get(url, {"page_size": 20}, HTTP_ACCEPT_ENCODING="gzip")
+
+    assert compress.call_count == 0
+    assert second.content == first.content
+
+@pytest.mark.django_db
+def test_small_and_not_modified_responses_are_not_compressed(api_client, create_book_with_pages):
+    """Test that bodies under the minimum size and 304 responses are sent as is"""
+    api_client.force_authenticate(user=create_book_with_pages.author)
+    url = reverse("bookpage-detail", args=[create_book_with_pages.id, 1])
+    response = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+    not_modified = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"])
+
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response
+    assert response.json()["content"] == "Contenido de la página 1"
+    assert not_modified.status_code == 304
+    assert "Content-Encoding" not in not_modified
+
+@pytest.mark.django_db
+def test_other_responses_are_compressed_on_the_fly(api_client, create_reader_user):
+    """Test that responses without precompressed bytes are compressed per request"""
+    for i in range(20):
+        Book.objects.create(title=f"Libro {i}", author=f"Autor {i}")
+    api_client.force_authenticate(user=create_reader_user)
+
+    with patch("config.content_encoding.compress", wraps=content_encoding.compress) as compress:
+        response = api_client.get(reverse("books-list"), HTTP_ACCEPT_ENCODING="br")
+
+    assert compress.call_args.args[1:] == ("br",)
+    assert response["Content-Encoding"] == "br"
+    assert len(json.loads(brotli.decompress(response.content))["results"]) == 5
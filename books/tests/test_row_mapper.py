@@ -0,0 +1,89 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from books.models import Book, BookPage
+from books.repositories.book_repository import BookRepository
+from books.serializers.book_list_serializer import BookListSerializer
+from books.serializers.book_page_serializer import BookPageSerializer
+from books.serializers.book_serializer import BookSerializer
+from books.serializers.row_mapper import RowMapper
+from books.services.book_page_servicce import BookPageService
+from books.services.book_service import BookService
+
+
+@pytest.fixture
+def golden_books(db):
+    """Books with accented and multi-line pages (created out of order) and a book without pages"""
+    book = Book.objects.create(title="Cien años de soledad", author="Gabriel García Márquez")
+    for number in (3, 1, 2):
+        BookPage.objects.create(book=book, page_number=number, content=f"Página {number}\n«Macondo» — ñandú   fin")
+    empty = Book.objects.create(title="Sin páginas", author="Anónimo")
+    return book, empty
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+def test_book_list_rows_match_serializer(golden_books):
+    """Test that the list built from rows renders the same bytes as BookListSerializer"""
+    for ordering in ("title", "-created_at"):
+        books = BookRepository.get_all_books(BookRepository.SHAPE_SUMMARY, ordering=ordering).queryset
+        rows = BookService().get_book_rows(ordering=ordering)
+
+        assert render(BookService.book_list_data(rows)) == render(BookListSerializer(books, many=True).data)
+
+def test_book_detail_rows_match_serializer(golden_books):
+    """Test that the detail built from rows, with and without pages, renders the same bytes as BookSerializer"""
+    for book in golden_books:
+        data = BookService().get_book_data(book.id)
+
+        assert render(data) == render(BookSerializer(Book.objects.get(id=book.id)).data)
+
+def test_page_rows_match_serializer(golden_books):
+    """Test that page lists and single pages built from rows render the same bytes as BookPageSerializer"""
+    book, _ = golden_books
+    service = BookPageService()
+
+    assert render(service.page_list_data(service.get_book_page_rows(book.id))) == render(
+        BookPageSerializer(book.pages.all(), many=True).data
+    )
+    assert render(service.get_book_page(book.id, 2, prefetch=1)) == render(
+        BookPageSerializer(book.pages.get(page_number=2)).data
+    )
+
+def test_page_list_response_matches_serializer(api_client, golden_books, create_reader_user):
+    """Test that the page list endpoint returns the serializer's bytes"""
+    book, _ = golden_books
+    api_client.force_authenticate(user=create_reader_user)
+
+    response = api_client.get(reverse("bookpage-list", args=[book.id]))
+
+    assert response.status_code == 200
+    assert response.data["results"] == BookPageSerializer(book.pages.all(), many=True).data
+
+def test_row_mapper_rejects_unsupported_fields():
+    """Test that fields the row path cannot reproduce fail when the mapper is built"""
+    class ComputedSerializer(serializers.ModelSerializer):
+        title = serializers.SerializerMethodField()
+
+        class Meta:
+            model = Book
+            fields = ["id", "title"]
+
+    class DottedSerializer(serializers.ModelSerializer):
+        book_title = serializers.CharField(source="book.title")
+
+        class Meta:
+            model = BookPage
+            fields = ["page_number", "book_title"]
+
+    for serializer_class in (ComputedSerializer, DottedSerializer):
+        with pytest.raises(ImproperlyConfigured):
+            RowMapper(serializer_class)
+
+def test_row_mapper_many_rejects_nested_fields():
+    """Test that mapping several rows of a serializer with nested pages fails explicitly"""
+    with pytest.raises(ImproperlyConfigured):
+        RowMapper(BookSerializer).many([{"id": 1}])
@@ -1,23 +1,32 @@
 import logging
-from rest_framework import viewsets, status
+from django.conf import settings
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from asgiref.sync import sync_to_async
+from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import NotFound
 from drf_spectacular.utils import extend_schema_view
+from config.content_encoding import PrecompressedContent, PrecompressedResponse
+from config.pagination import KeysetPagination
+from config.viewsets import AsyncReadOnlyModelViewSet
 from books.services.book_page_servicce import BookPageService
 from books.serializers.book_page_serializer import BookPageSerializer
+from books.conditional import abook_pages_etag, abook_pages_last_modified, acondition, book_page_etag, book_pages_last_modified
 from books.docs import list_book_pages_docs, retrieve_book_page_docs, create_book_page_docs
 
 logger = logging.getLogger(__name__)
 
-class BookPagePagination(PageNumberPagination):
+class BookPagePagination(KeysetPagination):
     """
     Pagination settings for book pages.
 
     - `page_size`: Number of pages per request (default: 10).
     - `page_size_query_param`: Allows dynamic page size via query parameters.
     - `max_page_size`: Maximum number of pages per request.
+    - `ordering`: Keyset used by cursors (page numbers are unique within a book).
     """
+    ordering = ("page_number",)
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
@@ -25,12 +34,13 @@ class BookPagePagination(PageNumberPagination):
 @extend_schema_view(
     retrieve=retrieve_book_page_docs,  # Show `GET` method in Swagger
 )
-class BookPageViewSet(viewsets.ReadOnlyModelViewSet):
+class BookPageViewSet(AsyncReadOnlyModelViewSet):
     """
     ViewSet for retrieving and creating book pages with pagination and RBAC.
 
     This endpoint allows users to list the pages of a specific book
-    while applying pagination settings to optimize response size.
+    while applying pagination settings to optimize response size, or to
+    fetch a single page by its page number.
 
     - Editors can create pages.
     - Readers can only view pages.
@@ -38,6 +48,8 @@ class BookPageViewSet(viewsets.ReadOnlyModelViewSet):
 
     serializer_class = BookPageSerializer
     pagination_class = BookPagePagination
+    lookup_field = "page_number"
+    lookup_value_regex = r"\d+"
 
     def __init__(self, **kwargs):
         """
@@ -47,10 +59,19 @@ class BookPageViewSet(viewsets.ReadOnlyModelViewSet):
         self.page_service = BookPageService()
 
     @list_book_pages_docs
-    def list(self, request, book_id=None):
+    @acondition(etag_func=abook_pages_etag, last_modified_func=abook_pages_last_modified)
+    async def list(self, request, book_id=None):
         """
         Retrieves the paginated list of pages for a specific book.
 
+        Serialized batches are cached per book version and query string, and
+        conditional requests (`If-None-Match` / `If-Modified-Since`) are answered
+        with 304 Not Modified without loading any page. JSON batches are cached
+        rendered and already compressed (`PrecompressedContent`), so a cache hit
+        is served by `CompressionMiddleware` without rendering or compressing.
+        The view is async: pages are read with the async ORM and the batch is
+        compressed in a worker thread, off the event loop.
+
         :param request: The HTTP request object.
         :param book_id: The ID of the book whose pages are being retrieved.
         :return: A paginated response containing the book's pages.
@@ -58,22 +79,97 @@ class BookPageViewSet(viewsets.ReadOnlyModelViewSet):
         :raises Exception: If an unexpected server error occurs.
         """
         try:
-            logger.info(f"Fetching pages for book ID {book_id}")
-            pages = self.page_service.get_book_pages(book_id)
+            logger.info("Fetching pages for book ID %s", book_id)
+            params = f"{request.get_host()}?{request.query_params.urlencode()}"
+            if request.accepted_renderer.format == "json":
+                content = await self.page_service.aget_page_batch(
+                    book_id, f"{params}&{request.accepted_media_type}",
+                    lambda: self._render_page_batch(request, book_id),
+                )
+                return PrecompressedResponse(content)
+
+            data = await self.page_service.aget_page_batch(
+                book_id, params, lambda: self._build_page_batch(request, book_id)
+            )
+            return Response(data)
+
+        except NotFound as e:
+            logger.warning("Page retrieval failed: %s", e)
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.error("Unexpected error retrieving pages for book ID %s: %s", book_id, e)
+            return Response({"error": "Internal server error", "details": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def _build_page_batch(self, request, book_id):
+        """
+        Loads, paginates and serializes one batch of pages (used on cache misses).
 
-            if not pages.exists():
-                logger.warning(f"No pages found for book ID {book_id}")
-                raise NotFound("No pages available for this book")
+        :param request: The HTTP request object.
+        :param book_id: The ID of the book whose pages are being retrieved.
+        :return: The paginated response data.
+        :raises NotFound: If no pages are found for the specified book.
+        """
+        pages = self.page_service.get_book_page_rows(book_id)
 
-            paginator = self.pagination_class()
-            paginated_pages = paginator.paginate_queryset(pages, request)
-            logger.info(f"Retrieved {pages.count()} pages for book ID {book_id}")
+        paginator = self.pagination_class()
+        paginated_pages = await paginator.apaginate_queryset(pages.queryset, request)
+        pages.record_count(paginator.get_known_count())
 
-            return paginator.get_paginated_response(BookPageSerializer(paginated_pages, many=True).data)
+        if not paginated_pages and paginator.is_first_page():
+            logger.warning("No pages found for book ID %s", book_id)
+            raise NotFound("No pages available for this book")
+
+        logger.info("Retrieved %s of %s pages for book ID %s", len(paginated_pages), pages.describe_count(), book_id)
+
+        return paginator.get_paginated_response(self.page_service.page_list_data(paginated_pages)).data
+
+    async def _render_page_batch(self, request, book_id):
+        """
+        Builds one batch of pages and renders it with the negotiated renderer,
+        together with its compressed variants (used on cache misses).
+
+        :param request: The HTTP request object.
+        :param book_id: The ID of the book whose pages are being retrieved.
+        :return: A `PrecompressedContent` holding the rendered batch.
+        :raises NotFound: If no pages are found for the specified book.
+        """
+        renderer = request.accepted_renderer
+        body = renderer.render(
+            await self._build_page_batch(request, book_id), request.accepted_media_type, self.get_renderer_context()
+        )
+        return await sync_to_async(PrecompressedContent.build, thread_sensitive=False)(body, renderer.media_type)
+
+    @method_decorator(condition(etag_func=book_page_etag, last_modified_func=book_pages_last_modified))
+    def retrieve(self, request, book_id=None, page_number=None):
+        """
+        Retrieves a single page of a book by its page number.
+
+        The optional `prefetch` query parameter (up to `settings.BOOK_PAGE_PREFETCH_MAX`)
+        warms the cache with the following pages for sequential reading.
+
+        :param request: The HTTP request object.
+        :param book_id: The ID of the book containing the page.
+        :param page_number: The number of the page to retrieve.
+        :return: The page in JSON format.
+        :raises NotFound: If the book or the page does not exist.
+        :raises Exception: If an unexpected server error occurs.
+        """
+        try:
+            prefetch = int(request.query_params.get("prefetch", 0))
+        except ValueError:
+            return Response({"error": "prefetch must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        prefetch = max(0, min(prefetch, settings.BOOK_PAGE_PREFETCH_MAX))
+
+        try:
+            logger.info("Fetching page %s for book ID %s", page_number, book_id)
+            page = self.page_service.get_book_page(book_id, int(page_number), prefetch)
+            if page is None:
+                raise NotFound("Page not found")
+            return Response(page)
 
         except NotFound as e:
-            logger.warning(f"Page retrieval failed: {e}")
+            logger.warning("Page retrieval failed: %s", e)
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.error(f"Unexpected error retrieving pages for book ID {book_id}: {e}")
-            return Response({"error": "Internal server error", "details": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            logger.error("Unexpected error retrieving page %s for book ID %s: %s", page_number, book_id, e)
+            return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
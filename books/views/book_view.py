@@ -1,37 +1,57 @@
 import logging
-from rest_framework import viewsets, status
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.exceptions import NotFound, ValidationError
+from config.log import summarize_payload
+from config.pagination import KeysetPagination
+from config.viewsets import AsyncViewSet
+from books.repositories.book_repository import BookRepository
 from books.services.book_service import BookService
+from books.services.book_search_service import BookSearchService
+from books.services.catalog_import_service import CatalogImportService
+from books.services.catalog_export_service import CatalogExportService
+from books.parsers.ndjson_parser import NDJSONParser
 from books.serializers.book_serializer import BookSerializer
+from books.serializers.book_filter_serializer import BookFilterSerializer
+from books.serializers.book_search_serializer import BookSearchResultSerializer
 from books.permissions.book_permissions import IsEditorOrReadOnly
+from books.conditional import abook_etag, abook_last_modified, acondition
 from books.docs import (  
-    list_books_docs, retrieve_book_docs, create_book_docs, delete_book_docs, update_book_docs
+    list_books_docs, retrieve_book_docs, create_book_docs, delete_book_docs, update_book_docs,
+    bulk_import_books_docs, export_books_docs, search_books_docs, cache_stats_docs
 )
 
 logger = logging.getLogger(__name__)
 
-class BookPagination(PageNumberPagination):
+class BookPagination(KeysetPagination):
     """
     Pagination settings for books.
 
     - `page_size`: Number of books per request (default: 5).
     - `page_size_query_param`: Allows dynamic page size via query parameters.
     - `max_page_size`: Maximum number of books per request.
+    - `ordering`: Keyset used by cursors, newest books first unless the
+      request selects another of `BookRepository.ORDERINGS`.
     """
+    ordering = ("-created_at", "-id")
     page_size = 5
     page_size_query_param = "page_size"
     max_page_size = 100
 
-class BookViewSet(viewsets.ViewSet):
+class BookViewSet(AsyncViewSet):
     """
     ViewSet for managing books with RBAC (Role-Based Access Control) and pagination.
 
     Permissions:
     - Authenticated users can read books.
     - Only editors can create, update, and delete books.
+
+    `list` and `retrieve` are async and read through the async ORM, so under
+    ASGI a request waiting on the database does not hold a thread.
     """
 
     serializer_class = BookSerializer
@@ -44,39 +64,62 @@ class BookViewSet(viewsets.ViewSet):
         """
         super().__init__(**kwargs)
         self.book_service = BookService()
+        self.import_service = CatalogImportService()
+        self.search_service = BookSearchService()
 
     @list_books_docs
-    def list(self, request):
+    async def list(self, request):
         """
-        Retrieves a paginated list of books.
+        Retrieves a paginated list of books in their summary representation (without pages).
+
+        Query parameters (see `BookFilterSerializer`):
+        - `author`, `title_prefix`, `created_after`/`created_before`, `updated_after`/`updated_before`.
+        - `ordering`: one of `BookRepository.ORDERINGS` (default `-created_at`).
 
         :param request: The HTTP request object.
         :return: A paginated response containing the list of books.
         :raises Exception: If an unexpected server error occurs.
         """
+        params = BookFilterSerializer(data=request.query_params)
+        if not params.is_valid():
+            logger.warning("Book list failed: invalid parameters %s", params.errors)
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        filters = dict(params.validated_data)
+        ordering = filters.pop("ordering")
+
         try:
-            logger.info("Fetching list of books")
-            books = self.book_service.get_books()
+            logger.info("Fetching list of books (filters=%s, ordering=%s)", sorted(filters), ordering)
+            books = self.book_service.get_book_rows(filters=filters, ordering=ordering)
 
-            if not books.exists():
+            paginator = self.pagination_class()
+            paginator.ordering = BookRepository.ORDERINGS[ordering]
+            paginated_books = await paginator.apaginate_queryset(books.queryset, request)
+            books.record_count(paginator.get_known_count())
+
+            if not paginated_books and paginator.is_first_page():
                 logger.warning("No books found in the database")
                 return Response({"message": "No books available"}, status=status.HTTP_204_NO_CONTENT)
 
-            paginator = self.pagination_class()
-            paginated_books = paginator.paginate_queryset(books, request)
-            logger.info(f"Retrieved {books.count()} books")
+            logger.info("Retrieved %s of %s books", len(paginated_books), books.describe_count())
 
-            return paginator.get_paginated_response(BookSerializer(paginated_books, many=True).data)
+            return paginator.get_paginated_response(self.book_service.book_list_data(paginated_books))
 
+        except NotFound as e:
+            logger.warning("Book list failed: %s", e)
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.error(f"Unexpected error fetching books: {e}")
+            logger.error("Unexpected error fetching books: %s", e)
             return Response({"error": "Internal server error", "details": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @retrieve_book_docs
-    def retrieve(self, request, pk=None):
+    @acondition(etag_func=abook_etag, last_modified_func=abook_last_modified)
+    async def retrieve(self, request, pk=None):
         """
         Retrieves a book by its ID.
 
+        Supports conditional requests: `If-None-Match` / `If-Modified-Since`
+        matching the book's `ETag` / `Last-Modified` return 304 Not Modified.
+
         :param request: The HTTP request object.
         :param pk: The ID of the book to retrieve.
         :return: The book details in JSON format.
@@ -84,15 +127,15 @@ class BookViewSet(viewsets.ViewSet):
         :raises Exception: If an unexpected server error occurs.
         """
         try:
-            logger.info(f"Fetching book with ID {pk}")
-            book = self.book_service.get_book_by_id(pk)
-            logger.info(f"Book retrieved successfully: ID {pk}")
-            return Response(BookSerializer(book).data)
+            logger.info("Fetching book with ID %s", pk)
+            data = await self.book_service.aget_book_data(pk)
+            logger.info("Book retrieved successfully: ID %s", pk)
+            return Response(data)
         except NotFound:
-            logger.warning(f"Book not found: ID {pk}")
+            logger.warning("Book not found: ID %s", pk)
             return Response({"error": "Book not found"}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.error(f"Unexpected error retrieving book ID {pk}: {e}")
+            logger.error("Unexpected error retrieving book ID %s: %s", pk, e)
             return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @create_book_docs
@@ -106,15 +149,15 @@ class BookViewSet(viewsets.ViewSet):
         :raises Exception: If an unexpected server error occurs.
         """
         try:
-            logger.info(f"Creating book with data: {request.data}")
+            logger.info("Creating book: %s", summarize_payload(request.data))
             book = self.book_service.create_book(request.data)
-            logger.info(f"Book created successfully: ID {book.id}, Title: {book.title}")
+            logger.info("Book created successfully: ID %s, Title: %s", book.id, book.title)
             return Response(BookSerializer(book).data, status=status.HTTP_201_CREATED)
         except ValidationError as e:
-            logger.warning(f"Book creation failed (validation error): {e}")
+            logger.warning("Book creation failed (validation error): %s", e)
             return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Unexpected error creating book: {e}")
+            logger.error("Unexpected error creating book: %s", e)
             return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @update_book_docs
@@ -130,18 +173,18 @@ class BookViewSet(viewsets.ViewSet):
         :raises Exception: If an unexpected server error occurs.
         """
         try:
-            logger.info(f"Updating book with ID {pk}")
+            logger.info("Updating book with ID %s: %s", pk, summarize_payload(request.data))
             book = self.book_service.update_book(pk, request.data)
-            logger.info(f"Book updated successfully: ID {book.id}, Title: {book.title}")
+            logger.info("Book updated successfully: ID %s, Title: %s", book.id, book.title)
             return Response(BookSerializer(book).data, status=status.HTTP_200_OK)
         except NotFound:
-            logger.warning(f"Book update failed: ID {pk} not found")
+            logger.warning("Book update failed: ID %s not found", pk)
             return Response({"error": "Book not found"}, status=status.HTTP_404_NOT_FOUND)
         except ValidationError as e:
-            logger.warning(f"Book update failed (validation error): {e}")
+            logger.warning("Book update failed (validation error): %s", e)
             return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Unexpected error updating book ID {pk}: {e}")
+            logger.error("Unexpected error updating book ID %s: %s", pk, e)
             return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @delete_book_docs
@@ -156,13 +199,116 @@ class BookViewSet(viewsets.ViewSet):
         :raises Exception: If an unexpected server error occurs.
         """
         try:
-            logger.info(f"Deleting book with ID {pk}")
+            logger.info("Deleting book with ID %s", pk)
             self.book_service.delete_book(pk)
-            logger.info(f"Book deleted successfully: ID {pk}")
+            logger.info("Book deleted successfully: ID %s", pk)
             return Response(status=status.HTTP_204_NO_CONTENT)
         except NotFound:
-            logger.warning(f"Book deletion failed: ID {pk} not found")
+            logger.warning("Book deletion failed: ID %s not found", pk)
             return Response({"error": "Book not found"}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.error(f"Unexpected error deleting book ID {pk}: {e}")
+            logger.error("Unexpected error deleting book ID %s: %s", pk, e)
+            return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @bulk_import_books_docs
+    @action(detail=False, methods=["post"], url_path="bulk", parser_classes=[NDJSONParser])
+    def bulk(self, request):
+        """
+        Imports books in bulk from a newline-delimited JSON body.
+
+        Each line holds one book payload in the same format accepted by `create`.
+        The body is streamed and written in chunks.
+
+        :param request: The HTTP request whose body is NDJSON.
+        :return: An import report with created/failed counts and per-line errors.
+        :raises Exception: If an unexpected server error occurs.
+        """
+        try:
+            logger.info("Starting bulk book import")
+            report = self.import_service.import_lines(request.data)
+            logger.info("Bulk book import finished: %s created, %s failed", report['created'], report['failed'])
+            return Response(report, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error("Unexpected error importing books: %s", e)
+            return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @export_books_docs
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        Streams the whole catalog as NDJSON or CSV.
+
+        Query parameters:
+        - `file_format`: `ndjson` (default) or `csv`.
+        - `include_pages`: `true` to include page content.
+
+        :param request: The HTTP request object.
+        :return: A streaming response with the exported catalog.
+        :raises Exception: If an unexpected server error occurs.
+        """
+        file_format = request.query_params.get("file_format", "ndjson")
+        include_pages = request.query_params.get("include_pages", "").lower() in ("1", "true", "yes")
+
+        if file_format not in CatalogExportService.FORMATS:
+            logger.warning("Catalog export failed: unknown format %s", file_format)
+            return Response(
+                {"error": f"Unknown format. Use one of: {', '.join(CatalogExportService.FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            logger.info("Exporting catalog as %s (include_pages=%s)", file_format, include_pages)
+            export_service = CatalogExportService()
+            response = StreamingHttpResponse(
+                export_service.export(file_format, include_pages),
+                content_type=CatalogExportService.CONTENT_TYPES[file_format],
+            )
+            response["Content-Disposition"] = f'attachment; filename="catalog.{file_format}"'
+            return response
+        except Exception as e:
+            logger.error("Unexpected error exporting catalog: %s", e)
             return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @search_books_docs
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """
+        Full-text search over book titles, authors and page content.
+
+        Query parameters:
+        - `q`: the text to search for.
+        - `limit`: maximum number of books returned (capped by `BOOK_SEARCH_MAX_RESULTS`).
+
+        :param request: The HTTP request object.
+        :return: The matching books, best first, with their matching pages and snippets.
+        :raises Exception: If an unexpected server error occurs.
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "The q parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get("limit", settings.BOOK_SEARCH_MAX_RESULTS))
+            if limit < 1:
+                raise ValueError(limit)
+        except ValueError:
+            return Response({"error": "limit must be a positive integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = self.search_service.search(query, min(limit, settings.BOOK_SEARCH_MAX_RESULTS))
+            return Response(BookSearchResultSerializer(results, many=True).data, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error("Unexpected error searching books for %r: %s", query, e)
+            return Response({"error": "Internal server error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @cache_stats_docs
+    @action(detail=False, methods=["get"], url_path="cache-stats", permission_classes=[IsAuthenticated, IsAdminUser])
+    def cache_stats(self, request):
+        """
+        Returns the hit, miss and eviction counters of the catalog cache.
+
+        Counters are per server process.
+
+        :param request: The HTTP request object.
+        :return: JSON with the cache counters and backend.
+        """
+        return Response(self.book_service.cache.stats())
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ConfigConfig(AppConfig):
+    name = 'config'
+    verbose_name = "Project configuration"
+
+    def ready(self):
+        from config.log import start_listener
+        start_listener()
@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Each request runs its ORM calls in a thread of its own, so a persistent
+# connection would only stay open, unused, until its thread is gone: close
+# connections at the end of every request (DB_POOL_SIZE enables reuse).
+os.environ['DB_CONN_MAX_AGE'] = '0'
 
 application = get_asgi_application()
@@ -0,0 +1,11 @@
+from django.db.backends.mysql import base
+from config.db_pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    The MySQL backend with connections kept in a per-process `ConnectionPool`.
+    """
+
+    def check_pooled_connection(self, connection):
+        connection.ping()
@@ -0,0 +1,21 @@
+from django.db.backends.sqlite3 import base
+from config.db_pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    The SQLite backend with connections kept in a per-process `ConnectionPool`
+    (a stand-in for MySQL in local runs and benchmarks).
+
+    In-memory databases are not pooled: their single connection is the database.
+    """
+
+    def get_new_connection(self, conn_params):
+        if self.is_in_memory_db():
+            return base.DatabaseWrapper.get_new_connection(self, conn_params)
+        return super().get_new_connection(conn_params)
+
+    def _close(self):
+        if self.is_in_memory_db():
+            return base.DatabaseWrapper._close(self)
+        return super()._close()
@@ -0,0 +1,169 @@
+import gzip
+import json
+import zlib
+from django.conf import settings
+from rest_framework.response import Response
+
+try:
+    import brotli
+except ImportError:  # gzip is always available
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+# Media types worth compressing (JSON, NDJSON, CSV, HTML, ...); images and
+# archives are already compressed.
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml")
+
+
+def available_encodings():
+    """
+    Returns the configured encodings this process can produce, in order of server preference.
+    """
+    return [
+        encoding for encoding in settings.RESPONSE_COMPRESSION_ENCODINGS
+        if encoding == GZIP or (encoding == BROTLI and brotli is not None)
+    ]
+
+
+def negotiate(accept_encoding, encodings=None):
+    """
+    Picks the content coding for a request from its `Accept-Encoding` header.
+
+    The client's q-values win; among equally weighted codings the server
+    preference (`RESPONSE_COMPRESSION_ENCODINGS`) decides. `q=0` excludes a
+    coding and `*` stands for the codings not listed.
+
+    :param accept_encoding: The header value.
+    :param encodings: Candidate encodings (defaults to `available_encodings()`).
+    :return: "br", "gzip" or None for no compression.
+    """
+    encodings = encodings if encodings is not None else available_encodings()
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type):
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith("+json")
+
+
+def compress(body, encoding, precompress=False):
+    """
+    Compresses a response body.
+
+    :param body: The bytes to compress.
+    :param encoding: "br" or "gzip".
+    :param precompress: Use the (slower, smaller) levels for bodies compressed
+                        once and stored, instead of the per-request levels.
+    """
+    if encoding == BROTLI:
+        quality = settings.RESPONSE_PRECOMPRESS_BROTLI_QUALITY if precompress else settings.RESPONSE_COMPRESSION_BROTLI_QUALITY
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=quality)
+    level = settings.RESPONSE_PRECOMPRESS_GZIP_LEVEL if precompress else settings.RESPONSE_COMPRESSION_GZIP_LEVEL
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _compressor(encoding):
+    if encoding == BROTLI:
+        compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(settings.RESPONSE_COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+
+def compress_stream(chunks, encoding):
+    """
+    Compresses an iterable of byte chunks, yielding compressed chunks.
+    """
+    process, finish = _compressor(encoding)
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def compress_async_stream(chunks, encoding):
+    """
+    Compresses an async iterable of byte chunks, yielding compressed chunks.
+    """
+    process, finish = _compressor(encoding)
+    async for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+class PrecompressedContent:
+    """
+    A rendered response body together with its compressed variants, stored in
+    the cache as one entry so a hit is served without rendering or compressing.
+    """
+
+    __slots__ = ("body", "content_type", "encoded")
+
+    def __init__(self, body, content_type, encoded):
+        self.body = body
+        self.content_type = content_type
+        self.encoded = encoded
+
+    @classmethod
+    def build(cls, body, content_type):
+        """
+        Compresses `body` with every available encoding (bodies below
+        `RESPONSE_COMPRESSION_MIN_SIZE` are kept uncompressed only).
+        """
+        encoded = {}
+        if len(body) >= settings.RESPONSE_COMPRESSION_MIN_SIZE:
+            encoded = {encoding: compress(body, encoding, precompress=True) for encoding in available_encodings()}
+        return cls(body, content_type, encoded)
+
+
+class PrecompressedResponse(Response):
+    """
+    A DRF response for an already rendered JSON body (a `PrecompressedContent`).
+
+    The body is sent as is, and its compressed variants are exposed to
+    `CompressionMiddleware` as `precompressed`. `data` is decoded from the body
+    on access only, for callers (and tests) that inspect the response.
+    """
+
+    def __init__(self, content, status=None, headers=None):
+        super().__init__(None, status=status, headers=headers, content_type=content.content_type)
+        self.body = content.body
+        self.precompressed = content.encoded
+
+    @property
+    def data(self):
+        return json.loads(self.body)
+
+    @data.setter
+    def data(self, value):
+        pass
+
+    @property
+    def rendered_content(self):
+        return self.body
@@ -0,0 +1,249 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from django.db import OperationalError
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the `POOL` entry of a database in `settings.DATABASES`.
+DEFAULT_POOL = {
+    "MAX_SIZE": 4,          # connections per process (gunicorn worker)
+    "TIMEOUT": 5.0,         # seconds a request waits for a free connection
+    "RECYCLE": 3600.0,      # seconds after which a connection is replaced
+    "CHECK_INTERVAL": 30.0, # idle seconds after which a connection is pinged before reuse
+}
+
+
+class PoolTimeout(OperationalError):
+    """
+    Raised when no pooled connection becomes free within the pool timeout.
+    """
+
+
+class _Waiter:
+    """
+    A request queued for a connection: `release` hands it an idle connection,
+    `discard` the right to open a new one.
+    """
+
+    __slots__ = ("event", "connection", "returned_at", "may_open")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.connection = None
+        self.returned_at = 0.0
+        self.may_open = False
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections for one database alias in one process.
+
+    Idle connections are reused most-recently-returned first, so the ones left
+    unused age out. When every connection is in use, requests queue and are
+    served in arrival order: a released connection is handed to the oldest
+    waiter rather than to whichever thread asks next. A connection is checked
+    with `check` before reuse when it has been idle longer than
+    `CHECK_INTERVAL`, and replaced once older than `RECYCLE` (before MySQL's
+    `wait_timeout` drops it server-side).
+    """
+
+    def __init__(self, max_size, timeout, recycle, check_interval):
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.recycle = recycle
+        self.check_interval = check_interval
+        self._idle = deque()      # (connection, returned_at)
+        self._waiters = deque()   # _Waiter, oldest first
+        self._created_at = {}     # id(connection) -> monotonic creation time
+        self._opening = 0         # slots reserved by connections being opened
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "reused": 0, "discarded": 0, "waits": 0, "timeouts": 0}
+
+    @property
+    def size(self):
+        """
+        Number of open connections, idle or in use.
+        """
+        return len(self._created_at) + self._opening
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    def acquire(self, connect, check):
+        """
+        Returns an idle connection, or a new one while the pool is below its maximum size.
+
+        :param connect: Callable opening a new DB-API connection.
+        :param check: Callable raising if a connection is no longer usable.
+        :return: A DB-API connection.
+        :raises PoolTimeout: If no connection is handed over within `timeout` seconds.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            connection, returned_at = self._take(deadline)
+            if connection is None:
+                return self._open(connect)
+
+            now = time.monotonic()
+            if now - self._created_at[id(connection)] >= self.recycle:
+                self.discard(connection)
+                continue
+            if now - returned_at >= self.check_interval:
+                try:
+                    check(connection)
+                except Exception as e:
+                    logger.info("Discarding unusable pooled connection: %s", e)
+                    self.discard(connection)
+                    continue
+            self.stats["reused"] += 1
+            return connection
+
+    def _take(self, deadline):
+        """
+        Returns `(connection, returned_at)` of an idle connection, or `(None, None)`
+        once a slot for a new connection has been reserved.
+        """
+        with self._lock:
+            if not self._waiters:
+                if self._idle:
+                    return self._idle.pop()
+                if self.size < self.max_size:
+                    self._opening += 1
+                    return None, None
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+            self.stats["waits"] += 1
+
+        waiter.event.wait(max(0.0, deadline - time.monotonic()))
+        with self._lock:
+            if not waiter.event.is_set():
+                self._waiters.remove(waiter)
+                self.stats["timeouts"] += 1
+                raise PoolTimeout(f"No database connection became free within {self.timeout} s")
+        if waiter.may_open:
+            return None, None
+        return waiter.connection, waiter.returned_at
+
+    def _open(self, connect):
+        try:
+            connection = connect()
+        except Exception:
+            with self._lock:
+                self._opening -= 1
+                self._hand_slot()
+            raise
+        with self._lock:
+            self._opening -= 1
+            self._created_at[id(connection)] = time.monotonic()
+            self.stats["created"] += 1
+        return connection
+
+    def _hand_slot(self):
+        # Called with the lock held after a slot was freed.
+        if self._waiters and self.size < self.max_size:
+            waiter = self._waiters.popleft()
+            waiter.may_open = True
+            self._opening += 1
+            waiter.event.set()
+
+    def release(self, connection):
+        """
+        Returns a connection to the pool after rolling back any open transaction.
+        """
+        try:
+            connection.rollback()
+        except Exception as e:
+            logger.info("Discarding pooled connection that failed to roll back: %s", e)
+            self.discard(connection)
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.connection, waiter.returned_at = connection, now
+                waiter.event.set()
+            else:
+                self._idle.append((connection, now))
+
+    def discard(self, connection):
+        """
+        Closes a connection and frees its slot.
+        """
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created_at.pop(id(connection), None)
+            self.stats["discarded"] += 1
+            self._hand_slot()
+
+    def close(self):
+        """
+        Closes every idle connection; connections in use are returned to the pool as usual.
+        """
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self.discard(connection)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, settings_dict):
+    """
+    Returns the pool of a database alias in the current process.
+
+    Pools are created lazily and keyed by process ID as well, so a forked
+    worker never shares the connections it inherited from its parent.
+
+    :param alias: The database alias.
+    :param settings_dict: The database settings; pool options are read from its `POOL` entry.
+    """
+    key = (os.getpid(), alias)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                options = {**DEFAULT_POOL, **(settings_dict.get("POOL") or {})}
+                pool = _pools[key] = ConnectionPool(
+                    options["MAX_SIZE"], options["TIMEOUT"], options["RECYCLE"], options["CHECK_INTERVAL"]
+                )
+    return pool
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Makes a Django database backend take its connections from a `ConnectionPool`.
+
+    `close()` (called by Django at the end of every request when `CONN_MAX_AGE`
+    is 0) returns the connection to the pool instead of closing it. Connections
+    closed inside a transaction or after an error are discarded. Backends define
+    `check_pooled_connection(connection)`, which raises if the connection is unusable.
+    """
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        return self.pool.acquire(lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(conn_params),
+                                 self.check_pooled_connection)
+
+    def check_pooled_connection(self, connection):
+        connection.cursor().execute("SELECT 1")
+
+    def _close(self):
+        if self.connection is None:
+            return
+        if self.in_atomic_block or self.errors_occurred:
+            self.pool.discard(self.connection)
+        else:
+            self.pool.release(self.connection)
@@ -0,0 +1,254 @@
+import contextvars
+import hashlib
+import logging
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "default"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class _RequestState:
+    """
+    Routing state of the request being served: whether it may read from a
+    replica, the replica picked for it, and whether it has written.
+    """
+
+    __slots__ = ("use_replica", "replica", "wrote")
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.replica = None
+        self.wrote = False
+
+
+_state = contextvars.ContextVar("db_router_state", default=None)
+
+
+class ReplicaMonitor:
+    """
+    Per-process view of the replication lag of every replica.
+
+    At most every `DATABASE_REPLICA_CHECK_INTERVAL` seconds the primary's
+    heartbeat row (`config.ReplicationHeartbeat`) is set to the current time and
+    read back from each replica; the lag of a replica is how far behind now the
+    value it returns is. Replicas lagging more than `DATABASE_REPLICA_MAX_LAG`
+    seconds, or failing the query, are out of rotation until a later check.
+
+    Requests never wait for a check: when the lags are stale, `healthy_replicas`
+    starts one in a background thread and answers from the last known lags (no
+    replica before the first check completes). Replica aliases connect with a
+    short `connect_timeout`, so a replica that is down holds up that thread
+    only briefly.
+    """
+
+    HEARTBEAT_TABLE = "config_replicationheartbeat"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._checking = False
+        self.lags = {}
+
+    def _beat(self, now):
+        with connections[PRIMARY].cursor() as cursor:
+            cursor.execute(f"UPDATE {self.HEARTBEAT_TABLE} SET beat = %s WHERE id = 1", [now])
+            if cursor.rowcount == 0:
+                cursor.execute(f"INSERT INTO {self.HEARTBEAT_TABLE} (id, beat) VALUES (1, %s)", [now])
+
+    def _lag(self, alias, now):
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(f"SELECT beat FROM {self.HEARTBEAT_TABLE} WHERE id = 1")
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.warning("Replica %s is unreachable: %s", alias, e)
+            return None
+        return max(0.0, now - row[0]) if row else None
+
+    def _stale(self):
+        return self._checked_at is None or time.monotonic() - self._checked_at >= settings.DATABASE_REPLICA_CHECK_INTERVAL
+
+    def check(self):
+        """
+        Writes a heartbeat and measures the lag of every replica, on the calling thread.
+        """
+        now = time.time()
+        try:
+            self._beat(now)
+        except Exception as e:
+            logger.error("Could not write the replication heartbeat: %s", e)
+            lags = {alias: None for alias in settings.DATABASE_REPLICAS}
+        else:
+            lags = {alias: self._lag(alias, now) for alias in settings.DATABASE_REPLICAS}
+        with self._lock:
+            for alias, lag in lags.items():
+                healthy = self._is_healthy(lag)
+                if healthy != self._is_healthy(self.lags.get(alias, 0.0)):
+                    logger.warning("Replica %s %s rotation (lag %s s)", alias, "back in" if healthy else "out of", lag)
+            self.lags = lags
+            self._checked_at = time.monotonic()
+
+    @staticmethod
+    def _is_healthy(lag):
+        return lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG
+
+    def refresh(self):
+        """
+        Starts a check in a background thread, unless the lags are fresh or a
+        check is already running.
+        """
+        with self._lock:
+            if self._checking or not self._stale():
+                return
+            self._checking = True
+        threading.Thread(target=self._background_check, name="replica-monitor", daemon=True).start()
+
+    def _background_check(self):
+        try:
+            self.check()
+        finally:
+            with self._lock:
+                self._checking = False
+            connections.close_all()  # this thread's own connections
+
+    def healthy_replicas(self):
+        """
+        Returns the replicas within the maximum lag as of the last check.
+        """
+        if self._stale():
+            self.refresh()
+        return [alias for alias in settings.DATABASE_REPLICAS if self._is_healthy(self.lags.get(alias))]
+
+    def reset(self):
+        with self._lock:
+            self._checked_at = None
+            self.lags = {}
+
+
+replica_monitor = ReplicaMonitor()
+
+
+def pin_key(request):
+    """
+    Returns the cache key that pins a client to the primary.
+
+    Clients are told apart by their credentials (the `Authorization` header or
+    session cookie) and otherwise by address; the key is computed before
+    authentication, which DRF only runs inside the view.
+    """
+    identity = (
+        request.META.get("HTTP_AUTHORIZATION")
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.META.get("REMOTE_ADDR", "")
+    )
+    return "db-pin:" + hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def route_request(request):
+    """
+    Sets the routing state for the duration of a request.
+
+    Reads of a safe-method request go to a replica unless the client wrote
+    within the last `DATABASE_REPLICA_PIN_SECONDS` (read-your-writes); a request
+    that writes pins its client to the primary for that long.
+
+    Pins live in `DATABASE_REPLICA_PIN_CACHE`. With the default local-memory
+    backend they are per process, so read-your-writes only holds for requests
+    served by the worker that took the write; use a shared backend (file or
+    Redis) when running several workers.
+    """
+    if not settings.DATABASE_REPLICAS:
+        yield
+        return
+
+    pins = caches[settings.DATABASE_REPLICA_PIN_CACHE]
+    key = pin_key(request)
+    safe = request.method in SAFE_METHODS
+    state = _RequestState(use_replica=safe and not pins.get(key))
+    token = _state.set(state)
+    try:
+        yield
+    finally:
+        _state.reset(token)
+        if state.wrote or not safe:
+            pins.set(key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+@asynccontextmanager
+async def aroute_request(request):
+    """
+    Async version of `route_request`, for requests served under ASGI.
+
+    The state is a context variable, so the ORM calls the request makes
+    through `sync_to_async` see it as well.
+    """
+    if not settings.DATABASE_REPLICAS:
+        yield
+        return
+
+    pins = caches[settings.DATABASE_REPLICA_PIN_CACHE]
+    key = pin_key(request)
+    safe = request.method in SAFE_METHODS
+    state = _RequestState(use_replica=safe and not await pins.aget(key))
+    token = _state.set(state)
+    try:
+        yield
+    finally:
+        _state.reset(token)
+        if state.wrote or not safe:
+            await pins.aset(key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+class ReplicaRouter:
+    """
+    Routes catalog reads (`DATABASE_REPLICA_APPS`) of safe-method requests to a
+    replica, and everything else to the primary.
+
+    A request sticks to one replica so that all its reads see the same
+    snapshot. Reads stay on the primary inside a transaction on the primary,
+    after the request has written, outside a request (management commands,
+    signals run from scripts) and while the client is pinned after a write.
+    Replicas are never migrated: their schema comes from replication.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica or state.wrote:
+            return None
+        if model._meta.app_label not in settings.DATABASE_REPLICA_APPS:
+            return None
+        if connections[PRIMARY].in_atomic_block:
+            return None
+        if state.replica is None:
+            healthy = replica_monitor.healthy_replicas()
+            if not healthy:
+                state.use_replica = False
+                return None
+            state.replica = random.choice(healthy)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,225 @@
+import atexit
+import copy
+import hashlib
+import json
+import logging
+import logging.handlers
+import queue
+import random
+from datetime import datetime, timezone
+from django.conf import settings
+
+# Records queued by request threads and written by the listener thread.
+log_queue = queue.SimpleQueue()
+
+# Handlers the listener writes to, registered by `QueueHandler` during `LOGGING` setup.
+_targets = []
+
+_listener = None
+
+# Attributes every LogRecord has; anything else was passed through `extra=`.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+# Payload keys whose values are left out of summaries: a short hash of a
+# password or token in the logs could be brute-forced offline.
+REDACTED_KEYS = {"access", "refresh"}
+REDACTED_KEY_PARTS = ("password", "token", "secret")
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+
+    Values passed through `extra=` are included as top-level keys.
+    """
+
+    def format(self, record):
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of the INFO (and lower) records of high-volume loggers.
+
+    `rates` maps logger names to the fraction of records kept; a name also
+    applies to its child loggers. WARNING and above are never dropped.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = rates or {}
+
+    def rate_for(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to `log_queue` so the request thread never blocks on I/O.
+
+    The message is interpolated here (arguments may be mutated after the call
+    returns) but formatting into JSON and writing happen on the listener thread.
+
+    `handlers` names the `LOGGING` handlers that do the actual writing; they are
+    attached to the listener started by `start_listener()`.
+    """
+
+    def __init__(self, handlers=()):
+        super().__init__(log_queue)
+        targets = []
+        for name in handlers:
+            target = _handler_by_name(name)
+            if target is None:
+                # dictConfig defers handlers failing with this message until the others exist.
+                raise ValueError(f"Logging target not configured yet: {name}")
+            targets.append(target)
+        if targets:
+            _targets[:] = targets
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class PayloadSummary:
+    """
+    Log argument that stands for a request body: field names, page count, byte
+    size and a content hash, instead of the body itself.
+
+    The summary is computed when the message is interpolated, which
+    `QueueHandler.prepare()` does on the request thread for every record that
+    passes the logger level and the handler's filters. At most `max_bytes` of
+    string content are hashed, so logging a multi-megabyte book costs a walk
+    over its values rather than a full `repr()`.
+
+    Values of sensitive keys (see `is_redacted`), at any depth, are neither
+    hashed nor counted; only the key name appears in the summary.
+    """
+
+    def __init__(self, data, max_bytes=None):
+        """
+        :param data: The parsed request body (usually `request.data`).
+        :param max_bytes: Maximum number of bytes hashed (defaults to `settings.LOG_PAYLOAD_MAX_BYTES`).
+        """
+        self.data = data
+        self.max_bytes = max_bytes
+
+    def summarize(self):
+        """
+        Returns the summary as a dictionary (also suitable for `extra=`).
+        """
+        max_bytes = self.max_bytes if self.max_bytes is not None else settings.LOG_PAYLOAD_MAX_BYTES
+        digest = hashlib.sha1()
+        state = {"size": 0, "hashed": 0}
+
+        def walk(value):
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    walk(key)
+                    if not is_redacted(key):
+                        walk(item)
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    walk(item)
+            elif value is not None:
+                text = value if isinstance(value, str) else str(value)
+                size = len(text) if text.isascii() else len(text.encode("utf-8"))
+                state["size"] += size
+                remaining = max_bytes - state["hashed"]
+                if remaining > 0:
+                    chunk = text[:remaining].encode("utf-8")[:remaining]
+                    digest.update(chunk)
+                    state["hashed"] += len(chunk)
+
+        walk(self.data)
+        fields = sorted(self.data) if isinstance(self.data, dict) else []
+        pages = self.data.get("pages") if isinstance(self.data, dict) else None
+        return {
+            "fields": fields,
+            "pages": len(pages) if isinstance(pages, (list, tuple)) else None,
+            "bytes": state["size"],
+            "sha1": digest.hexdigest()[:12],
+            "truncated": state["size"] > state["hashed"],
+        }
+
+    def __str__(self):
+        summary = self.summarize()
+        text = f"fields={','.join(map(str, summary['fields']))} bytes={summary['bytes']} sha1={summary['sha1']}"
+        if summary["pages"] is not None:
+            text += f" pages={summary['pages']}"
+        if summary["truncated"]:
+            text += " (hash of a prefix)"
+        return text
+
+
+def is_redacted(key):
+    """
+    Returns whether the value of a payload key must be kept out of the logs.
+    """
+    name = str(key).lower()
+    return name in REDACTED_KEYS or any(part in name for part in REDACTED_KEY_PARTS)
+
+
+def summarize_payload(data, max_bytes=None):
+    """
+    Returns a lazy summary of a request body for use as a log argument.
+    """
+    return PayloadSummary(data, max_bytes)
+
+
+def _handler_by_name(name):
+    getter = getattr(logging, "getHandlerByName", None)  # Python 3.12+
+    return getter(name) if getter else logging._handlers.get(name)
+
+
+def start_listener():
+    """
+    Starts the thread that drains `log_queue` into the target handlers.
+    Calling it again is a no-op.
+
+    :return: The running QueueListener.
+    """
+    global _listener
+    if _listener is None:
+        _listener = logging.handlers.QueueListener(log_queue, *_targets, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_listener)
+    return _listener
+
+
+def stop_listener():
+    """
+    Flushes the queued records and stops the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,309 @@
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from config import content_encoding, db_router
+
+logger = logging.getLogger(__name__)
+
+# Collapses the placeholder lists of IN (...) / VALUES (...) clauses so that the
+# same statement with a different number of parameters maps to one template.
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def sql_template(sql):
+    """
+    Returns the normalized template of a parameterized SQL statement.
+    """
+    return _WHITESPACE.sub(" ", _PLACEHOLDER_LIST.sub("(%s, ...)", sql)).strip()
+
+
+class RequestMetrics:
+    """
+    Query and timing figures collected for one request.
+
+    An instance is installed as an `execute_wrapper` on every database
+    connection while the request is being handled, so each SQL statement is
+    counted and timed. When the request is sampled, statements are also
+    grouped by template for N+1 detection.
+    """
+
+    def __init__(self, sample_queries=False):
+        """
+        :param sample_queries: Whether to keep per-template counts for N+1 detection.
+        """
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+        self.templates = Counter() if sample_queries else None
+        self._render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            if self.templates is not None:
+                self.templates[sql_template(sql)] += 1
+
+    def start_render(self):
+        self._render_started = time.perf_counter()
+
+    def stop_render(self, response=None):
+        if self._render_started is not None:
+            self.render_time += time.perf_counter() - self._render_started
+            self._render_started = None
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.started
+
+    def repeated_templates(self, threshold):
+        """
+        Returns the sampled SQL templates executed more than `threshold` times, most repeated first.
+        """
+        if self.templates is None:
+            return []
+        return [(sql, count) for sql, count in self.templates.most_common() if count > threshold]
+
+    def server_timing(self):
+        """
+        Returns the value of the `Server-Timing` header.
+        """
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f"render;dur={self.render_time * 1000:.1f}",
+            f"total;dur={self.total_time * 1000:.1f}",
+        ])
+
+    def as_dict(self):
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.db_time * 1000, 2),
+            "render_ms": round(self.render_time * 1000, 2),
+            "total_ms": round(self.total_time * 1000, 2),
+        }
+
+
+class RequestMetricsMiddleware:
+    """
+    Records the query count, DB time, render (serialization) time and total time
+    of each request.
+
+    The figures are logged as a structured record on the `config.middleware`
+    logger and, when `REQUEST_METRICS_SERVER_TIMING` is on (off by default),
+    returned in a `Server-Timing` header (shown by browser dev tools).
+    A fraction of requests (`REQUEST_METRICS_SAMPLE_RATE`) also has its queries
+    grouped by SQL template; a template executed more than
+    `REQUEST_METRICS_N_PLUS_ONE_THRESHOLD` times is reported as a likely N+1.
+
+    Place it first in `MIDDLEWARE` so the total covers the other middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.REQUEST_METRICS_ENABLED:
+            return self.get_response(request)
+
+        metrics = self._start(request)
+        with self._instrument(metrics):
+            response = self.get_response(request)
+        return self._finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_METRICS_ENABLED:
+            return await self.get_response(request)
+
+        # Connections are thread-local: the wrappers are installed from the
+        # thread that runs the request's `sync_to_async` (ORM) calls.
+        metrics = self._start(request)
+        stack = await sync_to_async(self._instrument)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self._finish(request, response, metrics)
+
+    @staticmethod
+    def _start(request):
+        metrics = RequestMetrics(sample_queries=random.random() < settings.REQUEST_METRICS_SAMPLE_RATE)
+        request.metrics = metrics
+        return metrics
+
+    @staticmethod
+    def _instrument(metrics):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(metrics))
+        return stack
+
+    def _finish(self, request, response, metrics):
+        metrics.finish()
+        if settings.REQUEST_METRICS_SERVER_TIMING:
+            response["Server-Timing"] = metrics.server_timing()
+        self._log(request, response, metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        Times the DRF renderer: Django renders `Response` objects right after
+        the template-response middleware has run.
+        """
+        metrics = getattr(request, "metrics", None)
+        if metrics is not None:
+            metrics.start_render()
+            response.add_post_render_callback(metrics.stop_render)
+        return response
+
+    @staticmethod
+    def _log(request, response, metrics):
+        data = metrics.as_dict()
+        data.update(method=request.method, path=request.path, status=response.status_code)
+        logger.info(
+            "%s %s %s: %s queries, db %s ms, render %s ms, total %s ms",
+            request.method, request.path, response.status_code,
+            metrics.queries, data["db_ms"], data["render_ms"], data["total_ms"],
+            extra={"metrics": data},
+        )
+
+        threshold = settings.REQUEST_METRICS_N_PLUS_ONE_THRESHOLD
+        for sql, count in metrics.repeated_templates(threshold):
+            logger.warning(
+                "Possible N+1 on %s %s: query repeated %s times: %s",
+                request.method, request.path, count, sql,
+                extra={"metrics": dict(data, repeated_sql=sql, repeated=count)},
+            )
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with brotli or gzip, negotiated from `Accept-Encoding`.
+
+    Responses carrying a `precompressed` mapping (encoding -> bytes, set by
+    views serving `PrecompressedContent` from the cache) are answered with
+    the stored bytes; others are compressed per request with the fast levels.
+    Bodies smaller than `RESPONSE_COMPRESSION_MIN_SIZE`, non-text media types
+    and responses that already have a `Content-Encoding` are left alone. Under
+    ASGI, bodies of at least `RESPONSE_COMPRESSION_THREAD_MIN_SIZE` bytes are
+    compressed in a worker thread so they do not block the event loop.
+
+    Unlike Django's `GZipMiddleware`, no random padding is added against
+    BREACH: API responses carry no CSRF token or other secret next to
+    attacker-controlled input, and padding would make cached bodies differ.
+
+    Place it right after `RequestMetricsMiddleware` so the other middleware
+    see the uncompressed response.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if not settings.RESPONSE_COMPRESSION_ENABLED:
+            return response
+        return self.compress(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if not settings.RESPONSE_COMPRESSION_ENABLED:
+            return response
+        if self.compresses_in_thread(response):
+            return await sync_to_async(self.compress, thread_sensitive=False)(request, response)
+        return self.compress(request, response)
+
+    @staticmethod
+    def compresses_in_thread(response):
+        """
+        Whether the body of `response` is large enough to be compressed off the event loop.
+        """
+        if response.streaming or getattr(response, "precompressed", None):
+            return False
+        return len(response.content) >= settings.RESPONSE_COMPRESSION_THREAD_MIN_SIZE
+
+    @staticmethod
+    def compress(request, response):
+        if response.has_header("Content-Encoding") or not content_encoding.is_compressible(response.get("Content-Type")):
+            return response
+        if not response.streaming and len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = content_encoding.negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = content_encoding.compress_async_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = content_encoding.compress_stream(response.streaming_content, encoding)
+            del response["Content-Length"]
+        else:
+            precompressed = getattr(response, "precompressed", None) or {}
+            body = precompressed.get(encoding) or content_encoding.compress(response.content, encoding)
+            if len(body) >= len(response.content):
+                return response
+            response.content = body
+            response["Content-Length"] = str(len(body))
+
+        # The compressed body is a different representation of the same resource.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets `config.db_router.ReplicaRouter` send the catalog reads of safe-method
+    requests to a read replica, and pins clients that write to the primary for
+    `DATABASE_REPLICA_PIN_SECONDS` so they read their own writes.
+
+    Does nothing unless `DATABASE_REPLICAS` lists at least one alias.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with db_router.route_request(request):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        async with db_router.aroute_request(request):
+            return await self.get_response(request)
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReplicationHeartbeat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('beat', models.FloatField(help_text='Unix time of the last heartbeat written on the primary.')),
+            ],
+        ),
+    ]
@@ -0,0 +1,10 @@
+from django.db import models
+
+
+class ReplicationHeartbeat(models.Model):
+    """
+    Single row updated on the primary by `config.db_router.ReplicaMonitor` and
+    read back from the replicas to measure their replication lag.
+    """
+
+    beat = models.FloatField(help_text="Unix time of the last heartbeat written on the primary.")
@@ -0,0 +1,267 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Cursor (keyset) pagination over a unique ordering.
+
+    Pages are selected with a `WHERE (a, b) < (x, y)`-style seek condition on
+    the `ordering` fields instead of `OFFSET`, and no `COUNT(*)` is issued, so
+    every page costs the same regardless of how deep the client has paged.
+    Cursors are opaque base64 tokens that encode the ordering values of the
+    first/last row of the current page.
+
+    Offset pagination (`PageNumberPagination`, with `count`) is still served
+    when the request carries `page` or `pagination=offset`.
+
+    - `ordering`: Field names (prefix `-` for descending); must end with a unique field.
+    - `cursor_query_param`: Query parameter carrying the cursor.
+    - `mode_query_param`: Query parameter that selects `offset` mode.
+    """
+
+    ordering = ("-id",)
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    invalid_cursor_message = "Invalid cursor"
+
+    def use_offset(self, request):
+        """
+        Returns True when the client asked for legacy offset pagination.
+        """
+        return (
+            request.query_params.get(self.mode_query_param) == "offset"
+            or self.page_query_param in request.query_params
+        )
+
+    def get_ordering(self, request):
+        """
+        Returns the ordering used for the seek condition.
+        """
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.offset_mode = self.use_offset(request)
+        if self.offset_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        queryset, backwards = self._seek_queryset(queryset, request)
+        return self._page_rows(list(queryset[:page_size + 1]), page_size, backwards)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async version of `paginate_queryset`: rows (and, in offset mode, the
+        count) are fetched with the async ORM.
+
+        Rows are read with `async for` rather than `aiterator()`: the former
+        routes and runs the whole query in one hop to the sync thread, while
+        `aiterator()` resolves the database connection on the event loop.
+        """
+        self.offset_mode = self.use_offset(request)
+        if self.offset_mode:
+            return await self._apaginate_offset(queryset, request)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        queryset, backwards = self._seek_queryset(queryset, request)
+        rows = [row async for row in queryset[:page_size + 1]]
+        return self._page_rows(rows, page_size, backwards)
+
+    async def _apaginate_offset(self, queryset, request):
+        # `PageNumberPagination.paginate_queryset` with the count and the page
+        # fetched through the async ORM.
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        self.page.object_list = [row async for row in self.page.object_list]
+        return list(self.page)
+
+    def _seek_queryset(self, queryset, request):
+        """
+        Orders the queryset by the keyset and applies the seek condition of the request's cursor.
+
+        :return: A tuple `(queryset, backwards)`.
+        :raises NotFound: If the cursor is malformed or belongs to another ordering.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.fields = [(name.lstrip("-"), name.startswith("-")) for name in self.get_ordering(request)]
+
+        position, backwards = self.decode_cursor(request)
+        self.position = position
+        queryset = queryset.order_by(*self._order_by(backwards))
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._seek(position, backwards))
+            except (ValueError, TypeError, DjangoValidationError):
+                # A cursor taken from a list with another ordering.
+                raise NotFound(self.invalid_cursor_message)
+        return queryset, backwards
+
+    def _page_rows(self, rows, page_size, backwards):
+        """
+        Trims the extra row fetched to detect a following page and records the page links state.
+        """
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+            self.has_next, self.has_previous = self.position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+
+        self.page_rows = rows
+        return rows
+
+    def is_first_page(self):
+        """
+        Returns True if the last paginated request was for the first page.
+        """
+        if self.offset_mode:
+            return self.page.number == 1
+        return self.position is None
+
+    def get_known_count(self):
+        """
+        Returns the total number of rows if pagination has revealed it without an
+        extra query (offset mode, or a single cursor page), otherwise None.
+        """
+        if self.offset_mode:
+            return self.page.paginator.count
+        if self.is_first_page() and not self.has_next:
+            return len(self.page_rows)
+        return None
+
+    def get_paginated_response(self, data):
+        if self.offset_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["required"] = ["results"]
+        return response_schema
+
+    def get_next_link(self):
+        if self.offset_mode:
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self._link(self.page_rows[-1], backwards=False)
+
+    def get_previous_link(self):
+        if self.offset_mode:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self._link(self.page_rows[0], backwards=True)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            "name": self.cursor_query_param,
+            "required": False,
+            "in": "query",
+            "description": "Opaque pagination cursor taken from the `next`/`previous` links.",
+            "schema": {"type": "string"},
+        })
+        parameters.append({
+            "name": self.mode_query_param,
+            "required": False,
+            "in": "query",
+            "description": "Use `offset` for page-number pagination with a total count.",
+            "schema": {"type": "string", "enum": ["cursor", "offset"]},
+        })
+        return parameters
+
+    def decode_cursor(self, request):
+        """
+        Decodes the cursor of the request.
+
+        :return: A tuple `(position, backwards)`; `position` is None on the first page.
+        :raises NotFound: If the cursor is malformed.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            position = payload["p"]
+            backwards = bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return position, backwards
+
+    def encode_cursor(self, position, backwards):
+        payload = {"p": position}
+        if backwards:
+            payload["r"] = 1
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+    def _link(self, row, backwards):
+        position = [self._json_value(self._value(row, name)) for name, _ in self.fields]
+        url = remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position, backwards))
+
+    @staticmethod
+    def _value(row, name):
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+
+    @staticmethod
+    def _json_value(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    def _order_by(self, backwards):
+        return [
+            f"-{name}" if descending != backwards else name
+            for name, descending in self.fields
+        ]
+
+    def _seek(self, position, backwards):
+        """
+        Builds the row-value comparison `(f1, f2, ...) > (v1, v2, ...)` as an OR of
+        prefix equalities, honouring the direction of each field.
+        """
+        condition = Q()
+        for index, (name, descending) in enumerate(self.fields):
+            lookup = "lt" if descending != backwards else "gt"
+            clause = Q(**{f"{name}__{lookup}": position[index]})
+            for previous_index in range(index):
+                clause &= Q(**{self.fields[previous_index][0]: position[previous_index]})
+            condition |= clause
+        return condition
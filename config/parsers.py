@@ -0,0 +1,28 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from config.renderers import FastJSONRenderer, orjson
+
+UTF8_NAMES = ("utf-8", "utf8")
+
+
+class FastJSONParser(JSONParser):
+    """
+    `JSONParser` that decodes with orjson when it is installed.
+
+    orjson only reads UTF-8 and, like DRF's strict mode, rejects `NaN` and
+    `Infinity`; bodies in other charsets, non-strict parsing and processes
+    without orjson go through the stdlib `json` module.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower() not in UTF8_NAMES:
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,45 @@
+class QueryResult:
+    """
+    A lazy queryset passed between layers together with its cardinality, once known.
+
+    Repositories return it without touching the database; whichever layer
+    learns the number of rows (typically the paginator) records it, so later
+    layers can log or branch on it without issuing their own `count()` or
+    `exists()` queries.
+    """
+
+    def __init__(self, queryset, count=None):
+        """
+        :param queryset: The (unevaluated) queryset.
+        :param count: The number of rows, if already known.
+        """
+        self.queryset = queryset
+        self.known_count = count
+
+    def record_count(self, count):
+        """
+        Records the number of rows if it has become known.
+
+        :param count: The number of rows, or None if still unknown.
+        :return: The known count (None if unknown).
+        """
+        if count is not None:
+            self.known_count = count
+        return self.known_count
+
+    def count(self):
+        """
+        Returns the number of rows, querying the database only if nobody has recorded it yet.
+        """
+        if self.known_count is None:
+            self.known_count = self.queryset.count()
+        return self.known_count
+
+    def describe_count(self):
+        """
+        Returns the known count as text for log messages, without querying.
+        """
+        return "unknown" if self.known_count is None else str(self.known_count)
+
+    def __iter__(self):
+        return iter(self.queryset)
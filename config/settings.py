@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     "rest_framework_simplejwt.token_blacklist",
     "pytest_django",
+    "config",
     'users',
     "books",
     "drf_spectacular",
@@ -93,7 +94,7 @@ SPECTACULAR_SETTINGS = {
 
         - All endpoints return responses in JSON format.
         - This documentation is interactive: you can test the endpoints directly from here.
-        - Remember to use pagination to get results in parts (`?page=1&page_size=10`).
+        - Lists are cursor-paginated: follow the `next`/`previous` links (`?page_size=10`). Use `?page=1` or `?pagination=offset` for page numbers.
 
         ---
         """
@@ -107,7 +108,7 @@ SPECTACULAR_SETTINGS = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        "users.authentication.ClaimsJWTAuthentication",
     ),
     'DEFAULT_THROTTLE_RATES': {
         'user': '5/minute', 
@@ -118,6 +119,17 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # JSON through orjson when installed (stdlib json otherwise); same output as DRF's except for
+    # the form of some floats (see config.renderers.FastJSONRenderer).
+    "DEFAULT_RENDERER_CLASSES": [
+        "config.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "config.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 DATABASES = {
@@ -126,8 +138,12 @@ DATABASES = {
         'NAME': 'fictionexpress_db',
         'USER': 'fictionexpress_user',
         'PASSWORD': '1234',
-        'HOST': 'db',
-        'PORT': '3306',
+        'HOST': os.environ.get("DB_HOST", "db"),
+        'PORT': os.environ.get("DB_PORT", "3306"),
+        # Keep connections open between requests (seconds, 0 closes them after
+        # every request) and ping them before reuse in a new request.
+        'CONN_MAX_AGE': int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -136,56 +152,147 @@ if "pytest" in sys.modules:
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
     }
+elif os.environ.get("SQLITE_PATH"):
+    # Local runs and benchmarks without MySQL (":memory:" for a throwaway database).
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ["SQLITE_PATH"],
+        'CONN_MAX_AGE': int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        'CONN_HEALTH_CHECKS': True,
+    }
+
+# Optional per-process connection pool (config.db_pool), shared by the threads
+# of a gunicorn worker: DB_POOL_SIZE connections at most per worker, 0 disables
+# it. Pooled connections are handed back at the end of every request, so
+# CONN_MAX_AGE does not apply. Under ASGI (config.asgi) each request runs its ORM
+# calls in a thread of its own, so persistent connections would never be reused:
+# config.asgi forces DB_CONN_MAX_AGE=0; set DB_POOL_SIZE to reuse connections.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 0))
+POOLED_ENGINES = {
+    "django.db.backends.mysql": "config.backends.mysql",
+    "django.db.backends.sqlite3": "config.backends.sqlite3",
+}
+if DB_POOL_SIZE and "pytest" not in sys.modules:
+    DATABASES['default'].update({
+        'ENGINE': POOLED_ENGINES[DATABASES['default']['ENGINE']],
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            "MAX_SIZE": DB_POOL_SIZE,
+            "TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 5)),
+            "RECYCLE": float(os.environ.get("DB_POOL_RECYCLE", 3600)),
+            "CHECK_INTERVAL": float(os.environ.get("DB_POOL_CHECK_INTERVAL", 30)),
+        },
+    })
+
+# Read replicas of the default database, one alias each ("replica1", ...):
+# DB_REPLICA_HOSTS lists MySQL hosts with the primary's credentials, and
+# SQLITE_REPLICA_PATHS SQLite files standing in for them in local runs (copy the
+# primary file over a replica to "replicate"). Catalog reads of safe-method
+# requests go to a replica within DATABASE_REPLICA_MAX_LAG seconds of the
+# primary (measured every DATABASE_REPLICA_CHECK_INTERVAL seconds, in a
+# background thread), and clients that write read from the primary for
+# DATABASE_REPLICA_PIN_SECONDS. MySQL replicas connect with a short timeout
+# (DB_REPLICA_CONNECT_TIMEOUT seconds) so that a replica that is down is
+# detected quickly.
+DATABASE_REPLICA_CONNECT_TIMEOUT = int(os.environ.get("DB_REPLICA_CONNECT_TIMEOUT", 2))
+if "pytest" in sys.modules:
+    _replicas = []
+elif DATABASES['default']['ENGINE'].endswith("sqlite3"):
+    _replicas = [{'NAME': path} for path in os.environ.get("SQLITE_REPLICA_PATHS", "").split(",") if path]
+else:
+    _replicas = [
+        {'HOST': host, 'OPTIONS': {**DATABASES['default'].get('OPTIONS', {}), 'connect_timeout': DATABASE_REPLICA_CONNECT_TIMEOUT}}
+        for host in os.environ.get("DB_REPLICA_HOSTS", "").split(",") if host
+    ]
+for _index, _replica in enumerate(_replicas, 1):
+    DATABASES[f"replica{_index}"] = {**DATABASES['default'], **_replica, 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_REPLICA_APPS = ("books", "users")
+DATABASE_REPLICA_MAX_LAG = float(os.environ.get("DB_REPLICA_MAX_LAG", 5))
+DATABASE_REPLICA_CHECK_INTERVAL = float(os.environ.get("DB_REPLICA_CHECK_INTERVAL", 2))
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get("DB_REPLICA_PIN_SECONDS", 10))
+
+# Fraction of INFO records kept for high-volume loggers (child loggers included).
+# WARNING and above are always kept.
+LOG_SAMPLE_RATES = {
+    "books.views.book_page_view": float(os.environ.get("LOG_PAGE_READ_SAMPLE_RATE", 0.1)),
+    "books.services.book_page_servicce": float(os.environ.get("LOG_PAGE_READ_SAMPLE_RATE", 0.1)),
+    "books.repositories.book_page_repository": float(os.environ.get("LOG_PAGE_READ_SAMPLE_RATE", 0.1)),
+}
 
+# Maximum number of bytes of a request body hashed when it is summarized in a log record.
+LOG_PAYLOAD_MAX_BYTES = int(os.environ.get("LOG_PAYLOAD_MAX_BYTES", 4096))
+
+# Loggers write to an in-memory queue; a listener thread started by
+# `config.apps.ConfigConfig.ready()` formats the records and writes them out.
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
-        "verbose": {
-            "format": "{asctime} - {name} - {levelname} - {message}",
-            "style": "{",
+        "json": {
+            "()": "config.log.JSONFormatter",
         },
         "simple": {
             "format": "{levelname} - {message}",
             "style": "{",
         },
     },
+    "filters": {
+        "sampling": {
+            "()": "config.log.SamplingFilter",
+            "rates": LOG_SAMPLE_RATES,
+        },
+    },
     "handlers": {
         "file": {
             "level": "INFO",  # 🔹 Set minimum logging level to INFO
-            "class": "logging.FileHandler",
+            "class": "logging.handlers.RotatingFileHandler",
             "filename": os.path.join(BASE_DIR, "logs/debug.log"),
-            "formatter": "verbose",
+            "maxBytes": int(os.environ.get("LOG_FILE_MAX_BYTES", 10 * 1024 * 1024)),
+            "backupCount": int(os.environ.get("LOG_FILE_BACKUP_COUNT", 5)),
+            "formatter": "json",
         },
         "console": {
             "level": "WARNING",  # 🔹 Show only warnings and errors in the console
             "class": "logging.StreamHandler",
             "formatter": "simple",
         },
+        "queue": {
+            "()": "config.log.QueueHandler",
+            "handlers": ["file", "console"],
+            "filters": ["sampling"],
+        },
     },
     "loggers": {
         "django": {
-            "handlers": ["file", "console"],
+            "handlers": ["queue"],
             "level": "WARNING",  # 🔹 Ignore DEBUG logs from Django
             "propagate": True,
         },
         "django.utils.autoreload": {
-            "handlers": ["file"],
+            "handlers": ["queue"],
             "level": "ERROR",  # 🔹 Hide autoreload DEBUG logs
             "propagate": False,
         },
         "rest_framework": {
-            "handlers": ["file"],
+            "handlers": ["queue"],
             "level": "ERROR",  # 🔹 Suppress unnecessary DRF logs
             "propagate": False,
         },
         "users": {
-            "handlers": ["file", "console"],
+            "handlers": ["queue"],
             "level": "INFO",  # 🔹 Your app's logs at INFO level
             "propagate": False,
         },
         "books": {
-            "handlers": ["file", "console"],
+            "handlers": ["queue"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "config": {
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
@@ -202,7 +309,140 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# In-process Bloom filter of blacklisted refresh tokens (users.blacklist).
+TOKEN_BLACKLIST_FILTER_CAPACITY = int(os.environ.get("TOKEN_BLACKLIST_FILTER_CAPACITY", 100_000))
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = float(os.environ.get("TOKEN_BLACKLIST_FILTER_ERROR_RATE", 0.001))
+
+# Seconds between incremental syncs of the filter with tokens blacklisted by other
+# processes (the window in which such a token is still accepted), and between full rebuilds.
+TOKEN_BLACKLIST_SYNC_INTERVAL = float(os.environ.get("TOKEN_BLACKLIST_SYNC_INTERVAL", 5))
+TOKEN_BLACKLIST_REBUILD_INTERVAL = float(os.environ.get("TOKEN_BLACKLIST_REBUILD_INTERVAL", 3600))
+
+# Expired outstanding tokens deleted per statement by `manage.py prune_tokens`.
+TOKEN_PRUNE_BATCH_SIZE = int(os.environ.get("TOKEN_PRUNE_BATCH_SIZE", 1000))
+
+# Seconds a full User instance stays cached for requests authenticated by token claims
+# (also how long a deactivation made outside UserRepository can go unnoticed).
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", 60))
+
+# Catalog
+
+# Number of BookPage rows inserted per bulk INSERT when creating books.
+BOOK_PAGE_BATCH_SIZE = int(os.environ.get("BOOK_PAGE_BATCH_SIZE", 500))
+
+# Number of NDJSON records validated and written together by the bulk importer.
+BOOK_IMPORT_CHUNK_SIZE = int(os.environ.get("BOOK_IMPORT_CHUNK_SIZE", 500))
+
+# Maximum number of per-record errors kept in an import report.
+BOOK_IMPORT_MAX_ERRORS = 1000
+
+# Number of books fetched per database round-trip by the catalog export.
+BOOK_EXPORT_CHUNK_SIZE = int(os.environ.get("BOOK_EXPORT_CHUNK_SIZE", 500))
+
+# Maximum number of following pages a reader can ask to warm in the cache (?prefetch=N).
+BOOK_PAGE_PREFETCH_MAX = int(os.environ.get("BOOK_PAGE_PREFETCH_MAX", 20))
+
+# Full-text search: maximum books per response, matching pages listed per book,
+# index rows read per query and snippet length (FTS5 tokens / characters elsewhere).
+BOOK_SEARCH_MAX_RESULTS = int(os.environ.get("BOOK_SEARCH_MAX_RESULTS", 50))
+BOOK_SEARCH_PAGES_PER_BOOK = int(os.environ.get("BOOK_SEARCH_PAGES_PER_BOOK", 5))
+BOOK_SEARCH_MAX_ROWS = int(os.environ.get("BOOK_SEARCH_MAX_ROWS", 1000))
+BOOK_SEARCH_SNIPPET_TOKENS = 16
+BOOK_SEARCH_SNIPPET_CHARS = 160
+
+# Page content compression: codec for new writes ("zstd", "zlib" or "none"), level
+# (0 = codec default), pages shorter than this many bytes stored as is, and the
+# trained dictionaries (size, sample pages used by `manage.py recompress_pages
+# --train`, minimum samples to train at all, seconds between checks for a newer one).
+BOOK_PAGE_COMPRESSION = os.environ.get("BOOK_PAGE_COMPRESSION", "zstd")
+BOOK_PAGE_COMPRESSION_LEVEL = int(os.environ.get("BOOK_PAGE_COMPRESSION_LEVEL", 0))
+BOOK_PAGE_COMPRESSION_MIN_SIZE = 64
+BOOK_PAGE_DICTIONARY_SIZE = int(os.environ.get("BOOK_PAGE_DICTIONARY_SIZE", 64 * 1024))
+BOOK_PAGE_DICTIONARY_SAMPLES = int(os.environ.get("BOOK_PAGE_DICTIONARY_SAMPLES", 5000))
+BOOK_PAGE_DICTIONARY_MIN_SAMPLES = 100
+BOOK_PAGE_DICTIONARY_REFRESH = 300
+
+# In-process page index (books/page_index.py) serving page searches on databases
+# without a full-text engine (other than SQLite and MySQL): file built by
+# `manage.py page_index build` (unset disables it) and how often (seconds)
+# workers check it for a newer build. Pages saved in a worker are searchable
+# there at once, and in every worker after the next build.
+PAGE_INDEX_PATH = os.environ.get("PAGE_INDEX_PATH") or None
+PAGE_INDEX_RELOAD_INTERVAL = float(os.environ.get("PAGE_INDEX_RELOAD_INTERVAL", 30))
+
+# Cache for serialized book and page payloads: "locmem" (default), "file" or "redis".
+# locmem is per process: a write invalidates the book in its own worker only, so
+# other workers keep serving the previous version (and its ETag) until their
+# version pointer expires after BOOK_CACHE_LOCAL_VERSION_TIMEOUT seconds. Use
+# "file" or "redis" when running several workers (WEB_CONCURRENCY > 1).
+BOOK_CACHE_ALIAS = "catalog"
+BOOK_CACHE_BACKEND = os.environ.get("BOOK_CACHE_BACKEND", "locmem")
+BOOK_CACHE_LOCAL_VERSION_TIMEOUT = int(os.environ.get("BOOK_CACHE_LOCAL_VERSION_TIMEOUT", 2))
+
+# Cache holding the read-your-writes pins of config.db_router. Pins are only
+# shared between workers when the catalog cache is (BOOK_CACHE_BACKEND file or
+# redis); with the default locmem backend they are per process, so deployments
+# with replicas and several workers must use a shared backend.
+DATABASE_REPLICA_PIN_CACHE = BOOK_CACHE_ALIAS
+
+# Request metrics (config.middleware.RequestMetricsMiddleware)
+
+REQUEST_METRICS_ENABLED = os.environ.get("REQUEST_METRICS_ENABLED", "true").lower() == "true"
+
+# Whether the figures are also returned to clients in a Server-Timing header.
+# Off by default: query counts and DB time are internal telemetry; enable it in
+# development or behind a trusted proxy only.
+REQUEST_METRICS_SERVER_TIMING = os.environ.get("REQUEST_METRICS_SERVER_TIMING", "false").lower() == "true"
+
+# Fraction of requests whose queries are grouped by SQL template for N+1 detection.
+REQUEST_METRICS_SAMPLE_RATE = float(os.environ.get("REQUEST_METRICS_SAMPLE_RATE", 0.1))
+
+# A SQL template executed more times than this in one request is logged as a possible N+1.
+REQUEST_METRICS_N_PLUS_ONE_THRESHOLD = int(os.environ.get("REQUEST_METRICS_N_PLUS_ONE_THRESHOLD", 10))
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    BOOK_CACHE_ALIAS: {
+        "BACKEND": {
+            "locmem": "books.cache.LocMemLRUCache",
+            "file": "books.cache.CountingFileBasedCache",
+            "redis": "django.core.cache.backends.redis.RedisCache",
+        }[BOOK_CACHE_BACKEND],
+        "LOCATION": os.environ.get("BOOK_CACHE_LOCATION", {
+            "locmem": "catalog",
+            "file": os.path.join(BASE_DIR, "cache"),
+            "redis": "redis://localhost:6379/1",
+        }[BOOK_CACHE_BACKEND]),
+        "TIMEOUT": int(os.environ.get("BOOK_CACHE_TIMEOUT", 300)),
+        # Redis evicts according to its own maxmemory-policy (use allkeys-lru).
+        "OPTIONS": {} if BOOK_CACHE_BACKEND == "redis" else {
+            "MAX_ENTRIES": int(os.environ.get("BOOK_CACHE_MAX_ENTRIES", 1000)),
+        },
+    },
+}
+
+# Response compression (config.middleware.CompressionMiddleware): codings in order
+# of preference ("br" needs the Brotli package), minimum body size, per-request
+# levels, and the higher levels used for bodies compressed once and cached.
+RESPONSE_COMPRESSION_ENABLED = os.environ.get("RESPONSE_COMPRESSION_ENABLED", "true").lower() == "true"
+RESPONSE_COMPRESSION_ENCODINGS = ["br", "gzip"]
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.environ.get("RESPONSE_COMPRESSION_MIN_SIZE", 512))
+# Under ASGI, bodies from this size on are compressed in a worker thread instead of on the event loop.
+RESPONSE_COMPRESSION_THREAD_MIN_SIZE = int(os.environ.get("RESPONSE_COMPRESSION_THREAD_MIN_SIZE", 16 * 1024))
+RESPONSE_COMPRESSION_GZIP_LEVEL = 6
+RESPONSE_COMPRESSION_BROTLI_QUALITY = 4
+RESPONSE_PRECOMPRESS_GZIP_LEVEL = 9
+RESPONSE_PRECOMPRESS_BROTLI_QUALITY = 9
+
 MIDDLEWARE = [
+    "config.middleware.RequestMetricsMiddleware",
+    "config.middleware.CompressionMiddleware",
+    "config.middleware.ReplicaRoutingMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -256,6 +496,45 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# PASSWORD_HASHER selects the algorithm for new hashes: "pbkdf2", "argon2" (needs
+# argon2-cffi) or "scrypt". Hashes made with the other algorithms or with older
+# cost parameters still verify and are rehashed on the next successful login.
+
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2")
+
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get("PASSWORD_PBKDF2_ITERATIONS", 870000))
+
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get("PASSWORD_ARGON2_TIME_COST", 2))
+PASSWORD_ARGON2_MEMORY_COST = int(os.environ.get("PASSWORD_ARGON2_MEMORY_COST", 19456))  # KiB
+PASSWORD_ARGON2_PARALLELISM = int(os.environ.get("PASSWORD_ARGON2_PARALLELISM", 1))
+
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.environ.get("PASSWORD_SCRYPT_WORK_FACTOR", 2 ** 14))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.environ.get("PASSWORD_SCRYPT_BLOCK_SIZE", 8))
+PASSWORD_SCRYPT_PARALLELISM = int(os.environ.get("PASSWORD_SCRYPT_PARALLELISM", 1))
+
+_PASSWORD_HASHER_CLASSES = {
+    "pbkdf2": "users.hashers.TunedPBKDF2PasswordHasher",
+    "argon2": "users.hashers.TunedArgon2PasswordHasher",
+    "scrypt": "users.hashers.TunedScryptPasswordHasher",
+}
+
+PASSWORD_HASHERS = [_PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+] + [
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+# Seconds a successful email/password check is remembered so repeated logins skip
+# the slow hash (0, the default, disables it). Entries are keyed by an HMAC of the
+# user, the stored hash and the password, so a password change invalidates them.
+# Trade-off: whoever can read the cache and knows SECRET_KEY can test password
+# guesses against those keys at HMAC speed instead of the hasher's, for every
+# user who logged in within the timeout. Only enable it when the cache is as
+# trusted as SECRET_KEY and login CPU matters more than that exposure.
+LOGIN_CREDENTIAL_CACHE_TIMEOUT = int(os.environ.get("LOGIN_CREDENTIAL_CACHE_TIMEOUT", 0))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -0,0 +1,68 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from rest_framework import viewsets
+
+
+class AsyncViewSetMixin:
+    """
+    Lets a DRF `ViewSet` define some of its actions as `async def`.
+
+    DRF 3.15 only dispatches synchronously. A route (e.g. `books-list`, which
+    maps GET to `list` and POST to `create`) whose actions include a coroutine
+    is served by an async view: authentication, permissions and throttling run
+    in `sync_to_async` (they may query the database), async actions are awaited
+    on the event loop, and the sync actions of the same route run in
+    `sync_to_async` as well. Routes with only sync actions are unchanged.
+
+    The Dockerfile serves `config.asgi` with uvicorn workers. Under WSGI (e.g.
+    `runserver`) Django runs the async views through `async_to_sync`, which
+    works but holds the request thread for the whole request.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if any(iscoroutinefunction(getattr(cls, action, None)) for action in (actions or {}).values()):
+            markcoroutinefunction(view)
+        return view
+
+    def is_async_route(self):
+        return any(iscoroutinefunction(getattr(self, action, None)) for action in self.action_map.values())
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.is_async_route():
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        Async counterpart of `APIView.dispatch`.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncViewSet(AsyncViewSetMixin, viewsets.ViewSet):
+    pass
+
+
+class AsyncReadOnlyModelViewSet(AsyncViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    pass
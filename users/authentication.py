@@ -0,0 +1,90 @@
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from users.repositories.user_repository import UserRepository
+
+# Claims embedded in the tokens issued at login/signup, enough to authorize catalog requests.
+USER_CLAIMS = ("role", "is_staff")
+
+
+def user_claims(user):
+    """
+    Returns the claims describing `user` that are embedded in its tokens.
+    """
+    return {claim: getattr(user, claim) for claim in USER_CLAIMS}
+
+
+class ClaimsUser(TokenUser):
+    """
+    Request user backed by the claims of a validated access token.
+
+    `id`, `role` and `is_staff` come from the token, so permission checks need
+    no database access. Any other attribute (e.g. `email`) is read from the full
+    `User` model, loaded through `UserRepository.get_cached_user`.
+
+    Claims are fixed when the token is issued: a role change applies to new
+    tokens, i.e. at the latest after `ACCESS_TOKEN_LIFETIME`. Deactivation and
+    deletion are checked on every request against the cached user, which
+    `UserRepository` drops on update and delete, so they apply immediately;
+    changes made around the repository (admin, shell) apply at the latest
+    after `AUTH_USER_CACHE_TIMEOUT`.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token.get("role")
+
+    @cached_property
+    def username(self):
+        return self.model.username
+
+    @cached_property
+    def is_superuser(self):
+        return self.model.is_superuser
+
+    @cached_property
+    def model(self):
+        """
+        The full `User` instance, served from the short-TTL user cache.
+        """
+        return UserRepository.get_cached_user(self.id)
+
+    def __str__(self):
+        return f"ClaimsUser {self.id}"
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.model, attr)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the user claims of the token instead of
+    loading the `User` row on every request.
+
+    The user must still exist and be active; that is checked against the
+    short-TTL user cache (see `ClaimsUser`). Tokens issued before the claims
+    were added fall back to the default database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+        user = ClaimsUser(validated_token)
+        if user.model is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.model.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    """
+    Documents `ClaimsJWTAuthentication` as the same bearer scheme as simplejwt's.
+    """
+
+    target_class = "users.authentication.ClaimsJWTAuthentication"
@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    `might_contain` never returns False for an added value; it returns True for
+    a value that was not added with probability close to `error_rate` while at
+    most `capacity` values have been added.
+    """
+
+    def __init__(self, capacity, error_rate):
+        """
+        :param capacity: Expected number of values.
+        :param error_rate: Target false-positive probability at `capacity`.
+        """
+        self.capacity = max(1, capacity)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * second) % self.size for index in range(self.hash_count))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def might_contain(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class BlacklistFilter:
+    """
+    Per-process Bloom filter of blacklisted refresh-token JTIs.
+
+    A JTI the filter does not contain is known not to be blacklisted, so only
+    possible hits are confirmed against `BlacklistedToken`. The filter is built
+    on first use (not in `AppConfig.ready()`, where database access is
+    discouraged), updated immediately on logouts handled by this process, and
+    picks up tokens blacklisted by other processes with one incremental query
+    at most every `TOKEN_BLACKLIST_SYNC_INTERVAL` seconds. It is rebuilt from
+    scratch every `TOKEN_BLACKLIST_REBUILD_INTERVAL` seconds, which drops
+    expired tokens, or when it grows past its capacity.
+    """
+
+    # Overlap between incremental syncs, for rows committed with an earlier timestamp.
+    SYNC_MARGIN = timedelta(seconds=2)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._built_at = 0.0
+        self._synced_at = 0.0
+        self._since = None
+
+    def _load(self, since=None):
+        tokens = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        if since is not None:
+            tokens = tokens.filter(blacklisted_at__gte=since)
+        return tokens.values_list("token__jti", flat=True).iterator()
+
+    def rebuild(self):
+        """
+        Rebuilds the filter from the non-expired blacklisted tokens.
+        """
+        with self._lock:
+            started = timezone.now()
+            jtis = list(self._load())
+            capacity = max(settings.TOKEN_BLACKLIST_FILTER_CAPACITY, 2 * len(jtis))
+            bloom = BloomFilter(capacity, settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE)
+            for jti in jtis:
+                bloom.add(jti)
+            self._filter = bloom
+            self._built_at = self._synced_at = time.monotonic()
+            self._since = started - self.SYNC_MARGIN
+        logger.info("Token blacklist filter rebuilt with %s tokens", len(jtis))
+
+    def _refresh(self):
+        now = time.monotonic()
+        if (
+            self._filter is None
+            or now - self._built_at >= settings.TOKEN_BLACKLIST_REBUILD_INTERVAL
+            or self._filter.count > self._filter.capacity
+        ):
+            self.rebuild()
+        elif now - self._synced_at >= settings.TOKEN_BLACKLIST_SYNC_INTERVAL:
+            with self._lock:
+                started = timezone.now()
+                for jti in self._load(self._since):
+                    self._filter.add(jti)
+                self._synced_at = now
+                self._since = started - self.SYNC_MARGIN
+
+    def might_contain(self, jti):
+        """
+        Returns False if `jti` is certainly not blacklisted.
+        """
+        self._refresh()
+        return self._filter.might_contain(jti)
+
+    def add(self, jti):
+        """
+        Records a token blacklisted by this process.
+        """
+        if self._filter is None:
+            self.rebuild()
+        with self._lock:
+            self._filter.add(jti)
+
+    def reset(self):
+        """
+        Drops the filter; it is rebuilt on next use.
+        """
+        with self._lock:
+            self._filter = None
+
+
+blacklist_filter = BlacklistFilter()
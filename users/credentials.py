@@ -0,0 +1,39 @@
+import hashlib
+import hmac
+from django.conf import settings
+from django.core.cache import cache
+
+
+def credential_key(user, password):
+    """
+    Returns the cache key of a successful check of `password` against the stored hash of `user`.
+
+    The key is an HMAC under `SECRET_KEY`, so neither the password nor a fast
+    unsalted hash of it is ever stored; with `SECRET_KEY`, however, the keys can
+    be matched against guesses at HMAC speed (see `LOGIN_CREDENTIAL_CACHE_TIMEOUT`).
+    """
+    message = f"{user.pk}:{user.password}:{password}".encode("utf-8")
+    return "login:" + hmac.new(settings.SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def check_credentials(user, password):
+    """
+    Checks `password` against `user`, skipping the password hasher when the same
+    check succeeded within `settings.LOGIN_CREDENTIAL_CACHE_TIMEOUT` seconds
+    (off by default).
+
+    A slow check goes through `User.check_password`, which rehashes the password
+    when the preferred hasher or its cost parameters have changed.
+
+    :return: True if the password is correct.
+    """
+    timeout = settings.LOGIN_CREDENTIAL_CACHE_TIMEOUT
+    if timeout > 0 and cache.get(credential_key(user, password)):
+        return True
+
+    if not user.check_password(password):
+        return False
+
+    if timeout > 0:
+        cache.set(credential_key(user, password), True, timeout)
+    return True
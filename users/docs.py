@@ -16,6 +16,9 @@ list_users_docs = extend_schema(
     summary="Lista todos los usuarios",
     description="""
     Recupera una lista paginada de usuarios registrados en la plataforma.
+
+    La paginación es por cursor: sigue los enlaces `next`/`previous`. Enviar `page` o
+    `pagination=offset` activa la paginación por número de página (incluye `count`).
     
     **Permisos:**
     - Solo accesible por administradores.
@@ -0,0 +1,22 @@
+import time
+from django.core.management.base import BaseCommand
+from users.repositories.token_repository import TokenRepository
+
+
+class Command(BaseCommand):
+    help = "Deletes expired outstanding refresh tokens and their blacklist entries in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Number of tokens deleted per statement.")
+        parser.add_argument(
+            "--every", type=float, metavar="SECONDS",
+            help="Keep running and prune every SECONDS (for a sidecar or worker container).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = TokenRepository.prune_expired_tokens(options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} expired tokens"))
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
@@ -0,0 +1,37 @@
+import logging
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRepository:
+    """
+    Repository class for maintenance of the JWT blacklist tables.
+    """
+
+    @staticmethod
+    def prune_expired_tokens(batch_size=None):
+        """
+        Deletes expired outstanding tokens (and their blacklist entries) in batches.
+
+        Each batch is a short DELETE on primary keys, so the tables are never
+        locked for the duration of the whole cleanup.
+
+        :param batch_size: Tokens deleted per statement (defaults to `settings.TOKEN_PRUNE_BATCH_SIZE`).
+        :return: The number of outstanding tokens deleted.
+        """
+        batch_size = batch_size or settings.TOKEN_PRUNE_BATCH_SIZE
+        now = timezone.now()
+        deleted = 0
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now).order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+        logger.info("Pruned %s expired outstanding tokens", deleted)
+        return deleted
@@ -1,5 +1,8 @@
 import logging
+from django.conf import settings
+from django.core.cache import cache
 from users.models import User
+from config.results import QueryResult
 
 logger = logging.getLogger(__name__)
 class UserRepository:
@@ -17,13 +20,13 @@ class UserRepository:
         """
         try:
             user = User.objects.get(email=email)
-            logger.info(f"User found by email: {email}")
+            logger.info("User found by email: %s", email)
             return user
         except User.DoesNotExist:
-            logger.warning(f"User not found with email: {email}") 
+            logger.warning("User not found with email: %s", email) 
             return None
         except Exception as e:
-            logger.error(f"Unexpected error retrieving user by email {email}: {e}")
+            logger.error("Unexpected error retrieving user by email %s: %s", email, e)
             return None
 
     @staticmethod
@@ -41,13 +44,13 @@ class UserRepository:
         """
         try:
             user = User.objects.create_user(username=username, email=email, password=password, role=role)
-            logger.info(f"User created successfully: {email} (Role: {role})")
+            logger.info("User created successfully: %s (Role: %s)", email, role)
             return user
         except ValueError as e:
-            logger.warning(f"Validation error while creating user {email}: {e}")
+            logger.warning("Validation error while creating user %s: %s", email, e)
             raise ValueError(f"Error creating user: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error creating user {email}: {e}") 
+            logger.error("Unexpected error creating user %s: %s", email, e) 
             raise Exception(f"Unexpected error creating user: {str(e)}")
 
     @staticmethod
@@ -61,27 +64,48 @@ class UserRepository:
         try:
             user = User.objects.filter(id=user_id).first()
             if user:
-                logger.info(f"User retrieved by ID: {user_id}")  
+                logger.info("User retrieved by ID: %s", user_id)  
             else:
-                logger.warning(f"User not found with ID: {user_id}")  
+                logger.warning("User not found with ID: %s", user_id)  
             return user
         except Exception as e:
-            logger.error(f"Unexpected error retrieving user by ID {user_id}: {e}")  
+            logger.error("Unexpected error retrieving user by ID %s: %s", user_id, e)  
             return None
 
+    @staticmethod
+    def user_cache_key(user_id):
+        return f"user:{user_id}"
+
+    @staticmethod
+    def get_cached_user(user_id):
+        """
+        Retrieves a user by their ID through a short-TTL cache.
+
+        Entries live for `settings.AUTH_USER_CACHE_TIMEOUT` seconds and are dropped
+        when the user is updated or deleted.
+
+        :param user_id: User ID.
+        :return: User if exists, None if not exists.
+        """
+        key = UserRepository.user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = UserRepository.get_user_by_id(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
+
     @staticmethod
     def get_all_users():
         """
         Retrieves all users ordered by ID.
 
-        :return: QuerySet with all users.
+        :return: QueryResult wrapping all users.
         """
         try:
-            users = User.objects.all().order_by("id")
-            logger.info(f"Retrieved {users.count()} users")
-            return users
+            return QueryResult(User.objects.all().order_by("id"))
         except Exception as e:
-            logger.error(f"Unexpected error retrieving all users: {e}") 
+            logger.error("Unexpected error retrieving all users: %s", e) 
             return None
 
     @staticmethod
@@ -97,10 +121,11 @@ class UserRepository:
             for key, value in data.items():
                 setattr(user, key, value)
             user.save()
-            logger.info(f"User updated successfully: {user.email}")  
+            cache.delete(UserRepository.user_cache_key(user.id))
+            logger.info("User updated successfully: %s", user.email)  
             return user
         except Exception as e:
-            logger.error(f"Unexpected error updating user {user.email}: {e}") 
+            logger.error("Unexpected error updating user %s: %s", user.email, e) 
             return None
 
     @staticmethod
@@ -112,7 +137,8 @@ class UserRepository:
         """
         try:
             email = user.email 
+            cache.delete(UserRepository.user_cache_key(user.id))
             user.delete()
-            logger.info(f"User deleted successfully: {email}")  
+            logger.info("User deleted successfully: %s", email)  
         except Exception as e:
-            logger.error(f"Unexpected error deleting user {email}: {e}") 
+            logger.error("Unexpected error deleting user %s: %s", email, e) 
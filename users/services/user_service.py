@@ -1,5 +1,7 @@
 import logging
-from rest_framework_simplejwt.tokens import RefreshToken
+from users.tokens import RefreshToken
+from users.authentication import user_claims
+from users.credentials import check_credentials
 from users.repositories.user_repository import UserRepository
 from users.dtos.user_dto import UserDTO
 
@@ -30,17 +32,34 @@ class UserService:
         """
         user = self.user_repository.get_user_by_email(email)
         if user is None:
-            logger.warning(f"Authentication failed: User with email {email} not found") 
+            logger.warning("Authentication failed: User with email %s not found", email) 
             raise ValueError("User not found")
 
-        if not user.check_password(password):
-            logger.warning(f"Authentication failed: Invalid password for user {email}") 
+        stored_hash = user.password
+        if not check_credentials(user, password):
+            logger.warning("Authentication failed: Invalid password for user %s", email) 
             raise ValueError("Invalid credentials")
+        if user.password != stored_hash:
+            logger.info("Password hash of user %s upgraded to the current hasher", email)
 
-        refresh = RefreshToken.for_user(user)
-        logger.info(f"User {email} authenticated successfully") 
+        refresh = self._refresh_token_for(user)
+        logger.info("User %s authenticated successfully", email) 
         return {'refresh': str(refresh), 'access': str(refresh.access_token)}
     
+    @staticmethod
+    def _refresh_token_for(user):
+        """
+        Issues a refresh token for `user` carrying its role claims, which are
+        copied to the access tokens derived from it.
+
+        :param user: The authenticated user.
+        :return: A RefreshToken instance.
+        """
+        refresh = RefreshToken.for_user(user)
+        for claim, value in user_claims(user).items():
+            refresh[claim] = value
+        return refresh
+
     def logout_user(self, refresh_token):
         """
         Logs out a user by blacklisting their refresh token.
@@ -66,7 +85,7 @@ class UserService:
         """
         existing_user = self.user_repository.get_user_by_email(data.get("email"))
         if existing_user:
-            logger.warning(f"User creation failed: Email {data.get('email')} is already registered")  
+            logger.warning("User creation failed: Email %s is already registered", data.get('email'))  
             raise ValueError("The email is already registered")
 
         user = self.user_repository.create_user(
@@ -76,7 +95,7 @@ class UserService:
             role=data.get("role", "reader"),
         )
 
-        refresh = RefreshToken.for_user(user)
+        refresh = self._refresh_token_for(user)
         user_data = UserDTO(
             {
                 "id": user.id,
@@ -88,7 +107,7 @@ class UserService:
             }
         ).data
 
-        logger.info(f"User {user.email} created successfully") 
+        logger.info("User %s created successfully", user.email) 
         return user_data
     
     def get_user_by_id(self, user_id):
@@ -101,10 +120,10 @@ class UserService:
         """
         user = self.user_repository.get_user_by_id(user_id)
         if not user:
-            logger.warning(f"User retrieval failed: ID {user_id} not found")
+            logger.warning("User retrieval failed: ID %s not found", user_id)
             raise ValueError("User not found")
 
-        logger.info(f"User retrieved successfully: ID {user_id}") 
+        logger.info("User retrieved successfully: ID %s", user_id) 
         return user
     
     def update_user(self, user_id, data):
@@ -118,11 +137,11 @@ class UserService:
         """
         user = self.user_repository.get_user_by_id(user_id)
         if not user:
-            logger.warning(f"User update failed: ID {user_id} not found")
+            logger.warning("User update failed: ID %s not found", user_id)
             raise ValueError("User not found")
 
         updated_user = self.user_repository.update_user(user, data)
-        logger.info(f"User {updated_user.email} updated successfully") 
+        logger.info("User %s updated successfully", updated_user.email) 
         return updated_user
     
     def delete_user(self, user_id):
@@ -135,19 +154,17 @@ class UserService:
         """
         user = self.user_repository.get_user_by_id(user_id)
         if not user:
-            logger.warning(f"User deletion failed: ID {user_id} not found") 
+            logger.warning("User deletion failed: ID %s not found", user_id) 
             raise ValueError("User not found")
 
         email = user.email 
         self.user_repository.delete_user(user)
-        logger.info(f"User {email} deleted successfully")
+        logger.info("User %s deleted successfully", email)
     
     def get_all_users(self):
         """
         Retrieves all users.
 
-        :return: A queryset containing all users.
+        :return: A QueryResult wrapping all users.
         """
-        users = self.user_repository.get_all_users()
-        logger.info(f"Retrieved {users.count()} users") 
-        return users
+        return self.user_repository.get_all_users()
@@ -0,0 +1,75 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.authentication import ClaimsUser
+from users.repositories.user_repository import UserRepository
+
+
+def login(api_client, email, password):
+    response = api_client.post(reverse("user-login"), {"email": email, "password": password}, format="json")
+    assert response.status_code == 200
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+
+@pytest.mark.django_db
+def test_catalog_read_skips_user_lookup(api_client, create_test_user, django_assert_max_num_queries):
+    """A token carrying the user claims authenticates from the user cache without reading the user row"""
+    login(api_client, create_test_user.email, "testpassword")
+    api_client.get(reverse("books-list"))  # warms the user cache
+    with django_assert_max_num_queries(1):
+        response = api_client.get(reverse("books-list"))
+    assert response.status_code == 204
+    assert isinstance(response.wsgi_request.user, ClaimsUser)
+    assert response.wsgi_request.user.role == "reader"
+
+
+@pytest.mark.django_db
+def test_full_user_is_loaded_through_the_cache(api_client, create_test_user, django_assert_num_queries):
+    """Authentication loads the User once; its attributes then come from the instance and the cache"""
+    cache.clear()
+    login(api_client, create_test_user.email, "testpassword")
+    response = api_client.get(reverse("books-list"))
+    user = response.wsgi_request.user
+
+    with django_assert_num_queries(0):
+        assert user.email == create_test_user.email
+        assert ClaimsUser(user.token).email == create_test_user.email
+
+
+@pytest.mark.django_db
+def test_deactivated_user_token_is_rejected(api_client, create_test_user):
+    """Deactivating a user revokes access at once, even with a valid access token"""
+    cache.clear()
+    login(api_client, create_test_user.email, "testpassword")
+    assert api_client.get(reverse("books-list")).status_code == 204
+
+    UserRepository.update_user(create_test_user, {"is_active": False})
+
+    response = api_client.get(reverse("books-list"))
+    assert response.status_code == 401
+    assert response.data["detail"].code == "user_inactive"
+
+
+@pytest.mark.django_db
+def test_deleted_user_token_is_rejected(api_client, create_test_user):
+    """A deleted user's token fails authentication (401) instead of erroring on user attributes"""
+    cache.clear()
+    login(api_client, create_test_user.email, "testpassword")
+    assert api_client.get(reverse("books-list")).status_code == 204
+
+    UserRepository.delete_user(create_test_user)
+
+    response = api_client.get(reverse("books-list"))
+    assert response.status_code == 401
+    assert response.data["detail"].code == "user_not_found"
+
+
+@pytest.mark.django_db
+def test_token_without_claims_falls_back_to_database(api_client, create_admin_user):
+    """Tokens issued before claims were embedded still authenticate from the database"""
+    token = RefreshToken.for_user(create_admin_user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    response = api_client.get(reverse("user-list"))
+    assert response.status_code == 200
+    assert not isinstance(response.wsgi_request.user, ClaimsUser)
@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import override_settings
+from users.models import User
+from users.services.user_service import UserService
+
+SCRYPT_FIRST = [
+    "users.hashers.TunedScryptPasswordHasher",
+    "users.hashers.TunedPBKDF2PasswordHasher",
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_credential_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+def test_login_rehashes_with_the_preferred_hasher(create_test_user):
+    """A hash made by a hasher that is no longer preferred is upgraded on login"""
+    assert create_test_user.password.startswith("pbkdf2_sha256$")
+
+    with override_settings(PASSWORD_HASHERS=SCRYPT_FIRST, PASSWORD_SCRYPT_WORK_FACTOR=2 ** 10):
+        UserService().authenticate_user(create_test_user.email, "testpassword")
+
+        user = User.objects.get(pk=create_test_user.pk)
+        assert user.password.startswith("scrypt$1024$")
+        assert user.check_password("testpassword")
+
+
+@pytest.mark.django_db
+def test_login_rehashes_when_cost_changes(create_test_user):
+    """Retuning the cost parameters upgrades existing hashes at the next login"""
+    with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+        UserService().authenticate_user(create_test_user.email, "testpassword")
+
+    assert User.objects.get(pk=create_test_user.pk).password.startswith("pbkdf2_sha256$1000$")
+
+
+@pytest.mark.django_db
+@override_settings(LOGIN_CREDENTIAL_CACHE_TIMEOUT=60)
+def test_credential_cache_skips_the_hasher(create_test_user):
+    """A repeated successful login is served from the credential cache"""
+    service = UserService()
+    with patch.object(User, "check_password", autospec=True, side_effect=User.check_password) as check:
+        service.authenticate_user(create_test_user.email, "testpassword")
+        service.authenticate_user(create_test_user.email, "testpassword")
+    assert check.call_count == 1
+
+
+@pytest.mark.django_db
+@override_settings(LOGIN_CREDENTIAL_CACHE_TIMEOUT=60)
+def test_credential_cache_never_accepts_a_wrong_password(create_test_user):
+    """Only successful checks are cached"""
+    service = UserService()
+    service.authenticate_user(create_test_user.email, "testpassword")
+    with pytest.raises(ValueError):
+        service.authenticate_user(create_test_user.email, "wrong-password")
+
+
+@pytest.mark.django_db
+def test_credential_cache_is_off_by_default(create_test_user):
+    """Unless LOGIN_CREDENTIAL_CACHE_TIMEOUT is set, every login runs the password hasher"""
+    service = UserService()
+    with patch.object(User, "check_password", autospec=True, side_effect=User.check_password) as check:
+        service.authenticate_user(create_test_user.email, "testpassword")
+        service.authenticate_user(create_test_user.email, "testpassword")
+    assert check.call_count == 2
@@ -0,0 +1,77 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from users.blacklist import BloomFilter, blacklist_filter
+from users.tokens import RefreshToken
+
+
+@pytest.fixture(autouse=True)
+def reset_blacklist_filter():
+    """Every test starts with a filter built from its own database state"""
+    blacklist_filter.reset()
+    yield
+    blacklist_filter.reset()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Every added value is reported, and the false-positive rate stays near the target"""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+    assert all(bloom.might_contain(f"jti-{i}") for i in range(1000))
+    false_positives = sum(bloom.might_contain(f"other-{i}") for i in range(10000))
+    assert false_positives < 300
+
+
+@pytest.mark.django_db
+def test_check_skips_database_for_unknown_tokens(create_test_user, django_assert_num_queries):
+    """A token the filter has never seen is verified without touching the blacklist table"""
+    encoded = str(RefreshToken.for_user(create_test_user))
+    RefreshToken(encoded)  # builds the filter
+
+    with django_assert_num_queries(0):
+        RefreshToken(encoded)
+
+
+@pytest.mark.django_db
+def test_blacklisted_token_is_rejected(create_test_user):
+    """Logging out adds the token to the filter, and the database confirms the hit"""
+    token = RefreshToken.for_user(create_test_user)
+    encoded = str(token)
+    RefreshToken(encoded).blacklist()
+
+    with pytest.raises(TokenError):
+        RefreshToken(encoded)
+
+
+@pytest.mark.django_db
+def test_filter_picks_up_tokens_blacklisted_elsewhere(create_test_user, settings):
+    """Tokens blacklisted by another process are found at the next sync"""
+    settings.TOKEN_BLACKLIST_SYNC_INTERVAL = 0
+    encoded = str(RefreshToken.for_user(create_test_user))
+    RefreshToken(encoded)
+
+    BlacklistedToken.objects.create(token=OutstandingToken.objects.get(token=encoded))
+
+    with pytest.raises(TokenError):
+        RefreshToken(encoded)
+
+
+@pytest.mark.django_db
+def test_prune_tokens_deletes_expired_tokens_in_batches(create_test_user):
+    """Expired outstanding tokens and their blacklist entries are removed; live ones are kept"""
+    live = RefreshToken.for_user(create_test_user)
+    for i in range(5):
+        token = OutstandingToken.objects.create(
+            user=create_test_user, jti=f"expired-{i}", token=f"expired-{i}",
+            expires_at=timezone.now() - timedelta(days=1),
+        )
+        BlacklistedToken.objects.create(token=token)
+
+    call_command("prune_tokens", "--batch-size", "2")
+
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == [live["jti"]]
+    assert not BlacklistedToken.objects.exists()
@@ -0,0 +1,22 @@
+import pytest
+from django.urls import reverse
+from users.models import User
+
+# The cursor-paginated user list must stay a single query however many users exist.
+USER_LIST_BUDGET = 1
+
+
+@pytest.mark.django_db
+def test_user_list_budget(api_client, create_admin_user, django_assert_max_num_queries):
+    """Listing users issues no exists()/count() besides the page query"""
+    User.objects.bulk_create(
+        User(username=f"user{i}", email=f"user{i}@example.com", role="reader") for i in range(25)
+    )
+    api_client.force_authenticate(user=create_admin_user)
+    with django_assert_max_num_queries(USER_LIST_BUDGET):
+        response = api_client.get(reverse("user-list"))
+    assert response.status_code == 200
+
+    with django_assert_max_num_queries(USER_LIST_BUDGET):
+        response = api_client.get(response.data["next"])
+    assert response.status_code == 200
@@ -1,5 +1,6 @@
 from django.urls import reverse
 import pytest
+from users.models import User
 
 @pytest.mark.django_db
 def test_list_users_as_admin(api_client, create_admin_user):
@@ -86,4 +87,21 @@ def test_get_user_by_id(api_client, create_test_user):
 
     assert response.status_code == 200
     assert response.data["id"] == create_test_user.id
-    assert response.data["email"] == create_test_user.email
\ No newline at end of file
+    assert response.data["email"] == create_test_user.email
+
+
+@pytest.mark.django_db
+def test_list_users_cursor_pagination(api_client, create_admin_user):
+    """Test that the user list is paginated by id cursor"""
+    for i in range(12):
+        User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com", password="password123")
+    api_client.force_authenticate(user=create_admin_user)
+
+    response = api_client.get(reverse("user-list"))
+    assert response.status_code == 200
+    assert "count" not in response.data
+    ids = [user["id"] for user in response.data["results"]]
+    response = api_client.get(response.data["next"])
+    ids += [user["id"] for user in response.data["results"]]
+
+    assert ids == sorted(User.objects.values_list("id", flat=True))
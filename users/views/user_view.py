@@ -1,12 +1,14 @@
 import logging
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from users.serializers.user_serializer import UserSerializer
 from drf_spectacular.utils import extend_schema_view
 from users.services.user_service import UserService
 from users.models import User
-from rest_framework.pagination import PageNumberPagination
+from config.log import summarize_payload
+from config.pagination import KeysetPagination
 from users.docs import (
     list_users_docs, get_user_by_id_docs, create_user_docs,
     update_user_docs, delete_user_docs, login_user_docs, logout_user_docs, patch_user_docs
@@ -14,6 +16,20 @@ from users.docs import (
 
 logger = logging.getLogger(__name__)  # Initialize logger for this module
 
+class UserPagination(KeysetPagination):
+    """
+    Pagination settings for users.
+
+    - `page_size`: Number of users per request (default: 10).
+    - `page_size_query_param`: Allows dynamic page size via query parameters.
+    - `max_page_size`: Maximum number of users per request.
+    - `ordering`: Keyset used by cursors.
+    """
+    ordering = ("id",)
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
 @extend_schema_view(
     partial_update=patch_user_docs  # Oculta `PATCH` en Swagger
 )
@@ -24,6 +40,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_class = UserPagination
     user_service = UserService()
 
     def get_permissions(self):
@@ -51,15 +68,15 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         try:
             email = request.data.get("email")
-            logger.info(f"User login attempt: {email}")
+            logger.info("User login attempt: %s", email)
             token_data = self.user_service.authenticate_user(
                 email=email, password=request.data.get("password")
             )
-            logger.info(f"User logged in successfully: {email}")
+            logger.info("User logged in successfully: %s", email)
             return Response(token_data, status=status.HTTP_200_OK)
 
         except Exception as e:
-            logger.warning(f"User login failed: {email} - {e}")
+            logger.warning("User login failed: %s - %s", email, e)
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @create_user_docs
@@ -72,20 +89,19 @@ class UserViewSet(viewsets.ModelViewSet):
         :raises HTTP_400_BAD_REQUEST: If validation fails.
         """
         try:
-            email = request.data.get("email")
-            logger.info(f"User signup attempt: {email}")
+            logger.info("User signup attempt: %s", summarize_payload(request.data))
             serializer = UserSerializer(data=request.data)
 
             if serializer.is_valid():
                 user_data = self.user_service.create_user(serializer.validated_data)
-                logger.info(f"User registered successfully: {user_data['email']}")
+                logger.info("User registered successfully: %s", user_data['email'])
                 return Response(user_data, status=status.HTTP_201_CREATED)
 
-            logger.warning(f"User signup failed (invalid data): {serializer.errors}")
+            logger.warning("User signup failed (invalid data): %s", serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logger.error(f"Unexpected error during signup: {e}")
+            logger.error("Unexpected error during signup: %s", e)
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @logout_user_docs
@@ -99,14 +115,14 @@ class UserViewSet(viewsets.ModelViewSet):
         :raises HTTP_400_BAD_REQUEST: If logout fails.
         """
         try:
-            logger.info(f"User logout attempt: {request.user.email}")
+            logger.info("User logout attempt: %s", request.user.email)
             refresh_token = request.data.get("refresh")
             self.user_service.logout_user(refresh_token)
-            logger.info(f"User logged out successfully: {request.user.email}")
+            logger.info("User logged out successfully: %s", request.user.email)
             return Response({"message": "Logged out"}, status=status.HTTP_200_OK)
 
         except Exception as e:
-            logger.warning(f"User logout failed: {request.user.email} - {e}")
+            logger.warning("User logout failed: %s - %s", request.user.email, e)
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @list_users_docs
@@ -120,22 +136,28 @@ class UserViewSet(viewsets.ModelViewSet):
         :raises HTTP_500_INTERNAL_SERVER_ERROR: If an unexpected server error occurs.
         """
         if not request.user.is_staff:
-            logger.warning(f"Unauthorized user list attempt by {request.user.email}")
+            logger.warning("Unauthorized user list attempt by %s", request.user.email)
             return Response({"error": "You do not have permission"}, status=status.HTTP_403_FORBIDDEN)
 
         try:
             users = self.user_service.get_all_users()
-            if not users.exists():
+
+            paginator = self.pagination_class()
+            paginated_users = paginator.paginate_queryset(users.queryset, request)
+            users.record_count(paginator.get_known_count())
+
+            if not paginated_users and paginator.is_first_page():
                 logger.info("User list requested - No users found")
                 return Response({"message": "No users available"}, status=status.HTTP_204_NO_CONTENT)
 
-            paginator = PageNumberPagination()
-            paginated_users = paginator.paginate_queryset(users, request)
-            logger.info(f"User list retrieved successfully ({users.count()} users)")
+            logger.info("User list retrieved successfully (%s users)", users.describe_count())
             return paginator.get_paginated_response(UserSerializer(paginated_users, many=True).data)
 
+        except NotFound as e:
+            logger.warning("User list failed: %s", e)
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.error(f"Unexpected error retrieving user list: {e}")
+            logger.error("Unexpected error retrieving user list: %s", e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @get_user_by_id_docs
@@ -152,18 +174,18 @@ class UserViewSet(viewsets.ModelViewSet):
         try:
             user = self.user_service.get_user_by_id(pk)
             if not request.user.is_staff and request.user.id != user.id:
-                logger.warning(f"Unauthorized user retrieval attempt by {request.user.email}")
+                logger.warning("Unauthorized user retrieval attempt by %s", request.user.email)
                 return Response({"error": "You do not have permission"}, status=status.HTTP_403_FORBIDDEN)
 
-            logger.info(f"User retrieved successfully: {user.email}")
+            logger.info("User retrieved successfully: %s", user.email)
             return Response(UserSerializer(user).data)
 
         except ValueError as e:
-            logger.warning(f"User not found: ID {pk}")
+            logger.warning("User not found: ID %s", pk)
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
 
         except Exception as e:
-            logger.error(f"Unexpected error retrieving user ID {pk}: {e}")
+            logger.error("Unexpected error retrieving user ID %s: %s", pk, e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
     @update_user_docs
@@ -178,20 +200,21 @@ class UserViewSet(viewsets.ModelViewSet):
         :raises HTTP_500_INTERNAL_SERVER_ERROR: If an unexpected server error occurs
         """
         if request.user.id != int(pk):
-            logger.warning(f"Unauthorized user update attempt by {request.user.email}")
+            logger.warning("Unauthorized user update attempt by %s", request.user.email)
             return Response({"error": "You do not have permission"}, status=status.HTTP_403_FORBIDDEN)
 
         try:
+            logger.info("Updating user ID %s: %s", pk, summarize_payload(request.data))
             user = self.user_service.update_user(pk, request.data)
-            logger.info(f"User updated successfully: {user.email}")
+            logger.info("User updated successfully: %s", user.email)
             return Response(UserSerializer(user).data)
 
         except ValueError as e:
-            logger.warning(f"User update failed: User ID {pk} not found")
+            logger.warning("User update failed: User ID %s not found", pk)
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
 
         except Exception as e:
-            logger.error(f"Unexpected error updating user ID {pk}: {e}")
+            logger.error("Unexpected error updating user ID %s: %s", pk, e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @delete_user_docs
@@ -206,14 +229,14 @@ class UserViewSet(viewsets.ModelViewSet):
         :raises HTTP_500_INTERNAL_SERVER_ERROR: If an unexpected server error occurs.
         """
         if not request.user.is_staff:
-            logger.warning(f"Unauthorized user deletion attempt by {request.user.email}")
+            logger.warning("Unauthorized user deletion attempt by %s", request.user.email)
             return Response({"error": "You do not have permission"}, status=status.HTTP_403_FORBIDDEN)
 
         try:
             self.user_service.delete_user(pk)
-            logger.info(f"User deleted successfully: ID {pk}")
+            logger.info("User deleted successfully: ID %s", pk)
             return Response({"message": "User deleted"}, status=status.HTTP_204_NO_CONTENT)
 
         except ValueError as e:
-            logger.warning(f"User deletion failed: User ID {pk} not found")
+            logger.warning("User deletion failed: User ID %s not found", pk)
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)